@@ -1,8 +1,50 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
 import uvicorn
 from src.router.router import api_router
+from src.recommendation.workflows.workflow import init_recommendation_graphs
+from src.shared.database import connect_to_mongo, close_mongo_connection, ensure_indexes
+from src.recommendation.features.restaurant_filtering.allergen_matcher import get_allergen_matcher
+from src.recommendation.features.restaurant_filtering.spatial_index import (
+    init_restaurant_index,
+    close_restaurant_index,
+)
+from src.shared.llm.llm_client import llm_registry
+from src.shared.metrics.collectors import http_metrics_middleware, install_langchain_metrics
+from src.shared.metrics.timing_ledger import install_timing_ledger
+from src.shared.metrics.metrics_registry import CONTENT_TYPE, metrics_registry
+from src.core.config import settings
 
-app = FastAPI(title="Damo AI Pipeline API", version="0.0.1")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """앱 시작/종료 시 공용 리소스 관리"""
+    # 그래프 노드 / LLM 호출 지표 수집 (LangChain 전역 콜백)
+    if settings.METRICS_ENABLED:
+        install_langchain_metrics()
+    # 요청 단위 노드 / LLM 실행 시간 기록 (LangChain 전역 콜백)
+    if settings.TIMING_LEDGER_ENABLED:
+        install_timing_ledger()
+    # 추천 그래프 사전 컴파일 (요청마다 컴파일하지 않도록)
+    init_recommendation_graphs()
+    # 알러지 키워드 매처 사전 컴파일 (요청마다 파일을 읽지 않도록)
+    get_allergen_matcher()
+    # MongoDB 공용 커넥션 풀 생성
+    await connect_to_mongo()
+    await ensure_indexes()
+    # 식당 위치 인메모리 인덱스 (RESTAURANT_INDEX_ENABLED=True 인 경우)
+    await init_restaurant_index()
+    yield
+    await close_restaurant_index()
+    await llm_registry.aclose()
+    await close_mongo_connection()
+
+
+app = FastAPI(title="Damo AI Pipeline API", version="0.0.1", lifespan=lifespan)
+
+if settings.METRICS_ENABLED:
+    app.middleware("http")(http_metrics_middleware)
 
 @app.get("/ai/api")
 async def root():
@@ -14,6 +56,13 @@ async def health_check():
     """헬스체크 엔드포인트"""
     return {"status": "ok", "message": "Server is healthy"}
 
+@app.get("/ai/api/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus 지표 (노드/LLM/Mongo 지연 시간 히스토그램, 토큰 수, 처리 중 요청 수)"""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="metrics disabled")
+    return PlainTextResponse(metrics_registry.render(), media_type=CONTENT_TYPE)
+
 app.include_router(api_router, prefix="/ai/api")
 
 if __name__ == "__main__":
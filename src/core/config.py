@@ -1,9 +1,76 @@
+from typing import Dict, Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     MONGODB_URI: str
     DB_NAME: str = "damo"
+    # MongoDB 커넥션 풀 설정 (앱 전체에서 하나의 클라이언트를 공유)
+    MONGO_MAX_POOL_SIZE: int = 50
+    MONGO_MIN_POOL_SIZE: int = 5
+    MONGO_MAX_IDLE_TIME_MS: int = 60000
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = 5000
+    MONGO_CONNECT_TIMEOUT_MS: int = 5000
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 5000
+    # 식당 위치 인메모리 인덱스 (활성화 시 distance_node가 Mongo 지리 쿼리 대신 사용)
+    RESTAURANT_INDEX_ENABLED: bool = False
+    RESTAURANT_INDEX_CELL_DEG: float = 0.01
+    RESTAURANT_INDEX_REFRESH_SEC: int = 300
+    RESTAURANT_INDEX_FULL_RELOAD_SEC: int = 3600
+    # 거리 필터링 결과 캐시 (geohash 셀 + 반경 단위)
+    GEO_CACHE_ENABLED: bool = True
+    GEO_CACHE_PRECISION: int = 7
+    GEO_CACHE_TTL_SEC: int = 300
+    GEO_CACHE_MAX_ENTRIES: int = 512
+    # 캐시 키에 포함할 1인 예산 구간 (원, 구간 상한으로 예산 사전 필터를 적용해 조회)
+    GEO_CACHE_BUDGET_BUCKET: int = 5000
+    ALLERGY_VERDICT_CACHE_ENABLED: bool = True
+    ALLERGY_VERDICT_CACHE_MAX_ENTRIES: int = 2048
+    ALLERGY_VERDICT_CACHE_TTL_SEC: int = 604800
+    ALLERGEN_TAG_MIN_SAFE_MAINS: int = 2
+    BUDGET_PREFILTER_ENABLED: bool = True
+    # 필터링 서브 그래프 모드: sequential(distance -> allergy -> budget) / stream / parallel
+    FILTERING_MODE: Literal["sequential", "stream", "parallel"] = "sequential"
+    FILTERING_STREAM_BATCH_SIZE: int = 20
+    FILTERING_PHASE_CANDIDATES: int = 5
+    FILTERING_REFRESH_BUFFER: int = 10
+    # LLM 클라이언트 공용 HTTP 커넥션 풀 (keep-alive)
+    LLM_HTTP_MAX_CONNECTIONS: int = 100
+    LLM_HTTP_MAX_KEEPALIVE: int = 20
+    LLM_HTTP_KEEPALIVE_EXPIRY_SEC: float = 60.0
+    LLM_HTTP_TIMEOUT_SEC: float = 120.0
+    # 에이전트 체인(프롬프트 | LLM) 캐시 최대 항목 수 (LRU)
+    AGENT_CHAIN_CACHE_MAX_ENTRIES: int = 256
+    # 전역 LLM 호출 스케줄러 (동시 실행 상한 + provider/model별 초당 호출 수)
+    LLM_SCHEDULER_ENABLED: bool = True
+    LLM_MAX_CONCURRENCY: int = 16
+    LLM_RATE_PER_SEC: float = 10.0
+    LLM_RATE_BURST: int = 20
+    # 모델별 초당 호출 수 재정의 (예: {"openai:gpt-5-nano": 20})
+    LLM_RATE_LIMITS: Dict[str, float] = {}
+    # 추천 API 타임아웃 및 중복 요청 합치기 (dining_id + API + 본문 해시 기준)
+    RECOMMENDATION_TIMEOUT_SEC: float = 180.0
+    RECOMMENDATION_MAX_RUN_SEC: float = 360.0
+    REQUEST_COALESCING_ENABLED: bool = True
+    IDEMPOTENCY_TTL_SEC: int = 86400
+    # LLM 백엔드: live(실제 호출) / record(실제 호출 + 응답 저장) / replay(저장된 응답 재생) / synthetic(가짜 응답)
+    LLM_BACKEND: Literal["live", "record", "replay", "synthetic"] = "live"
+    LLM_CASSETTE_DIR: str = "tests/performance/cassettes"
+    LLM_REPLAY_LATENCY: bool = False
+    # synthetic 지연 시간 분포 (LLM_SYNTHETIC_LATENCY_MS: fixed/uniform 평균, lognormal 중앙값)
+    LLM_SYNTHETIC_LATENCY_DIST: Literal["fixed", "uniform", "lognormal"] = "lognormal"
+    LLM_SYNTHETIC_LATENCY_MS: float = 800.0
+    LLM_SYNTHETIC_LATENCY_SPREAD: float = 0.5
+    LLM_SYNTHETIC_SAFE_RATIO: float = 0.8
+    LLM_SYNTHETIC_SEED: int = 42
+    # Prometheus 지표 수집 (/ai/api/metrics)
+    METRICS_ENABLED: bool = True
+    # 요청 단위 실행 시간 기록 (dining_sessions.timingLedger, 세션당 최근 N개 요청만 보관)
+    TIMING_LEDGER_ENABLED: bool = True
+    TIMING_LEDGER_MAX_ENTRIES: int = 500
+    TIMING_LEDGER_MAX_RECORDS: int = 20
+    # X-Debug-Timing 요청 헤더가 있으면 Server-Timing 응답 헤더로 노드별 소요 시간 반환
+    TIMING_DEBUG_HEADER_ENABLED: bool = False
     GOOGLE_API_KEY: str
     OPENAI_API_KEY: str
     GEMINI_MODEL: str = "gemini-3-flash-preview"
@@ -4,9 +4,13 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from collections import OrderedDict
+from typing import Dict, Any, Callable, List, Optional, Tuple
 from langchain_core.messages import BaseMessage
+from langchain_core.runnables import Runnable
 from langchain_google_genai import ChatGoogleGenerativeAI
+from src.core.config import settings
+from src.shared.llm.llm_scheduler import PRIORITY_NORMAL, llm_key, llm_scheduler
 
 
 class BaseAgent(ABC):
@@ -18,6 +22,11 @@ class BaseAgent(ABC):
         temperature: LLM temperature 설정
     """
 
+    # (에이전트 클래스, id(llm)) -> (llm, 체인 이름 -> 조립된 체인)
+    # 체인은 상태가 없으므로 같은 LLM 인스턴스를 쓰는 에이전트끼리 공유합니다.
+    # LLM 인스턴스가 계속 바뀌어도 무한히 커지지 않도록 최근 사용 순으로 상한을 둡니다.
+    _chain_cache: "OrderedDict[Tuple[type, int], Tuple[Any, Dict[str, Runnable]]]" = OrderedDict()
+
     def __init__(
         self, llm: ChatGoogleGenerativeAI, name: str, temperature: float = 0.7
     ):
@@ -32,6 +41,44 @@ class BaseAgent(ABC):
         self.name = name
         self.temperature = temperature
 
+    def _get_chains(self, build: Callable[[Any], Dict[str, Runnable]]) -> Dict[str, Runnable]:
+        """LLM 인스턴스별로 조립한 체인 반환 (최초 1회만 조립)
+
+        에이전트는 노드 실행마다 생성되므로 프롬프트 | LLM 체인 조립을
+        클래스 단위로 캐싱해 생성 비용을 없앱니다.
+
+        Args:
+            build: LLM을 받아 체인 이름 -> 체인 딕셔너리를 만드는 함수
+
+        Returns:
+            체인 이름 -> 체인 딕셔너리
+        """
+        cache = BaseAgent._chain_cache
+        key = (type(self), id(self.llm))
+        entry = cache.get(key)
+        # id 재사용 방지를 위해 LLM 인스턴스 자체도 함께 비교
+        if entry is None or entry[0] is not self.llm:
+            entry = (self.llm, build(self.llm))
+            cache[key] = entry
+        cache.move_to_end(key)
+        while len(cache) > settings.AGENT_CHAIN_CACHE_MAX_ENTRIES:
+            cache.popitem(last=False)
+        return entry[1]
+
+    async def _ainvoke(self, chain: Runnable, inputs: Dict[str, Any], priority: int = PRIORITY_NORMAL) -> Any:
+        """전역 LLM 스케줄러(동시 실행 상한 + 호출 속도 제한)를 거쳐 체인 실행
+
+        Args:
+            chain: 실행할 체인
+            inputs: 체인 입력
+            priority: 스케줄러 우선순위 (작을수록 먼저 실행)
+
+        Returns:
+            체인 실행 결과
+        """
+        async with llm_scheduler.slot(*llm_key(self.llm), priority=priority):
+            return await chain.ainvoke(inputs)
+
     @abstractmethod
     async def generate_response(
         self, context: Dict[str, Any], messages: Optional[List[BaseMessage]] = None
@@ -1,11 +1,14 @@
 """LLM 초기화 및 설정 유틸리티"""
 
 from langchain_google_genai import ChatGoogleGenerativeAI
-from core.config import settings
+from src.shared.llm import llm_client
 
 
 def get_llm(temperature: float = 0.7, model: str = None) -> ChatGoogleGenerativeAI:
-    """LLM 인스턴스 생성
+    """LLM 인스턴스 반환
+
+    같은 모델/temperature 조합은 공용 레지스트리(llm_registry)의 인스턴스를 재사용하므로
+    에이전트를 여러 번 생성해도 SDK 클라이언트와 커넥션 풀은 새로 만들지 않습니다.
 
     Args:
         temperature: LLM temperature (0.0 ~ 1.0)
@@ -20,16 +23,11 @@ def get_llm(temperature: float = 0.7, model: str = None) -> ChatGoogleGenerative
         >>> llm = get_llm(temperature=0.5)
         >>> response = await llm.ainvoke("Hello")
     """
-    return ChatGoogleGenerativeAI(
-        model=model or settings.GEMINI_MODEL,
-        google_api_key=settings.GOOGLE_API_KEY,
-        temperature=temperature,
-        convert_system_message_to_human=True,  # Gemini는 system 메시지를 human으로 변환 필요
-    )
+    return llm_client.get_llm(temperature=temperature, model=model)
 
 
 def get_moderator_llm() -> ChatGoogleGenerativeAI:
-    """Moderator Agent용 LLM 인스턴스 생성
+    """Moderator Agent용 LLM 인스턴스 반환
 
     중재자는 객관적이고 일관된 응답이 필요하므로 낮은 temperature 사용
 
@@ -40,7 +38,7 @@ def get_moderator_llm() -> ChatGoogleGenerativeAI:
 
 
 def get_persona_llm() -> ChatGoogleGenerativeAI:
-    """PersonaAgent용 LLM 인스턴스 생성
+    """PersonaAgent용 LLM 인스턴스 반환
 
     페르소나는 다양하고 개성있는 응답이 필요하므로 높은 temperature 사용
 
@@ -7,6 +7,7 @@ from typing import Dict, Any, List, Optional
 from langchain_core.messages import BaseMessage, AIMessage
 from langchain_google_genai import ChatGoogleGenerativeAI
 
+from src.shared.llm.llm_scheduler import PRIORITY_HIGH
 from .base_agent import BaseAgent
 from .llm_config import get_moderator_llm
 from ..prompts.moderator_prompts import (
@@ -45,11 +46,21 @@ class ModeratorAgent(BaseAgent):
 
         super().__init__(llm=llm, name="moderator", temperature=0.3)
 
-        # LLM Chain 초기화
-        self.topic_chain = TOPIC_PROPOSAL_PROMPT | self.llm
-        self.summary_chain = SUMMARIZE_PROMPT | self.llm
-        self.consensus_chain = CONSENSUS_GUIDE_PROMPT | self.llm
-        self.rank_chain = RANK_CANDIDATES_PROMPT | self.llm | JsonOutputParser()
+        # LLM Chain 초기화 (같은 LLM이면 이전에 조립한 체인 재사용)
+        chains = self._get_chains(self._build_chains)
+        self.topic_chain = chains["topic"]
+        self.summary_chain = chains["summary"]
+        self.consensus_chain = chains["consensus"]
+        self.rank_chain = chains["rank"]
+
+    @staticmethod
+    def _build_chains(llm: ChatGoogleGenerativeAI) -> Dict[str, Any]:
+        return {
+            "topic": TOPIC_PROPOSAL_PROMPT | llm,
+            "summary": SUMMARIZE_PROMPT | llm,
+            "consensus": CONSENSUS_GUIDE_PROMPT | llm,
+            "rank": RANK_CANDIDATES_PROMPT | llm | JsonOutputParser(),
+        }
 
     async def generate_response(
         self, context: Dict[str, Any], messages: Optional[List[BaseMessage]] = None
@@ -132,7 +143,8 @@ class ModeratorAgent(BaseAgent):
         previous_summary_text = previous_summary or "첫 번째 라운드입니다."
 
         # LLM 호출
-        response = await self.topic_chain.ainvoke(
+        response = await self._ainvoke(
+            self.topic_chain,
             {
                 "round_num": round_num,
                 "max_rounds": max_rounds,
@@ -173,7 +185,8 @@ class ModeratorAgent(BaseAgent):
         )
 
         # LLM 호출
-        response = await self.summary_chain.ainvoke(
+        response = await self._ainvoke(
+            self.summary_chain,
             {
                 "round_num": round_num,
                 "num_participants": num_participants,
@@ -228,7 +241,8 @@ class ModeratorAgent(BaseAgent):
             current_votes = "아직 투표가 없습니다."
 
         # LLM 호출
-        response = await self.consensus_chain.ainvoke(
+        response = await self._ainvoke(
+            self.consensus_chain,
             {
                 "round_num": round_num,
                 "max_rounds": max_rounds,
@@ -278,12 +292,15 @@ class ModeratorAgent(BaseAgent):
 
         # LLM 호출
         try:
-            response = await self.rank_chain.ainvoke(
+            # 최종 랭킹은 워크플로 마지막 단계이므로 다른 호출보다 먼저 실행
+            response = await self._ainvoke(
+                self.rank_chain,
                 {
                     "candidates_info": candidates_info,
                     "discussion_summary": discussion_summary,
                     "messages": discussion_text,
-                }
+                },
+                priority=PRIORITY_HIGH,
             )
             return response
         except Exception as e:
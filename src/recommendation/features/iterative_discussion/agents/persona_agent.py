@@ -54,9 +54,17 @@ class PersonaAgent(BaseAgent):
         self.user_id = user_id
         self.persona_data = persona_data or self._get_default_persona()
 
-        # LLM 체인 초기화
-        self.discussion_chain = PERSONA_DISCUSSION_PROMPT | self.llm
-        self.vote_chain = PERSONA_VOTE_PROMPT | self.llm
+        # LLM 체인 초기화 (같은 LLM이면 이전에 조립한 체인 재사용)
+        chains = self._get_chains(self._build_chains)
+        self.discussion_chain = chains["discussion"]
+        self.vote_chain = chains["vote"]
+
+    @staticmethod
+    def _build_chains(llm: ChatGoogleGenerativeAI) -> Dict[str, Any]:
+        return {
+            "discussion": PERSONA_DISCUSSION_PROMPT | llm,
+            "vote": PERSONA_VOTE_PROMPT | llm,
+        }
 
     def _get_default_persona(self) -> Dict[str, Any]:
         """기본 페르소나 데이터 반환
@@ -105,7 +113,8 @@ class PersonaAgent(BaseAgent):
         conversation_history = self._format_conversation(messages or [])
 
         # LLM 호출
-        response = await self.discussion_chain.ainvoke(
+        response = await self._ainvoke(
+            self.discussion_chain,
             {
                 "persona_info": persona_info,
                 "round_num": round_num,
@@ -176,7 +185,8 @@ class PersonaAgent(BaseAgent):
         candidates_info = self._format_candidates(candidates)
 
         # LLM 호출
-        response = await self.vote_chain.ainvoke(
+        response = await self._ainvoke(
+            self.vote_chain,
             {
                 "persona_info": persona_info,
                 "candidates_info": candidates_info,
@@ -120,7 +120,9 @@ async def run_iterative_discussion(
     from ...repositories.restaurant_repository import RestaurantRepository
 
     restaurant_repo = RestaurantRepository()
-    restaurant_docs = await restaurant_repo.find_by_ids(candidate_restaurant_ids)
+    restaurant_docs = await restaurant_repo.find_by_ids(
+        candidate_restaurant_ids, projection="summary"
+    )
 
     candidate_restaurants = []
     for doc in restaurant_docs:
@@ -1,5 +1,6 @@
 from langchain_core.output_parsers import StrOutputParser
 from src.shared.llm.llm_client import get_llm
+from src.shared.llm.llm_scheduler import llm_key, llm_scheduler
 from src.recommendation.features.persona_manager.prompts.persona_prompt import (
     BASE_PERSONA_PROMPT,
 )
@@ -39,18 +40,19 @@ async def create_persona_description(request: UpdatePersonaDBRequest, callbacks:
     llm = get_llm(temperature=0.7)  # 창의성 조절
     chain = BASE_PERSONA_PROMPT | llm | StrOutputParser()
 
-    persona_desc = await chain.ainvoke(
-        {
-            "nickname": user_data.nickname,
-            "gender": user_data.gender,
-            "age_group": user_data.age_group,
-            "allergies": allergies_str,
-            "like_food_categories": like_foods_str,
-            "preferred_ingredients": preferred_ingredients_str,
-            "other_characteristics": user_data.other_characteristics,
-            "reviews": reviews_str,
-        },
-        config={"callbacks": callbacks}
-    )
+    async with llm_scheduler.slot(*llm_key(llm)):
+        persona_desc = await chain.ainvoke(
+            {
+                "nickname": user_data.nickname,
+                "gender": user_data.gender,
+                "age_group": user_data.age_group,
+                "allergies": allergies_str,
+                "like_food_categories": like_foods_str,
+                "preferred_ingredients": preferred_ingredients_str,
+                "other_characteristics": user_data.other_characteristics,
+                "reviews": reviews_str,
+            },
+            config={"callbacks": callbacks}
+        )
 
     return persona_desc.strip('"')  # 혹시 모를 따옴표 제거
@@ -0,0 +1,118 @@
+import hashlib
+import json
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+ALLERGY_KEYWORDS_PATH = Path(__file__).resolve().parents[3] / "shared/json/allergies_keywords_ko.jsonl"
+
+# (매칭된 키워드, 알러지 타입)
+Match = Tuple[str, str]
+
+
+def menus_hash(menus: Optional[List[Dict[str, Any]]]) -> str:
+    """알러지 판정에 쓰이는 메뉴 이름/설명 기준 해시 (메뉴 변경 감지용)"""
+    pairs = [(menu.get("title", ""), menu.get("description", "")) for menu in menus or []]
+    return hashlib.sha1(json.dumps(pairs, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class AllergenMatcher:
+    """
+    알러지 키워드 다중 패턴 매처 (Aho-Corasick)
+
+    모든 알러지 키워드를 하나의 오토마톤으로 컴파일해 두고,
+    메뉴 텍스트를 한 번만 훑어 포함된 키워드와 알러지 타입을 찾습니다.
+    """
+
+    def __init__(self, keywords_map: Dict[str, List[str]]):
+        self.keywords_map = keywords_map
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Match]] = [[]]
+        self._build()
+
+    @classmethod
+    def from_jsonl(cls, path: Path = ALLERGY_KEYWORDS_PATH) -> "AllergenMatcher":
+        """allergies_keywords_ko.jsonl 로드 후 매처 생성"""
+        keywords_map: Dict[str, List[str]] = {}
+        if Path(path).exists():
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    data = json.loads(line)
+                    keywords_map[data["allergy_type"]] = data["keywords"]
+        else:
+            print(f"알러지 키워드 파일을 찾을 수 없습니다: {path}")
+        return cls(keywords_map)
+
+    def _build(self):
+        # 1. 키워드 트라이 구성
+        for allergy_type, keywords in self.keywords_map.items():
+            for keyword in keywords:
+                if not keyword:
+                    continue
+                state = 0
+                for ch in keyword:
+                    nxt = self._goto[state].get(ch)
+                    if nxt is None:
+                        nxt = len(self._goto)
+                        self._goto.append({})
+                        self._fail.append(0)
+                        self._output.append([])
+                        self._goto[state][ch] = nxt
+                    state = nxt
+                self._output[state].append((keyword, allergy_type))
+
+        # 2. BFS로 실패 링크 구성 (실패 링크의 출력도 합쳐둠)
+        queue = deque(self._goto[0].values())  # 깊이 1 노드의 실패 링크는 루트
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._output[nxt] = self._output[nxt] + self._output[self._fail[nxt]]
+
+    def scan(self, text: str, allergy_types: Optional[Iterable[str]] = None) -> List[Match]:
+        """
+        텍스트에 포함된 (키워드, 알러지 타입) 목록을 등장 순서대로 반환합니다.
+
+        Args:
+            text: 검사할 텍스트 (메뉴 이름 + 설명 등)
+            allergy_types: 지정하면 해당 알러지 타입의 키워드만 반환
+        """
+        if not text:
+            return []
+        targets: Optional[Set[str]] = set(allergy_types) if allergy_types is not None else None
+
+        matches: List[Match] = []
+        seen: Set[Match] = set()
+        state = 0
+        for ch in text:
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            for match in self._output[state]:
+                if match in seen or (targets is not None and match[1] not in targets):
+                    continue
+                seen.add(match)
+                matches.append(match)
+        return matches
+
+    def match_types(self, text: str) -> Set[str]:
+        """텍스트에서 검출된 알러지 타입 집합"""
+        return {allergy_type for _, allergy_type in self.scan(text)}
+
+
+_matcher: Optional[AllergenMatcher] = None
+
+
+def get_allergen_matcher() -> AllergenMatcher:
+    """프로세스 전역 매처 반환 (최초 1회 키워드 파일 로드 및 컴파일)"""
+    global _matcher
+    if _matcher is None:
+        _matcher = AllergenMatcher.from_jsonl()
+    return _matcher
@@ -0,0 +1,220 @@
+"""
+restaurants 컬렉션 알러지 태깅 (오프라인 배치)
+
+메뉴마다 검출된 AllergyType을 menus.N.allergens에 저장하고, 식당 단위로
+- allergens: 메뉴 전체에서 검출된 알러지 타입
+- safe_main_counts: 알러지 타입별 해당 알러지가 없는 메인 메뉴 수
+- unsafe_for: 안전한 메인 메뉴가 하나도 없는 알러지 타입 (요청 경로 tagged_verdict의 제외 조건)
+- allergen_menus_hash: 태깅 당시 메뉴 해시 (메뉴가 바뀌면 요청 경로에서 태그를 무시)
+를 함께 저장합니다. updated_at도 갱신해 인메모리 공간 인덱스가 다음 폴링에서 태그를 반영합니다.
+
+실행: python -m src.recommendation.features.restaurant_filtering.allergen_tagging [--all] [--confirm-with-llm]
+"""
+
+import argparse
+import asyncio
+from datetime import datetime
+from time import time
+from typing import Any, Dict, Iterable, List, Optional, Set
+from pydantic import BaseModel, Field
+from pymongo import UpdateOne
+from src.recommendation.enums.user_enums import AllergyType
+from src.recommendation.features.restaurant_filtering.allergen_matcher import (
+    AllergenMatcher,
+    get_allergen_matcher,
+    menus_hash,
+)
+from src.recommendation.features.restaurant_filtering.price_features import is_main_menu
+from src.shared.database import get_db, connect_to_mongo, close_mongo_connection, ensure_indexes
+from src.shared.llm.llm_client import get_openai_llm
+from src.shared.llm.llm_scheduler import PRIORITY_LOW, llm_key, llm_scheduler
+
+ALLERGEN_TAGGING_VERSION = 1
+
+
+class MenuAllergenConfirmation(BaseModel):
+    menu_title: str = Field(..., description="메뉴 이름")
+    allergy_types: List[AllergyType] = Field(..., description="실제로 포함될 가능성이 높은 알러지 타입")
+
+
+class BatchMenuAllergenConfirmation(BaseModel):
+    results: List[MenuAllergenConfirmation]
+
+
+def tag_menus(menus: List[Dict[str, Any]], matcher: AllergenMatcher) -> List[List[str]]:
+    """메뉴별 검출된 알러지 타입 목록 (키워드 매칭)"""
+    tags = []
+    for menu in menus:
+        text = f"{menu.get('title', '')} {menu.get('description', '')}"
+        tags.append(sorted(matcher.match_types(text)))
+    return tags
+
+
+def summarize_allergens(menus: List[Dict[str, Any]], menu_tags: List[List[str]]) -> Dict[str, Any]:
+    """식당 단위 알러지 요약 (검출 타입, 타입별 안전한 메인 메뉴 수, 제외 대상 타입)"""
+    allergens: Set[str] = set()
+    for tags in menu_tags:
+        allergens.update(tags)
+
+    main_tags = [set(tags) for menu, tags in zip(menus, menu_tags) if is_main_menu(menu)]
+    safe_main_counts = {
+        allergy_type.value: sum(1 for tags in main_tags if allergy_type.value not in tags)
+        for allergy_type in AllergyType
+    }
+    # 메인 메뉴 정보가 없는 식당은 판단 근거가 없으므로 제외 대상에 넣지 않음
+    unsafe_for = sorted(t for t, count in safe_main_counts.items() if main_tags and count == 0)
+    return {
+        "allergens": sorted(allergens),
+        "safe_main_counts": safe_main_counts,
+        "unsafe_for": unsafe_for,
+    }
+
+
+def tagged_verdict(
+    restaurant: Dict[str, Any], allergies: Iterable[str], min_safe_mains: int = 2
+) -> Optional[bool]:
+    """
+    태깅 결과만으로 안전 여부 판정 (요청 경로용)
+    Returns:
+        True(안전) / False(제외) / None(태그가 없거나 메뉴가 바뀌어 런타임 검토 필요)
+    """
+    allergies = set(allergies)
+    tagged_hash = restaurant.get("allergen_menus_hash")
+    if not tagged_hash or tagged_hash != menus_hash(restaurant.get("menus")):
+        return None
+    if not allergies:
+        return True
+    if allergies & set(restaurant.get("unsafe_for") or []):
+        return False
+    menus = restaurant.get("menus") or []
+    if not any(allergies & set(menu.get("allergens") or []) for menu in menus):
+        return True
+    # LLM으로 확인된 태그는 안전한 메인 메뉴 수로 바로 판정
+    if restaurant.get("allergen_confirmed"):
+        counts = restaurant.get("safe_main_counts") or {}
+        if all(counts.get(a, 0) >= min_safe_mains for a in allergies):
+            return True
+    return None
+
+
+async def confirm_with_llm(restaurant: Dict[str, Any], menu_tags: List[List[str]]) -> List[List[str]]:
+    """
+    키워드가 검출된 메뉴만 LLM으로 재확인 ("회전", "게살 없는" 등 오탐 보정)
+    LLM이 응답하지 않은 메뉴는 키워드 결과를 유지합니다.
+    """
+    menus = restaurant.get("menus", [])
+    targets = [
+        {"m": menu.get("title", ""), "d": (menu.get("description") or "")[:50], "k": tags}
+        for menu, tags in zip(menus, menu_tags)
+        if tags
+    ]
+    if not targets:
+        return menu_tags
+
+    llm = get_openai_llm()
+    structured_llm = llm.with_structured_output(BatchMenuAllergenConfirmation)
+    prompt = (
+        f"식당 '{restaurant.get('place_name')}' 메뉴별 알러지 유발 성분 확인. "
+        f"k는 키워드 매칭 결과이며, 실제 포함 가능성이 높은 타입만 남기세요.\n{targets}"
+    )
+    # 오프라인 배치는 요청 경로 호출보다 뒤로 양보
+    async with llm_scheduler.slot(*llm_key(llm), priority=PRIORITY_LOW):
+        response = await structured_llm.ainvoke(prompt)
+
+    confirmed = {r.menu_title: sorted(t.value for t in r.allergy_types) for r in response.results}
+    return [
+        confirmed.get(menu.get("title", ""), tags) if tags else tags
+        for menu, tags in zip(menus, menu_tags)
+    ]
+
+
+async def build_allergen_update(
+    restaurant: Dict[str, Any], matcher: AllergenMatcher, use_llm: bool = False
+) -> UpdateOne:
+    menus = restaurant.get("menus") or []
+    menu_tags = tag_menus(menus, matcher)
+    if use_llm:
+        try:
+            menu_tags = await confirm_with_llm(restaurant, menu_tags)
+        except Exception as e:
+            # LLM 확인 실패 시 키워드 결과로 저장
+            print(f"알러지 LLM 확인 실패 ({restaurant.get('place_name')}): {e}")
+            use_llm = False
+
+    now = datetime.now()
+    fields: Dict[str, Any] = {
+        **summarize_allergens(menus, menu_tags),
+        "allergen_menus_hash": menus_hash(menus),
+        "allergen_confirmed": use_llm,
+        "allergen_tagging_version": ALLERGEN_TAGGING_VERSION,
+        "allergen_tagged_at": now,
+        # 공간 인덱스(spatial_index)가 updated_at 기준으로 변경분을 폴링
+        "updated_at": now,
+    }
+    for i, tags in enumerate(menu_tags):
+        fields[f"menus.{i}.allergens"] = tags
+    return UpdateOne({"_id": restaurant["_id"]}, {"$set": fields})
+
+
+async def tag_restaurants(
+    retag_all: bool = False, use_llm: bool = False, batch_size: int = 200, concurrency: int = 5
+) -> int:
+    """
+    restaurants 컬렉션 알러지 태깅 (태깅 버전이 다르거나 없는 문서만, retag_all이면 전체)
+    Returns:
+        갱신한 문서 수
+    """
+    start_time = time()
+    collection = get_db()["restaurants"]
+    matcher = get_allergen_matcher()
+    query = {} if retag_all else {"allergen_tagging_version": {"$ne": ALLERGEN_TAGGING_VERSION}}
+    cursor = collection.find(
+        query, {"place_name": 1, "menus.title": 1, "menus.price": 1, "menus.description": 1}
+    )
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def build(doc):
+        async with semaphore:
+            return await build_allergen_update(doc, matcher, use_llm)
+
+    updated = 0
+    batch: List[Dict[str, Any]] = []
+
+    async def flush():
+        nonlocal updated
+        operations = await asyncio.gather(*(build(doc) for doc in batch))
+        if operations:
+            result = await collection.bulk_write(operations, ordered=False)
+            updated += result.modified_count
+        batch.clear()
+
+    async for doc in cursor:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            await flush()
+            print(f"알러지 태깅 진행 중: {updated}개")
+    if batch:
+        await flush()
+
+    print(f"알러지 태깅 완료: {updated}개 ({time() - start_time:.4f}초)")
+    return updated
+
+
+async def _main():
+    parser = argparse.ArgumentParser(description="restaurants 알러지 태깅")
+    parser.add_argument("--all", action="store_true", help="이미 태깅된 문서도 다시 태깅")
+    parser.add_argument("--confirm-with-llm", action="store_true", help="키워드 검출 메뉴를 LLM으로 재확인")
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+
+    await connect_to_mongo()
+    try:
+        await ensure_indexes()
+        await tag_restaurants(args.all, args.confirm_with_llm, args.batch_size)
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
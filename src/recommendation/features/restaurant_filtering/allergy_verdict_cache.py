@@ -0,0 +1,176 @@
+import asyncio
+from collections import OrderedDict
+from datetime import datetime
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+from pymongo import UpdateOne
+from src.core.config import settings
+from src.recommendation.features.restaurant_filtering.allergen_matcher import menus_hash
+from src.shared.database import get_db
+
+VERDICT_COLLECTION = "allergy_verdicts"
+
+# 판정 결과: {"is_safe": bool, "reason": str}
+Verdict = Dict[str, Any]
+# 캐시 미스 항목(키 -> 식당 정보)을 받아 판정 결과(키 -> 판정)를 돌려주는 함수
+CheckFn = Callable[[Dict[str, Any]], Awaitable[Dict[str, Verdict]]]
+
+
+def make_verdict_key(restaurant: Dict[str, Any], allergies: Iterable[str]) -> str:
+    """
+    식당 ID + 정렬된 알러지 목록 + 메뉴 해시로 캐시 키 생성
+    메뉴가 바뀌면 해시가 달라지므로 이전 판정은 자연스럽게 무효화됩니다.
+    """
+    restaurant_id = str(restaurant.get("id") or restaurant.get("_id") or restaurant.get("place_name"))
+    return f"{restaurant_id}|{','.join(sorted(set(allergies)))}|{menus_hash(restaurant.get('menus'))}"
+
+
+class AllergyVerdictCache:
+    """
+    알러지 LLM 판정 결과 캐시 (인메모리 LRU + Mongo allergy_verdicts 컬렉션)
+
+    조회 순서는 메모리 -> Mongo -> LLM이며, 같은 키에 대한 동시 판정은
+    먼저 시작한 요청의 결과를 함께 기다립니다.
+    """
+
+    def __init__(self, max_entries: int = 2048, ttl_sec: int = 604800, collection_name: str = VERDICT_COLLECTION):
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+        self.collection_name = collection_name
+        self._entries: "OrderedDict[str, Tuple[float, Verdict]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.db_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.db_hits) / total, 4) if total else 0.0,
+        }
+
+    def clear(self):
+        self._entries.clear()
+
+    async def resolve(self, items: Dict[str, Any], check: CheckFn) -> Dict[str, Optional[Verdict]]:
+        """
+        키별 판정 결과 반환 (판정하지 못한 키는 None)
+
+        Args:
+            items: 캐시 키 -> 판정 대상 (check에 그대로 전달)
+            check: 캐시에 없는 항목을 판정하는 함수 (LLM 호출)
+        """
+        results: Dict[str, Optional[Verdict]] = {}
+        waiting: Dict[str, asyncio.Task] = {}
+        owned: List[str] = []
+
+        for key in items:
+            verdict = self._get(key)
+            if verdict is not None:
+                self.hits += 1
+                results[key] = verdict
+            elif key in self._inflight:
+                waiting[key] = self._inflight[key]
+            else:
+                owned.append(key)
+
+        if owned:
+            # 판정은 별도 태스크로 실행해 먼저 온 요청이 취소(타임아웃/연결 종료)되어도 대기 중인 요청은 결과를 받음
+            task = asyncio.create_task(self._resolve_owned(owned, items, check))
+            # 기다리는 요청이 모두 취소된 경우 "exception was never retrieved" 경고 방지
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            for key in owned:
+                self._inflight[key] = task
+            resolved = await asyncio.shield(task)
+            for key in owned:
+                results[key] = resolved.get(key)
+
+        for key, task in waiting.items():
+            results[key] = (await asyncio.shield(task)).get(key)
+        return results
+
+    async def _resolve_owned(
+        self, owned: List[str], items: Dict[str, Any], check: CheckFn
+    ) -> Dict[str, Verdict]:
+        """메모리에 없는 키를 Mongo -> LLM 순으로 판정하고 메모리 캐시에 저장"""
+        try:
+            resolved = await self._load(owned)
+            self.db_hits += len(resolved)
+
+            missing = {key: items[key] for key in owned if key not in resolved}
+            if missing:
+                self.misses += len(missing)
+                checked = await check(missing)
+                checked = {key: checked[key] for key in missing if key in checked}
+                await self._store(checked)
+                resolved.update(checked)
+
+            for key, verdict in resolved.items():
+                self._put(key, verdict)
+            return resolved
+        finally:
+            for key in owned:
+                self._inflight.pop(key, None)
+
+    def _get(self, key: str) -> Optional[Verdict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, verdict = entry
+        if expires_at < monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return verdict
+
+    def _put(self, key: str, verdict: Verdict):
+        self._entries[key] = (monotonic() + self.ttl_sec, verdict)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _load(self, keys: List[str]) -> Dict[str, Verdict]:
+        try:
+            cursor = get_db()[self.collection_name].find({"_id": {"$in": keys}})
+            docs = await cursor.to_list(length=None)
+        except Exception as e:
+            # 캐시 조회 실패 시 LLM 판정으로 진행
+            print(f"알러지 판정 캐시 조회 실패: {e}")
+            return {}
+        return {doc["_id"]: {"is_safe": doc["isSafe"], "reason": doc.get("reason", "")} for doc in docs}
+
+    async def _store(self, verdicts: Dict[str, Verdict]):
+        if not verdicts:
+            return
+        now = datetime.now()
+        try:
+            operations = []
+            for key, verdict in verdicts.items():
+                # 식당 ID는 place_name으로 대체될 수 있어 "|"를 포함할 수 있으므로 뒤에서부터 분리
+                restaurant_id, allergies, menus_digest = key.rsplit("|", 2)
+                operations.append(UpdateOne(
+                    {"_id": key},
+                    {"$set": {
+                        "restaurantId": restaurant_id,
+                        "allergies": allergies.split(",") if allergies else [],
+                        "menusHash": menus_digest,
+                        "isSafe": verdict["is_safe"],
+                        "reason": verdict.get("reason", ""),
+                        "createdAt": now,
+                    }},
+                    upsert=True,
+                ))
+            await get_db()[self.collection_name].bulk_write(operations, ordered=False)
+        except Exception as e:
+            # 저장 실패해도 이번 요청의 판정 결과는 그대로 사용
+            print(f"알러지 판정 캐시 저장 실패: {e}")
+
+
+allergy_verdict_cache = AllergyVerdictCache(
+    max_entries=settings.ALLERGY_VERDICT_CACHE_MAX_ENTRIES,
+    ttl_sec=settings.ALLERGY_VERDICT_CACHE_TTL_SEC,
+)
@@ -0,0 +1,115 @@
+from typing import Any, Dict, List
+import numpy as np
+from src.recommendation.features.restaurant_filtering.price_features import get_price_features
+
+# 메인 기본(0.4) + 음료 전원(0.3) + 사이드 전원(0.3) = 1.0
+MEAL_SCORE = 0.4
+DRINK_SCORE = 0.3
+FULL_SIDE_SCORE = 0.3
+SHARED_SIDE_SCORE = 0.1
+
+
+def score_budget(restaurants: List[Dict[str, Any]], total_budget: int, member_count: int) -> List[Dict[str, Any]]:
+    """
+    사전 계산된 가격 특성(price_features)으로 후보 전체의 예산 점수를 한 번에 계산합니다.
+    (메뉴 개수와 무관하게 식당당 고정 비용)
+
+    - 메인 메뉴가 없는 식당: 점수 없이 그대로 통과
+    - 대표 메인 메뉴 x 인원이 예산을 넘는 식당: 제외
+    - 나머지: budget_score / total_score / budget_recommendation / budget_usage_pct 추가
+
+    Returns:
+        살아남은 식당 목록 (통합 점수 높은 순)
+    """
+    if not restaurants:
+        return []
+    n = len(restaurants)
+    features = [get_price_features(r) for r in restaurants]
+
+    meal = np.array([f.get("meal_price") or np.nan for f in features], dtype=float)
+    drink = np.array([f.get("drink_price") or np.nan for f in features], dtype=float)
+    distance = np.array([r.get("distance_score", 0.0) for r in restaurants], dtype=float)
+
+    # 사이드 가격은 오름차순으로 저장되어 있으므로 inf로 채운 2차원 배열로 변환
+    side_lists = [f.get("side_prices") or [] for f in features]
+    max_sides = max((len(s) for s in side_lists), default=0)
+    sides = np.full((n, max(max_sides, 1)), np.inf)
+    for i, prices in enumerate(side_lists):
+        sides[i, : len(prices)] = prices
+    cheapest_side = sides[:, 0]
+
+    # 1. 메인 메뉴 검토: 대표 메인 메뉴 기준 전원 주문 가능 여부
+    has_meal = ~np.isnan(meal)
+    full_meal_cost = np.where(has_meal, meal * member_count, 0.0)
+    feasible = has_meal & (full_meal_cost <= total_budget)
+    remaining = total_budget - full_meal_cost
+
+    # 2. 전원 음료(1인 1잔) 추가 가능 여부
+    drink_total = drink * member_count
+    has_full_drinks = feasible & ~np.isnan(drink) & (drink_total <= remaining)
+    remaining = np.where(has_full_drinks, remaining - drink_total, remaining)
+
+    # 3. 사이드: 전원 사이드 가능 -> 팀 공용 사이드(남은 예산 내 가장 비싼 것) 순으로 검토
+    full_side = feasible & (cheapest_side * member_count <= remaining)
+    shared_side = feasible & ~full_side & (cheapest_side <= remaining)
+    fit_idx = np.maximum((sides <= remaining[:, None]).sum(axis=1) - 1, 0)
+    shared_price = sides[np.arange(n), fit_idx]
+    # 같은 가격이 여럿이면 메뉴 순서상 첫 번째 사이드 선택
+    shared_idx = (sides < shared_price[:, None]).sum(axis=1)
+    remaining = np.where(full_side, remaining - cheapest_side * member_count, remaining)
+    remaining = np.where(shared_side, remaining - shared_price, remaining)
+
+    # 4. 가점 계산 및 통합 점수 (거리 점수 50% + 예산 점수 50%)
+    budget_score = (
+        MEAL_SCORE
+        + DRINK_SCORE * has_full_drinks
+        + FULL_SIDE_SCORE * full_side
+        + SHARED_SIDE_SCORE * shared_side
+    )
+    total_score = distance * 0.5 + budget_score * 0.5
+
+    # 5. 데이터 업데이트 (Mongo 저장을 위해 파이썬 기본 타입으로 변환)
+    results = []
+    for i, restaurant in enumerate(restaurants):
+        if not has_meal[i]:
+            results.append(restaurant)
+            continue
+        if not feasible[i]:
+            continue
+
+        f = features[i]
+        unit_meal = int(meal[i])
+        orders = [{"title": f["meal_title"], "count": member_count, "unit_price": unit_meal}]
+        if has_full_drinks[i]:
+            orders.append({"title": f["drink_title"], "count": member_count, "unit_price": int(drink[i])})
+        if full_side[i]:
+            orders.append({
+                "title": f["side_titles"][0],
+                "count": member_count,
+                "unit_price": int(cheapest_side[i]),
+                "note": "1인 1사이드 가능",
+            })
+        elif shared_side[i]:
+            orders.append({
+                "title": f["side_titles"][shared_idx[i]],
+                "count": 1,
+                "unit_price": int(shared_price[i]),
+                "note": "팀 공용 사이드",
+            })
+
+        left = int(remaining[i])
+        restaurant["budget_score"] = round(float(budget_score[i]), 2)
+        restaurant["total_score"] = round(float(total_score[i]), 2)
+        restaurant["budget_recommendation"] = {
+            "type": "team_package",
+            "message": f"인당 {total_budget // member_count}원 예산 최적화 구성",
+            "menu_details": orders,
+            "total_spent": total_budget - left,
+            "remaining_budget": left,
+        }
+        restaurant["budget_usage_pct"] = ((total_budget - left) / total_budget) * 100
+        results.append(restaurant)
+
+    # 최종 정렬: 통합 점수(거리+예산) 높은 순
+    results.sort(key=lambda x: x.get("total_score", 0), reverse=True)
+    return results
@@ -0,0 +1,152 @@
+import asyncio
+import math
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from src.core.config import settings
+from src.shared.geo import geohash
+from src.shared.geo.distance import haversine, distance_score
+
+# (중심 경도, 중심 위도, 조회 반경, 1인 예산 상한) -> 후보 식당 목록
+FetchFn = Callable[[float, float, int, Optional[float]], Awaitable[List[Dict[str, Any]]]]
+# (geohash 셀, 반경, 1인 예산 구간 상한)
+CacheKey = Tuple[str, int, Optional[float]]
+
+
+class GeoTileCache:
+    """
+    geohash 셀 + 반경 단위 거리 필터링 결과 캐시 (TTL + LRU)
+
+    같은 셀에 속한 요청은 셀 중심 기준으로 "반경 + 셀 대각선 절반"만큼 넓게 조회해 둔
+    후보군을 공유하고, 실제 요청 좌표 기준의 거리/거리 점수만 다시 계산합니다.
+    1인 예산은 budget_bucket 단위로 올림한 구간 상한을 키에 포함하고 조회 조건으로 넘기므로
+    같은 구간의 그룹끼리 후보군을 공유합니다. (정확한 예산 검사는 호출 측에서 수행)
+    """
+
+    def __init__(self, precision: int = 7, ttl_sec: int = 300, max_entries: int = 512, budget_bucket: int = 5000):
+        self.precision = precision
+        self.budget_bucket = budget_bucket
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._inflight: Dict[CacheKey, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+    def clear(self):
+        self._entries.clear()
+
+    async def get_or_fetch(
+        self,
+        longitude: float,
+        latitude: float,
+        max_distance: int,
+        fetch: FetchFn,
+        max_meal_price: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        요청 좌표 기준 반경 내 식당을 가까운 순으로 반환합니다.
+        (distance / distance_score 필드를 채운 사본, max_meal_price를 주면 예산 구간 상한으로 사전 필터)
+        """
+        cell = geohash.encode(longitude, latitude, self.precision)
+        key = (cell, max_distance, self._budget_ceiling(max_meal_price))
+
+        candidates = self._get(key)
+        if candidates is None:
+            self.misses += 1
+            candidates = await self._fetch_once(key, max_distance, fetch)
+        else:
+            self.hits += 1
+
+        return self._rescore(candidates, longitude, latitude, max_distance)
+
+    def _budget_ceiling(self, max_meal_price: Optional[float]) -> Optional[float]:
+        """1인 예산을 budget_bucket 단위로 올림 (구간 상한 이하 식당만 조회하므로 실제 예산보다 넓은 후보군)"""
+        if max_meal_price is None:
+            return None
+        if self.budget_bucket <= 0:
+            return float(max_meal_price)
+        return float(math.ceil(max_meal_price / self.budget_bucket) * self.budget_bucket)
+
+    def _get(self, key: CacheKey) -> Optional[List[Dict[str, Any]]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, candidates = entry
+        if expires_at < monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return candidates
+
+    def _put(self, key: CacheKey, candidates: List[Dict[str, Any]]):
+        self._entries[key] = (monotonic() + self.ttl_sec, candidates)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def _fetch_once(
+        self, key: CacheKey, max_distance: int, fetch: FetchFn
+    ) -> List[Dict[str, Any]]:
+        # 같은 셀에 대한 동시 요청은 한 번만 조회
+        # 조회는 별도 태스크로 실행해 먼저 온 요청이 취소(타임아웃/연결 종료)되어도 대기 중인 요청은 결과를 받음
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(key, max_distance, fetch))
+            # 기다리는 요청이 모두 취소된 경우 "exception was never retrieved" 경고 방지
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _fetch(
+        self, key: CacheKey, max_distance: int, fetch: FetchFn
+    ) -> List[Dict[str, Any]]:
+        try:
+            center_lon, center_lat = geohash.decode_center(key[0])
+            min_lon, min_lat, _, _ = geohash.decode_bbox(key[0])
+            padding = haversine(center_lon, center_lat, min_lon, min_lat)
+            candidates = await fetch(center_lon, center_lat, int(max_distance + padding) + 1, key[2])
+            self._put(key, candidates)
+            return candidates
+        finally:
+            self._inflight.pop(key, None)
+
+    @staticmethod
+    def _rescore(
+        candidates: List[Dict[str, Any]], longitude: float, latitude: float, max_distance: int
+    ) -> List[Dict[str, Any]]:
+        scored_list = []
+        for doc in candidates:
+            coords = (doc.get("location") or {}).get("coordinates")
+            if not coords:
+                continue
+            dist = haversine(longitude, latitude, coords[0], coords[1])
+            if dist > max_distance:
+                continue
+            # 이후 노드에서 점수 필드를 덧붙이므로 사본을 반환
+            scored = dict(doc)
+            scored["distance"] = int(dist)
+            scored["distance_score"] = distance_score(dist, max_distance)
+            scored_list.append((dist, scored))
+        scored_list.sort(key=lambda item: item[0])
+        return [scored for _, scored in scored_list]
+
+
+geo_tile_cache = GeoTileCache(
+    precision=settings.GEO_CACHE_PRECISION,
+    ttl_sec=settings.GEO_CACHE_TTL_SEC,
+    max_entries=settings.GEO_CACHE_MAX_ENTRIES,
+    budget_bucket=settings.GEO_CACHE_BUDGET_BUCKET,
+)
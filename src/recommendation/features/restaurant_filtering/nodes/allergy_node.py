@@ -1,14 +1,21 @@
 import os
-import json
 from bson import ObjectId
-from src.shared.db.db_manager import MongoManager
+from langchain_core.runnables import RunnableConfig
+from src.recommendation.repositories.user_loader import get_user_loader
+from src.recommendation.features.restaurant_filtering.allergen_matcher import AllergenMatcher, get_allergen_matcher
+from src.recommendation.features.restaurant_filtering.allergen_tagging import tagged_verdict
+from src.recommendation.features.restaurant_filtering.allergy_verdict_cache import (
+    allergy_verdict_cache,
+    make_verdict_key,
+)
 from src.recommendation.workflows.states.recommendation_state import RecommendationState
 from src.shared.llm.llm_client import get_openai_llm
+from src.shared.llm.llm_scheduler import llm_key, llm_scheduler
 from langfuse import get_client
 from langfuse.langchain import CallbackHandler
 from src.core.config import settings
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Tuple
 import asyncio
 from time import time
 
@@ -25,129 +32,155 @@ class AllergyCheckResult(BaseModel):
 class BatchAllergyCheckResult(BaseModel):
     results: List[AllergyCheckResult]
 
-def __load_allergy_keywords():
-    """알러지 키워드 데이터 로드"""
-    keywords_map = {}
-    path = os.path.join(os.getcwd(), "src/shared/json/allergies_keywords_ko.jsonl")
-    if os.path.exists(path):
-        with open(path, 'r', encoding='utf-8') as f:
-            for line in f:
-                data = json.loads(line)
-                keywords_map[data["allergy_type"]] = data["keywords"]
-    return keywords_map
-
-def __find_potential_risks(restaurant: dict, banned_keywords: list) -> list:
-    """단순 키워드 매칭으로 위험 가능성이 있는 메뉴 선별"""
+def __find_potential_risks(restaurant: dict, matcher: AllergenMatcher, allergy_types: set) -> list:
+    """키워드 매칭으로 위험 가능성이 있는 메뉴 선별 (메뉴 텍스트당 한 번만 스캔)"""
     risks = []
     menus = restaurant.get("menus", [])
-    if not menus:
+    if not menus or not allergy_types:
         return risks
-        
+
     for menu in menus:
         title = menu.get("title", "")
         description = menu.get("description", "")
-        menu_text = f"{title} {description}"
-        
-        for keyword in banned_keywords:
-            if keyword in menu_text:
-                risks.append({
-                    "menu_title": title,
-                    "menu_description": description,
-                    "matched_keyword": keyword
-                })
-                break
+        matches = matcher.scan(f"{title} {description}", allergy_types)
+        if matches:
+            risks.append({
+                "menu_title": title,
+                "menu_description": description,
+                "matched_keyword": matches[0][0]
+            })
     return risks
 
-async def allergy_node(state: RecommendationState) -> RecommendationState:
-    start_time = time()
-    # Langfuse 클라이언트 초기화
-    langfuse_handler = CallbackHandler()
-    mongo = MongoManager()
-    mongo.set_collection("user")
-    keywords_map = __load_allergy_keywords()
+async def load_group_allergies(user_ids: List[int], config: RunnableConfig) -> set:
+    """DB에서 사용자 정보를 조회해 그룹 통합 알러지 목록 수집 (한 번의 $in 쿼리로 일괄 조회)"""
+    user_loader = get_user_loader(config)
+    _group_allergies = set()
+    for user in await user_loader.load_many(user_ids):
+        if user and user.get("allergies"):
+            for allergy in user["allergies"]:
+                _group_allergies.add(allergy)
+    return _group_allergies
 
-    try:
-        # 1. DB에서 사용자 정보 및 알러지 목록 수집
-        _user_info = []
-        _group_allergies = set()
-        for user_id in state["user_ids"]:
-            user = await mongo.read_one({"id": user_id})
-            if user:
-                _user_info.append(user)
-                if user.get("allergies"):
-                    for allergy in user["allergies"]:
-                        _group_allergies.add(allergy)
-        
-        # print(f"그룹 통합 알러지 목록: {_group_allergies}")
-        
-        # 2. 알러지 유발 키워드 리스트 추출
-        banned_keywords = []
-        for allergy_type in _group_allergies:
-            if allergy_type in keywords_map:
-                banned_keywords.extend(keywords_map[allergy_type])
-        
-        # 3. 식당 필터링
-        # 3-1. 검토 대상 식당 분류 (상위 30개만 진행)
-        risky_restaurants = []
-        final_restaurants = [] 
-        
-        target_restaurants = state["filtered_restaurants"][:30]
-        
-        for restaurant in target_restaurants:
-            potential_risks = __find_potential_risks(restaurant, banned_keywords)
-            if not potential_risks:
+def screen_allergy_keywords(restaurants: List[dict], _group_allergies: set) -> Tuple[List[dict], List[dict]]:
+    """
+    태깅 결과와 키워드 스캔으로 LLM 없이 판정 가능한 식당 분류 (CPU 전용 단계)
+    Returns:
+        (안전한 식당 목록, LLM 검토가 필요한 위험 후보 목록)
+    """
+    matcher = get_allergen_matcher()
+    risky_restaurants = []
+    final_restaurants = []
+
+    for restaurant in restaurants:
+        # 오프라인 태깅(allergen_tagging) 결과가 최신이면 키워드 스캔/LLM 검토 없이 판정
+        verdict = tagged_verdict(restaurant, _group_allergies, settings.ALLERGEN_TAG_MIN_SAFE_MAINS)
+        if verdict is not None:
+            if verdict:
                 final_restaurants.append(restaurant)
-            else:
-                risky_restaurants.append({
-                    "place_name": restaurant.get('place_name'),
-                    "menus": potential_risks,
-                    "original_data": restaurant # 나중에 결과 매칭용
+            continue
+
+        potential_risks = __find_potential_risks(restaurant, matcher, _group_allergies)
+        if not potential_risks:
+            final_restaurants.append(restaurant)
+        else:
+            risky_restaurants.append({
+                "place_name": restaurant.get('place_name'),
+                "menus": potential_risks,
+                "original_data": restaurant # 나중에 결과 매칭용
+            })
+    return final_restaurants, risky_restaurants
+
+async def filter_allergy_safe(restaurants: List[dict], _group_allergies: set, callbacks: list = None) -> List[dict]:
+    """
+    알러지 기준으로 안전한 식당만 반환
+    (태깅 결과 -> 키워드 스캔 -> 판정 캐시 -> LLM 검토 순으로 판정)
+    """
+    # 1. 검토 대상 식당 분류
+    final_restaurants, risky_restaurants = screen_allergy_keywords(restaurants, _group_allergies)
+
+    if not risky_restaurants:
+        return final_restaurants
+    
+    llm_agent = get_openai_llm()
+    structured_llm = llm_agent.with_structured_output(BatchAllergyCheckResult)
+
+    # 병렬 처리
+    semaphore = asyncio.Semaphore(5)
+    async def check_chunk(chunk):
+        async with semaphore:
+            # 1. 텍스트 최소화 (토큰 절약 및 속도 향상)
+            items_to_check = []
+            for _, r in chunk:
+                # 상위 3개 메뉴의 이름만 전달 (설명 제외)
+                short_menus = [m.get('title', '')[:20] for m in r.get("original_data", {}).get("menus", [])[:3]]
+                items_to_check.append({
+                    "n": r["place_name"], # 키값도 짧게
+                    "m": short_menus
                 })
-        
-        llm_agent = get_openai_llm()
-        structured_llm = llm_agent.with_structured_output(BatchAllergyCheckResult)
-
-        # 병렬 처리
-        semaphore = asyncio.Semaphore(5)
-        async def check_chunk(chunk):
-            async with semaphore:
-                # 1. 텍스트 최소화 (토큰 절약 및 속도 향상)
-                items_to_check = []
-                for r in chunk:
-                    # 상위 3개 메뉴의 이름만 전달 (설명 제외)
-                    short_menus = [m.get('title', '')[:20] for m in r.get("original_data", {}).get("menus", [])[:3]]
-                    items_to_check.append({
-                        "n": r["place_name"], # 키값도 짧게
-                        "m": short_menus
-                    })
-                    
-                # 2. 아주 짧고 강결한 지시
-                prompt = f"알러지 {list(_group_allergies)} 기준 안전 검토. 메인 식사가능시 is_safe:true.\n{items_to_check}"
                 
-                # LLM 호출
+            # 2. 아주 짧고 강결한 지시
+            prompt = f"알러지 {list(_group_allergies)} 기준 안전 검토. 메인 식사가능시 is_safe:true.\n{items_to_check}"
+            
+            # LLM 호출 (전역 스케줄러로 요청 간 동시 호출 수/속도 제한)
+            async with llm_scheduler.slot(*llm_key(llm_agent)):
                 response = await structured_llm.ainvoke(
                     prompt, 
-                    config={"callbacks": [langfuse_handler]}
+                    config={"callbacks": callbacks or []}
                 )
-                return chunk, response.results
+            return chunk, response.results
 
-        # 2. 모든 배치(Chunk)를 태스크 리스트로 만들기
+    async def check_risky(missing: dict) -> dict:
+        # 1. 모든 배치(Chunk)를 태스크 리스트로 만들기
+        items = list(missing.items())
         tasks = []
         batch_size = 10
-        for i in range(0, len(risky_restaurants), batch_size):
-            chunk = risky_restaurants[i:i + batch_size]
+        for i in range(0, len(items), batch_size):
+            chunk = items[i:i + batch_size]
             tasks.append(check_chunk(chunk))
 
-        # 3. 병렬 실행 및 결과 취합
+        # 2. 병렬 실행 및 결과 취합
         # 모든 태스크가 끝날 때까지 기다립니다.
         all_results = await asyncio.gather(*tasks)
-        # 4. 결과 매칭
+        verdicts = {}
         for chunk, batch_results in all_results:
             for res_item in batch_results:
-                if res_item.is_safe:
-                    original = next((r["original_data"] for r in chunk if r["place_name"] == res_item.place_name), None)
-                    if original:
-                        final_restaurants.append(original)
+                key = next((k for k, r in chunk if r["place_name"] == res_item.place_name), None)
+                if key:
+                    verdicts[key] = {"is_safe": res_item.is_safe, "reason": res_item.reason}
+        return verdicts
+
+    # 2. 판정 캐시(식당 + 알러지 조합 + 메뉴 해시)에 없는 식당만 LLM 검토
+    risky_by_key = {
+        make_verdict_key(r["original_data"], _group_allergies): r for r in risky_restaurants
+    }
+    if settings.ALLERGY_VERDICT_CACHE_ENABLED:
+        verdicts = await allergy_verdict_cache.resolve(risky_by_key, check_risky)
+    else:
+        verdicts = await check_risky(risky_by_key)
+
+    # 3. 결과 매칭
+    for key, risky in risky_by_key.items():
+        verdict = verdicts.get(key)
+        if verdict and verdict["is_safe"]:
+            final_restaurants.append(risky["original_data"])
+    return final_restaurants
+
+async def allergy_node(state: RecommendationState, config: RunnableConfig) -> RecommendationState:
+    start_time = time()
+    # Langfuse 클라이언트 초기화
+    langfuse_handler = CallbackHandler()
+
+    try:
+        # 1. 그룹 통합 알러지 목록
+        _group_allergies = await load_group_allergies(state["user_ids"], config)
+        # print(f"그룹 통합 알러지 목록: {_group_allergies}")
+
+        # 2. 식당 필터링 (상위 30개만 진행)
+        target_restaurants = state["filtered_restaurants"][:30]
+        final_restaurants = await filter_allergy_safe(
+            target_restaurants, _group_allergies, [langfuse_handler]
+        )
+
         end_time = time()
         print(f"알러지 필터링 완료: {len(final_restaurants)}개 검색됨 (가까운 순 정렬)")
         print(f"알러지 필터링 소요 시간: {end_time - start_time:.4f}초")
@@ -161,4 +194,4 @@ async def allergy_node(state: RecommendationState) -> RecommendationState:
             "is_error": True,
             "filtered_restaurants": [], 
             "status_message": f"알러지 필터링 중 오류 발생: {str(e)}"
-        }
\ No newline at end of file
+        }
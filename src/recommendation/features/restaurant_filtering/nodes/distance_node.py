@@ -1,4 +1,8 @@
 from src.shared.db.db_manager import MongoManager
+from src.recommendation.features.restaurant_filtering.spatial_index import restaurant_index
+from src.recommendation.features.restaurant_filtering.geo_cache import geo_tile_cache
+from src.recommendation.features.restaurant_filtering.price_features import is_budget_feasible
+from src.core.config import settings
 from src.recommendation.workflows.states.recommendation_state import RecommendationState
 from time import time
 
@@ -10,8 +14,37 @@ async def distance_node(state: RecommendationState) -> RecommendationState:
     _Y = float(state["dining_data"].y)
     MAX_DISTANCE = 1000 # 1km
 
+    # 1인 예산 (가장 저렴한 메인 메뉴도 주문할 수 없는 식당은 후보에서 제외)
+    total_budget = getattr(state["dining_data"], "budget", 0) or 0
+    member_count = len(state["user_ids"])
+    max_meal_price = None
+    if settings.BUDGET_PREFILTER_ENABLED and total_budget > 0 and member_count > 0:
+        max_meal_price = total_budget / member_count
+
     # 1. 거리 가까운 식당 가져오기
-    restaurants = await mongo.find_by_location(_X, _Y, MAX_DISTANCE)
+    if restaurant_index.is_ready:
+        # 인메모리 공간 인덱스가 적재된 경우 로컬에서 반경 검색
+        restaurants = restaurant_index.query_radius(_X, _Y, MAX_DISTANCE)
+    else:
+        # $geoNear 집계로 거리(m)와 거리 점수(1.0 ~ 0.0)를 DB에서 계산하고 가까운 순으로 정렬
+        # 추천 그래프에서 사용하는 필드만 조회 (candidate 프로필)
+        async def fetch(x: float, y: float, radius: int, max_meal_price: float = None):
+            return await mongo.find_by_location(
+                x, y, radius, with_distance=True, projection="candidate",
+                max_meal_price=max_meal_price,
+            )
+
+        if settings.GEO_CACHE_ENABLED:
+            # 같은 geohash 셀 + 1인 예산 구간의 요청은 캐시된 후보군을 재사용하고 거리 점수만 재계산
+            # (예산 구간 상한을 DB 쿼리 조건으로 사용, 정확한 예산 검사는 아래에서 수행)
+            restaurants = await geo_tile_cache.get_or_fetch(_X, _Y, MAX_DISTANCE, fetch, max_meal_price)
+        else:
+            # 예산 조건을 DB 쿼리에 포함하여 불가능한 후보는 전송하지 않음
+            restaurants = await fetch(_X, _Y, MAX_DISTANCE, max_meal_price)
+
+    # 인메모리 인덱스 / 캐시(예산 구간 상한) 결과도 실제 1인 예산 기준으로 사전 필터
+    if max_meal_price is not None:
+        restaurants = [r for r in restaurants if is_budget_feasible(r, max_meal_price)]
     
     if not restaurants or len(restaurants) == 0:
         return {
@@ -21,28 +54,6 @@ async def distance_node(state: RecommendationState) -> RecommendationState:
             "error_message": "No restaurants found"
         }
 
-    # 2. 거리 점수 계산 (1.0 ~ 0.0)
-    import math
-    def calculate_haversine(lon1, lat1, lon2, lat2):
-        R = 6371000 # 지구 반지름 (m)
-        phi1, phi2 = math.radians(lat1), math.radians(lat2)
-        dphi = math.radians(lat2 - lat1)
-        dlambda = math.radians(lon2 - lon1)
-        a = math.sin(dphi / 2)**2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2)**2
-        return 2 * R * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-
-    for res in restaurants:
-        coords = res.get("location", {}).get("coordinates", [0, 0])
-        dist = calculate_haversine(_X, _Y, coords[0], coords[1])
-        
-        # 가까울수록 1.0, 1km 지점이면 0.0
-        score = max(0.0, 1.0 - (dist / MAX_DISTANCE))
-        res["distance_score"] = round(score, 4)
-        res["distance"] = int(dist) # 실제 거리(m)도 저장
-
-    # 3. 점수 기반 정렬 (내림차순: 점수 높은/가까운 식당 우선)
-    restaurants.sort(key=lambda x: x["distance_score"], reverse=True)
-
     end_time = time()
     print(f"거리 필터링 완료: {len(restaurants)}개 검색됨 (가까운 순 정렬)")
     print(f"거리 필터링 소요 시간: {end_time - start_time:.4f}초")
@@ -0,0 +1,84 @@
+from langchain_core.runnables import RunnableConfig
+from langfuse.langchain import CallbackHandler
+from src.recommendation.features.restaurant_filtering.budget_scorer import score_budget
+from src.recommendation.features.restaurant_filtering.nodes.allergy_node import (
+    filter_allergy_safe,
+    load_group_allergies,
+)
+from src.recommendation.workflows.states.recommendation_state import RecommendationState
+from time import time
+
+# allergy_node와 같은 검토 대상 개수 (가까운 순 상위 30개)
+TARGET_COUNT = 30
+
+
+def restaurant_key(restaurant: dict) -> str:
+    return str(restaurant.get("id") or restaurant.get("_id"))
+
+
+async def allergy_verdict_node(state: RecommendationState, config: RunnableConfig) -> dict:
+    """
+    [fan-out] 알러지 안전 식당 판정
+    예산 점수 계산과 동시에 실행되므로 filtered_restaurants는 건드리지 않고 안전한 식당 키만 기록합니다.
+    """
+    start_time = time()
+    langfuse_handler = CallbackHandler()
+    try:
+        _group_allergies = await load_group_allergies(state["user_ids"], config)
+        safe = await filter_allergy_safe(
+            state["filtered_restaurants"][:TARGET_COUNT], _group_allergies, [langfuse_handler]
+        )
+        print(f"알러지 필터링 소요 시간: {time() - start_time:.4f}초")
+        return {
+            "allergy_safe_ids": [restaurant_key(r) for r in safe],
+            "status_message": f"알러지 필터링 완료 : {len(safe)}개"
+        }
+    except Exception as e:
+        print(f"알러지 필터링 중 오류 발생: {str(e)}")
+        return {
+            "is_error": True,
+            "allergy_safe_ids": [],
+            "status_message": f"알러지 필터링 중 오류 발생: {str(e)}"
+        }
+
+
+async def budget_score_node(state: RecommendationState) -> dict:
+    """
+    [fan-out] 예산 점수 계산 (알러지 LLM 판정을 기다리지 않고 같은 후보로 계산)
+    """
+    start_time = time()
+    total_budget = getattr(state["dining_data"], "budget", 0)
+    member_count = len(state["user_ids"])
+
+    if total_budget <= 0 or member_count <= 0:
+        return {"status_message": "예산 정보 부족으로 필터링을 스킵합니다."}
+
+    # 알러지 판정과 같은 문서를 동시에 읽으므로 사본에 점수 필드를 기록
+    candidates = [dict(r) for r in state["filtered_restaurants"][:TARGET_COUNT]]
+    scored = score_budget(candidates, total_budget, member_count)
+    print(f"예산 및 통합 점수 필터링 소요 시간: {time() - start_time:.4f}초")
+    return {
+        "budget_restaurants": scored,
+        "status_message": f"예산 필터링 완료: {len(scored)}개 식당 생존"
+    }
+
+
+def filter_join_node(state: RecommendationState) -> dict:
+    """
+    [fan-in] 알러지 안전 식당과 예산 통과 식당의 교집합 (예산 정렬 순서 유지)
+    """
+    if state.get("is_error"):
+        return {"filtered_restaurants": []}
+
+    safe_ids = set(state.get("allergy_safe_ids") or [])
+    budget_restaurants = state.get("budget_restaurants")
+    if budget_restaurants is None:
+        # 예산 정보가 없으면 알러지 통과 식당만 (가까운 순)
+        budget_restaurants = state["filtered_restaurants"][:TARGET_COUNT]
+
+    final_restaurants = [r for r in budget_restaurants if restaurant_key(r) in safe_ids]
+    print(f"병렬 필터링 완료: {len(final_restaurants)}개 식당 생존")
+    return {
+        "filtered_restaurants": final_restaurants,
+        "status_message": f"필터링 완료: {len(final_restaurants)}개 식당 정렬됨"
+    }
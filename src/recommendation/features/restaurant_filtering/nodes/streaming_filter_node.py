@@ -0,0 +1,107 @@
+from contextlib import aclosing
+from typing import AsyncIterator, List
+from langchain_core.runnables import RunnableConfig
+from langfuse.langchain import CallbackHandler
+from src.core.config import settings
+from src.shared.db.db_manager import MongoManager
+from src.recommendation.features.restaurant_filtering.spatial_index import restaurant_index
+from src.recommendation.features.restaurant_filtering.price_features import is_budget_feasible
+from src.recommendation.features.restaurant_filtering.budget_scorer import score_budget
+from src.recommendation.features.restaurant_filtering.nodes.allergy_node import (
+    filter_allergy_safe,
+    load_group_allergies,
+)
+from src.recommendation.workflows.states.recommendation_state import RecommendationState
+from time import time
+
+
+async def __candidate_batches(
+    x: float, y: float, max_distance: int, batch_size: int, max_meal_price: float = None
+) -> AsyncIterator[List[dict]]:
+    """거리순 후보 식당을 batch_size개씩 반환 (공간 인덱스가 준비됐으면 로컬, 아니면 Mongo 커서)"""
+    if restaurant_index.is_ready:
+        restaurants = restaurant_index.query_radius(x, y, max_distance)
+        for i in range(0, len(restaurants), batch_size):
+            yield restaurants[i:i + batch_size]
+        return
+
+    mongo = MongoManager()
+    mongo.set_collection("restaurants")
+    async with aclosing(
+        mongo.stream_by_location(
+            x, y, max_distance, batch_size,
+            projection="candidate", max_meal_price=max_meal_price,
+        )
+    ) as batches:
+        async for batch in batches:
+            yield batch
+
+
+async def streaming_filter_node(state: RecommendationState, config: RunnableConfig) -> RecommendationState:
+    """
+    스트리밍 필터링 (distance -> allergy -> budget 을 배치 단위로 수행)
+
+    가까운 순으로 후보를 배치 단위로 가져와 알러지/예산 검사를 통과한 식당이
+    현재 페이즈 + 재추천 버퍼 개수만큼 모이면 조회를 멈춥니다.
+    (후보 전체를 가져오는 geohash 셀 캐시는 사용하지 않음)
+    """
+    start_time = time()
+    langfuse_handler = CallbackHandler()
+    _X = float(state["dining_data"].x)
+    _Y = float(state["dining_data"].y)
+    MAX_DISTANCE = 1000 # 1km
+    target_count = settings.FILTERING_PHASE_CANDIDATES + settings.FILTERING_REFRESH_BUFFER
+
+    total_budget = getattr(state["dining_data"], "budget", 0) or 0
+    member_count = len(state["user_ids"])
+    has_budget = total_budget > 0 and member_count > 0
+    max_meal_price = None
+    if settings.BUDGET_PREFILTER_ENABLED and has_budget:
+        max_meal_price = total_budget / member_count
+
+    try:
+        _group_allergies = await load_group_allergies(state["user_ids"], config)
+
+        survivors = []
+        scanned = 0
+        async with aclosing(
+            __candidate_batches(_X, _Y, MAX_DISTANCE, settings.FILTERING_STREAM_BATCH_SIZE, max_meal_price)
+        ) as batches:
+            async for batch in batches:
+                scanned += len(batch)
+                if max_meal_price is not None:
+                    batch = [r for r in batch if is_budget_feasible(r, max_meal_price)]
+                safe = await filter_allergy_safe(batch, _group_allergies, [langfuse_handler])
+                if has_budget:
+                    safe = score_budget(safe, total_budget, member_count)
+                survivors.extend(safe)
+                # 필요한 개수만큼 모이면 나머지 후보는 가져오지 않음
+                if len(survivors) >= target_count:
+                    break
+
+        if scanned == 0:
+            return {
+                "filtered_restaurants": [],
+                "status_message": "필터링된 식당이 없습니다",
+                "is_error": True,
+                "error_message": "No restaurants found"
+            }
+
+        # 최종 정렬: 통합 점수(거리+예산) 높은 순 (예산 정보가 없으면 가까운 순 유지)
+        if has_budget:
+            survivors.sort(key=lambda x: x.get("total_score", 0), reverse=True)
+
+        end_time = time()
+        print(f"스트리밍 필터링 완료: {scanned}개 검토, {len(survivors)}개 식당 생존")
+        print(f"스트리밍 필터링 소요 시간: {end_time - start_time:.4f}초")
+        return {
+            "filtered_restaurants": survivors,
+            "status_message": f"필터링 완료: {scanned}개 검토, {len(survivors)}개 식당 정렬됨"
+        }
+    except Exception as e:
+        print(f"스트리밍 필터링 중 오류 발생: {str(e)}")
+        return {
+            "is_error": True,
+            "filtered_restaurants": [],
+            "status_message": f"스트리밍 필터링 중 오류 발생: {str(e)}"
+        }
@@ -0,0 +1,147 @@
+"""
+restaurants 컬렉션 메뉴 가격 특성 사전 계산 (오프라인 배치)
+
+budget_node가 요청마다 메뉴를 메인/음료/사이드로 분류하지 않도록
+식당 문서의 price_features 필드에 아래 값을 저장합니다.
+- meal_title / meal_price: 대표 메인 메뉴 (메인 메뉴 중 첫 번째)
+- min_meal_price: 가장 저렴한 메인 메뉴 가격 (예산 사전 필터용)
+- drink_title / drink_price: 가장 저렴한 음료
+- side_titles / side_prices: 사이드 메뉴 (가격 오름차순)
+
+실행: python -m src.recommendation.features.restaurant_filtering.price_features [--all]
+"""
+
+import argparse
+import asyncio
+from datetime import datetime
+from time import time
+from typing import Any, Dict, List, Optional
+from pymongo import UpdateOne
+from src.shared.database import get_db, connect_to_mongo, close_mongo_connection, ensure_indexes
+
+PRICE_FEATURES_VERSION = 1
+
+# 8,000원 이상은 메인 식사로 간주
+MAIN_MENU_MIN_PRICE = 8000
+# 주류 및 음료 키워드
+DRINK_KEYWORDS = ["소주", "맥주", "음료", "콜라", "사이다", "주류", "와인", "에이드", "커피", "티", "주스", "환타", "동동주", "막걸리", "하이볼"]
+
+
+def classify_menu(menu: Dict[str, Any]) -> Optional[str]:
+    """메뉴 분류: "meal" / "drink" / "side" (가격 정보가 없으면 None)"""
+    title = menu.get("title", "")
+    price = menu.get("price") or 0
+    if not title or price <= 0:
+        return None
+    if any(k in title for k in DRINK_KEYWORDS):
+        return "drink"
+    if price >= MAIN_MENU_MIN_PRICE:
+        return "meal"
+    return "side"
+
+
+def is_main_menu(menu: Dict[str, Any]) -> bool:
+    return classify_menu(menu) == "meal"
+
+
+def compute_price_features(menus: Optional[List[Dict[str, Any]]]) -> Dict[str, Any]:
+    meals, drinks, sides = [], [], []
+    for menu in menus or []:
+        kind = classify_menu(menu)
+        if kind == "meal":
+            meals.append(menu)
+        elif kind == "drink":
+            drinks.append(menu)
+        elif kind == "side":
+            sides.append(menu)
+
+    features: Dict[str, Any] = {
+        "meal_title": None,
+        "meal_price": None,
+        "min_meal_price": None,
+        "drink_title": None,
+        "drink_price": None,
+        "side_titles": [],
+        "side_prices": [],
+    }
+    if meals:
+        features["meal_title"] = meals[0]["title"]
+        features["meal_price"] = meals[0]["price"]
+        features["min_meal_price"] = min(m["price"] for m in meals)
+    if drinks:
+        best_drink = min(drinks, key=lambda x: x["price"])
+        features["drink_title"] = best_drink["title"]
+        features["drink_price"] = best_drink["price"]
+    if sides:
+        sides = sorted(sides, key=lambda x: x["price"])
+        features["side_titles"] = [s["title"] for s in sides]
+        features["side_prices"] = [s["price"] for s in sides]
+    return features
+
+
+def get_price_features(restaurant: Dict[str, Any]) -> Dict[str, Any]:
+    """저장된 가격 특성 반환 (아직 계산되지 않은 식당은 메뉴에서 바로 계산)"""
+    features = restaurant.get("price_features")
+    if features is None:
+        features = compute_price_features(restaurant.get("menus"))
+    return features
+
+
+def is_budget_feasible(restaurant: Dict[str, Any], max_meal_price: float) -> bool:
+    """
+    가장 저렴한 메인 메뉴를 1인 예산 안에서 주문할 수 있는지 여부
+    (find_by_location의 max_meal_price 조건과 같은 기준, 메인 메뉴가 없으면 통과)
+    """
+    min_meal_price = get_price_features(restaurant).get("min_meal_price")
+    return min_meal_price is None or min_meal_price <= max_meal_price
+
+
+async def tag_price_features(recompute_all: bool = False, batch_size: int = 500) -> int:
+    """
+    restaurants 컬렉션 가격 특성 계산 (버전이 다르거나 없는 문서만, recompute_all이면 전체)
+    Returns:
+        갱신한 문서 수
+    """
+    start_time = time()
+    collection = get_db()["restaurants"]
+    query = {} if recompute_all else {"price_features.version": {"$ne": PRICE_FEATURES_VERSION}}
+    cursor = collection.find(query, {"menus.title": 1, "menus.price": 1})
+
+    updated = 0
+    operations: List[UpdateOne] = []
+    async for doc in cursor:
+        features = compute_price_features(doc.get("menus"))
+        features["version"] = PRICE_FEATURES_VERSION
+        now = datetime.now()
+        features["computed_at"] = now
+        # 공간 인덱스(spatial_index)가 updated_at 기준으로 변경분을 폴링
+        operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"price_features": features, "updated_at": now}}))
+        if len(operations) >= batch_size:
+            result = await collection.bulk_write(operations, ordered=False)
+            updated += result.modified_count
+            operations = []
+            print(f"가격 특성 계산 진행 중: {updated}개")
+    if operations:
+        result = await collection.bulk_write(operations, ordered=False)
+        updated += result.modified_count
+
+    print(f"가격 특성 계산 완료: {updated}개 ({time() - start_time:.4f}초)")
+    return updated
+
+
+async def _main():
+    parser = argparse.ArgumentParser(description="restaurants 메뉴 가격 특성 계산")
+    parser.add_argument("--all", action="store_true", help="이미 계산된 문서도 다시 계산")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    await connect_to_mongo()
+    try:
+        await ensure_indexes()
+        await tag_price_features(args.all, args.batch_size)
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -0,0 +1,200 @@
+import asyncio
+import math
+from datetime import datetime
+from time import time
+from typing import Any, Dict, List, Optional, Tuple
+from src.core.config import settings
+from src.shared.database import get_db
+from src.shared.db.projections import get_restaurant_projection
+from src.shared.geo.distance import haversine, distance_score, METERS_PER_DEGREE_LAT
+
+Cell = Tuple[int, int]
+
+
+class RestaurantSpatialIndex:
+    """
+    식당 위치 인메모리 격자(grid) 인덱스
+
+    restaurants 컬렉션을 시작 시 한 번 적재하고, updatedAt 기준 주기적 폴링으로
+    변경분만 반영합니다. 삭제된 문서는 주기적인 전체 재적재로 정리됩니다.
+    distance_node는 인덱스가 준비된 경우 Mongo 지리 쿼리 대신 반경 검색을 로컬에서 수행합니다.
+    """
+
+    def __init__(self, cell_size_deg: float = 0.01, projection: str = "candidate"):
+        self.cell_size_deg = cell_size_deg  # 0.01도 ≒ 위도 방향 1.1km
+        self.projection = projection
+        self._docs: Dict[str, Dict[str, Any]] = {}
+        self._doc_cells: Dict[str, Cell] = {}
+        self._cells: Dict[Cell, Dict[str, Tuple[float, float]]] = {}
+        self.last_updated_at: Optional[datetime] = None
+        self.last_full_load: float = 0.0
+        self.is_ready = False
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def _cell(self, lon: float, lat: float) -> Cell:
+        return (math.floor(lon / self.cell_size_deg), math.floor(lat / self.cell_size_deg))
+
+    def upsert(self, doc: Dict[str, Any]):
+        """문서 추가/갱신 (좌표가 없는 문서는 무시)"""
+        coords = (doc.get("location") or {}).get("coordinates")
+        if not coords or len(coords) < 2:
+            return
+        key = str(doc.get("_id") or doc.get("id"))
+        self.remove(key)
+
+        lon, lat = float(coords[0]), float(coords[1])
+        cell = self._cell(lon, lat)
+        self._docs[key] = doc
+        self._doc_cells[key] = cell
+        self._cells.setdefault(cell, {})[key] = (lon, lat)
+
+        updated_at = doc.get("updated_at") or doc.get("updatedAt")
+        if isinstance(updated_at, datetime) and (
+            self.last_updated_at is None or updated_at > self.last_updated_at
+        ):
+            self.last_updated_at = updated_at
+
+    def remove(self, key: str):
+        cell = self._doc_cells.pop(key, None)
+        self._docs.pop(key, None)
+        if cell is not None:
+            bucket = self._cells.get(cell)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del self._cells[cell]
+
+    def query_radius(
+        self, longitude: float, latitude: float, max_distance: int, limit: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        반경 내 식당을 가까운 순으로 반환합니다.
+        find_by_location(with_distance=True)와 같은 distance / distance_score 필드를 채운 사본을 반환합니다.
+        """
+        dlat = max_distance / METERS_PER_DEGREE_LAT
+        dlon = max_distance / (METERS_PER_DEGREE_LAT * max(math.cos(math.radians(latitude)), 1e-6))
+        min_cell = self._cell(longitude - dlon, latitude - dlat)
+        max_cell = self._cell(longitude + dlon, latitude + dlat)
+
+        hits: List[Tuple[float, str]] = []
+        for cx in range(min_cell[0], max_cell[0] + 1):
+            for cy in range(min_cell[1], max_cell[1] + 1):
+                bucket = self._cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for key, (lon, lat) in bucket.items():
+                    dist = haversine(longitude, latitude, lon, lat)
+                    if dist <= max_distance:
+                        hits.append((dist, key))
+
+        hits.sort()
+        if limit:
+            hits = hits[:limit]
+
+        results = []
+        for dist, key in hits:
+            # 이후 노드에서 점수 필드를 덧붙이므로 사본을 반환
+            doc = dict(self._docs[key])
+            doc["distance"] = int(dist)
+            doc["distance_score"] = distance_score(dist, max_distance)
+            results.append(doc)
+        return results
+
+    async def load(self):
+        """restaurants 컬렉션 전체 적재"""
+        start_time = time()
+        collection = get_db()["restaurants"]
+        cursor = collection.find({}, self._projection())
+        docs = await cursor.to_list(length=None)
+
+        self._docs.clear()
+        self._doc_cells.clear()
+        self._cells.clear()
+        self.last_updated_at = None
+        for doc in docs:
+            self.upsert(doc)
+
+        self.last_full_load = time()
+        self.is_ready = True
+        print(f"식당 공간 인덱스 적재 완료: {len(self)}개 ({time() - start_time:.4f}초)")
+
+    async def refresh(self) -> int:
+        """마지막 반영 시점 이후 변경된 문서만 반영 (변경 건수 반환)"""
+        if self.last_updated_at is None:
+            # 수정 시간 정보가 없으면 전체 재적재
+            await self.load()
+            return len(self)
+
+        collection = get_db()["restaurants"]
+        query = {
+            "$or": [
+                {"updated_at": {"$gt": self.last_updated_at}},
+                {"updatedAt": {"$gt": self.last_updated_at}},
+            ]
+        }
+        cursor = collection.find(query, self._projection())
+        docs = await cursor.to_list(length=None)
+        for doc in docs:
+            self.upsert(doc)
+        return len(docs)
+
+    def _projection(self) -> Optional[Dict[str, int]]:
+        fields = get_restaurant_projection(self.projection)
+        if fields is not None:
+            # 증분 갱신 기준 시각을 위해 수정 시간 필드도 함께 적재
+            fields.update({"updated_at": 1, "updatedAt": 1})
+        return fields
+
+    def start_refresh(self, interval_sec: int, full_reload_sec: int):
+        """주기적 증분 갱신 태스크 시작"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(
+                self._refresh_loop(interval_sec, full_reload_sec)
+            )
+
+    async def stop_refresh(self):
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    async def _refresh_loop(self, interval_sec: int, full_reload_sec: int):
+        while True:
+            await asyncio.sleep(interval_sec)
+            try:
+                if time() - self.last_full_load >= full_reload_sec:
+                    await self.load()
+                else:
+                    changed = await self.refresh()
+                    if changed:
+                        print(f"식당 공간 인덱스 갱신: {changed}개 반영")
+            except Exception as e:
+                # 갱신 실패 시 기존 인덱스를 그대로 사용
+                print(f"식당 공간 인덱스 갱신 실패: {e}")
+
+
+restaurant_index = RestaurantSpatialIndex(cell_size_deg=settings.RESTAURANT_INDEX_CELL_DEG)
+
+
+async def init_restaurant_index():
+    """앱 시작 시 인덱스 적재 및 갱신 태스크 시작 (설정으로 활성화한 경우만)"""
+    if not settings.RESTAURANT_INDEX_ENABLED:
+        return
+    try:
+        await restaurant_index.load()
+    except Exception as e:
+        # 적재 실패 시 distance_node는 Mongo 지리 쿼리를 그대로 사용
+        print(f"식당 공간 인덱스 적재 실패: {e}")
+    restaurant_index.start_refresh(
+        settings.RESTAURANT_INDEX_REFRESH_SEC, settings.RESTAURANT_INDEX_FULL_RELOAD_SEC
+    )
+
+
+async def close_restaurant_index():
+    await restaurant_index.stop_refresh()
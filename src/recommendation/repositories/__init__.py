@@ -1 +1,2 @@
 from .persona_repository import PersonaRepository
+from .user_loader import UserLoader, get_user_loader
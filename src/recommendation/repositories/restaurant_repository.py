@@ -1,6 +1,7 @@
 from typing import Optional, List
 from src.shared.database import get_db
 from src.recommendation.entities.restaurant import RestaurantDocument
+from src.shared.db.projections import get_restaurant_projection
 
 
 class RestaurantRepository:
@@ -12,35 +13,45 @@ class RestaurantRepository:
     def _get_collection(self):
         return get_db()[self.collection_name]
 
-    async def find_by_id(self, restaurant_id: str) -> Optional[RestaurantDocument]:
+    async def find_by_id(
+        self, restaurant_id: str, projection: Optional[str] = None
+    ) -> Optional[RestaurantDocument]:
         """
         restaurant_id로 식당 정보를 조회합니다.
 
         Args:
             restaurant_id: 식당 ID
+            projection: 필드 프로젝션 프로필 이름 (None이면 전체 문서)
 
         Returns:
             RestaurantDocument 또는 None
         """
         collection = self._get_collection()
         # ID가 ObjectId인지 str인지 확인 필요하지만, 여기서는 저장된 형식(str)을 따른다고 가정
-        data = await collection.find_one({"_id": restaurant_id})
+        data = await collection.find_one(
+            {"_id": restaurant_id}, get_restaurant_projection(projection)
+        )
         if data:
             return RestaurantDocument(**data)
         return None
 
-    async def find_by_ids(self, restaurant_ids: List[str]) -> List[RestaurantDocument]:
+    async def find_by_ids(
+        self, restaurant_ids: List[str], projection: Optional[str] = None
+    ) -> List[RestaurantDocument]:
         """
         여러 restaurant_id로 식당 정보를 일괄 조회합니다.
 
         Args:
             restaurant_ids: 식당 ID 리스트
+            projection: 필드 프로젝션 프로필 이름 (None이면 전체 문서)
 
         Returns:
             RestaurantDocument 리스트
         """
         collection = self._get_collection()
-        cursor = collection.find({"_id": {"$in": restaurant_ids}})
+        cursor = collection.find(
+            {"_id": {"$in": restaurant_ids}}, get_restaurant_projection(projection)
+        )
 
         restaurants = []
         async for data in cursor:
@@ -0,0 +1,102 @@
+import asyncio
+from functools import partial
+from typing import Any, Dict, List, Optional, Set
+from langchain_core.runnables import RunnableConfig
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from src.shared.database import get_db
+
+USER_LOADER_KEY = "user_loader"
+
+
+class UserLoader:
+    """
+    요청 단위 users 컬렉션 배치 로더 (DataLoader 패턴)
+
+    같은 이벤트 루프 틱에서 요청된 user_id를 모아 한 번의 $in 쿼리로 조회하고,
+    결과를 요청이 끝날 때까지 캐싱합니다. 알러지 필터링과 페르소나 조회가
+    같은 로더를 공유하므로 사용자 문서는 요청당 한 번만 조회됩니다.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase = None):
+        self.db = db if db is not None else get_db()
+        self.collection = self.db["users"]
+        self._futures: Dict[int, asyncio.Future] = {}
+        self._queue: List[int] = []
+        self._dispatch_scheduled = False
+        # 실행 중인 배치 조회 태스크 (참조를 유지해야 실행 중 GC되지 않음)
+        self._dispatch_tasks: Set[asyncio.Task] = set()
+        self.query_count = 0
+
+    async def load(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """사용자 문서 1건 조회 (없으면 None)"""
+        future = self._futures.get(user_id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._futures[user_id] = future
+            self._queue.append(user_id)
+            if not self._dispatch_scheduled:
+                # 현재 틱에서 요청된 id를 모두 모은 뒤 한 번에 조회
+                self._dispatch_scheduled = True
+                loop.call_soon(self._start_dispatch)
+        return await future
+
+    async def load_many(self, user_ids: List[int]) -> List[Optional[Dict[str, Any]]]:
+        """여러 사용자 문서 조회 (입력 순서 유지, 없는 사용자는 None)"""
+        return list(await asyncio.gather(*(self.load(uid) for uid in user_ids)))
+
+    def prime(self, user_id: int, doc: Optional[Dict[str, Any]]):
+        """이미 조회한 문서를 캐시에 채워넣기"""
+        if user_id in self._futures:
+            return
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(doc)
+        self._futures[user_id] = future
+
+    def _start_dispatch(self):
+        """현재 틱까지 모인 id를 배치 조회 태스크로 실행"""
+        user_ids, self._queue = self._queue, []
+        self._dispatch_scheduled = False
+        if not user_ids:
+            return
+        task = asyncio.ensure_future(self._dispatch(user_ids))
+        self._dispatch_tasks.add(task)
+        task.add_done_callback(partial(self._dispatch_done, user_ids))
+
+    def _dispatch_done(self, user_ids: List[int], task: asyncio.Task):
+        """배치 조회가 실패/취소되면 대기 중인 요청에 그대로 전달"""
+        self._dispatch_tasks.discard(task)
+        cancelled = task.cancelled()
+        error = None if cancelled else task.exception()
+        if not cancelled and error is None:
+            return
+        for uid in user_ids:
+            future = self._futures.get(uid)
+            if future is None or future.done():
+                continue
+            # 실패한 id는 캐시에서 제거하여 재시도 가능하게 함
+            del self._futures[uid]
+            if cancelled:
+                future.cancel()
+            else:
+                future.set_exception(error)
+
+    async def _dispatch(self, user_ids: List[int]):
+        self.query_count += 1
+        cursor = self.collection.find({"id": {"$in": user_ids}})
+        docs = await cursor.to_list(length=None)
+
+        docs_by_id = {doc.get("id"): doc for doc in docs}
+        for uid in user_ids:
+            future = self._futures[uid]
+            if not future.done():
+                future.set_result(docs_by_id.get(uid))
+
+def get_user_loader(config: Optional[RunnableConfig]) -> UserLoader:
+    """
+    그래프 실행 config에서 요청 단위 UserLoader를 꺼냅니다.
+    (recommendation_workflow가 configurable에 넣어주며, 없으면 새 로더 생성)
+    """
+    configurable = (config or {}).get("configurable") or {}
+    loader = configurable.get(USER_LOADER_KEY)
+    return loader if loader is not None else UserLoader()
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Response
 from fastapi.responses import JSONResponse
 from src.recommendation.schemas.update_persona_db_request import UpdatePersonaDBRequest
 from src.recommendation.schemas.update_persona_db_response import (
@@ -23,6 +24,13 @@ from src.shared.database import (
 )
 from src.recommendation.workflows.workflow import recommendation_workflow
 from src.shared.db.db_manager import MongoManager
+from src.shared.request_coalescer import (
+    make_idempotency_key,
+    make_request_key,
+    request_coalescer,
+)
+from src.core.config import settings
+from src.shared.metrics.timing_ledger import server_timing_header
 import asyncio
 from src.shared.llm.langfuse_handler import get_langfuse_callback, flush_langfuse, propagate_attributes
 
@@ -82,51 +90,27 @@ async def update_persona_db(request: UpdatePersonaDBRequest):
         flush_langfuse()
 
 
-@router.post(
-    "/recommendations",
-    summary="식당 추천시 호출하는 API",
-    response_model=RecommendationsResponse,
-)
-async def recommendations(request: RecommendationsRequest):
+async def _run_recommendation(
+    request: RecommendationsRequest, phase: str, default_count: int
+) -> RecommendationsResponse:
     """
-    식당 추천시 호출하는 API로 내부 그래프 처리 후 최종 5개의 식당 정보를 반환합니다.
+    추천 워크플로 실행 + 세션 저장 + 상위 5개 식당 응답 생성
+    (/recommendations, /analyze_refresh 공통, 중복 요청은 request_coalescer가 하나로 합침)
     """
-    if request.dining_data is None:
-        return JSONResponse(
-            status_code=400,
-            content={"success": False, "message": "diningData is required"},
-        )
-
-    if not request.user_ids:
-        return JSONResponse(
-            status_code=400,
-            content={"success": False, "message": "user_ids is empty"},
-        )
-
+    prefix = "recommendation" if phase == "recommendations" else "analyze"
     try:
-        # Langfuse 핸들러 생성 (recommendation: 추천 식별자)
+        # Langfuse 핸들러 생성 (recommendation: 추천 식별자 / analyze: 재분석 식별자)
         handler = get_langfuse_callback(
-            prefix="recommendation",
+            prefix=prefix,
             source_id=request.dining_data.dining_id
         )
-        
+
         # 세션 ID 및 유저 ID 전파 (dining_id를 user_id로 활용)
         with propagate_attributes(
-            session_id="recommendation", 
+            session_id=prefix,
             user_id=str(request.dining_data.dining_id)
         ):
-            result = await asyncio.wait_for(
-                recommendation_workflow(request, callbacks=[handler]), 
-                timeout=180.0
-            )
-
-    except asyncio.TimeoutError:
-        raise HTTPException(
-            status_code=504,
-            detail={
-                "error": "추천 프로세스가 너무 오래 걸려 중단되었습니다. 잠시 후 다시 시도해주세요."
-            },
-        )
+            result = await recommendation_workflow(request, callbacks=[handler])
     finally:
         flush_langfuse()
 
@@ -166,43 +150,46 @@ async def recommendations(request: RecommendationsRequest):
             }
         )
 
-    return RecommendationsResponse(
-        recommendation_count=updated_phase or 1,
+    response = RecommendationsResponse(
+        recommendation_count=updated_phase or default_count,
         recommended_items=recommended_items,
     )
-
-
-@router.post(
-    "/analyze_refresh",
-    summary="사용자가 재추천을 원할 경우 호출하는 API",
-    response_model=RecommendationsResponse,
-)
-async def analyze_refresh(request: RecommendationsRequest):
+    response._timing_ledger = result.get("timing_ledger")
+    return response
+
+
+def _attach_debug_timing(
+    response: Response, result: RecommendationsResponse, debug_timing: Optional[str]
+):
+    """X-Debug-Timing 요청 헤더가 있으면 노드/LLM/DB 소요 시간을 Server-Timing 헤더로 반환"""
+    if not (settings.TIMING_DEBUG_HEADER_ENABLED and debug_timing):
+        return
+    header = server_timing_header(result._timing_ledger)
+    if header:
+        response.headers["Server-Timing"] = header
+
+
+async def _coalesced_recommendation(
+    request: RecommendationsRequest,
+    phase: str,
+    default_count: int,
+    idempotency_key: Optional[str],
+) -> RecommendationsResponse:
     """
-    식당 재추천시 호출하는 API로 내부 그래프 처리 후 최종 5개의 식당 정보를 반환합니다.
+    같은 dining_id/API/본문의 동시 요청은 워크플로 하나의 결과를 함께 기다림
+    (백엔드 재시도가 진행 중인 워크플로에 합류하도록, 타임아웃 시에도 워크플로는 계속 진행)
     """
-    if request.dining_data.dining_id is None:
-        return JSONResponse(
-            status_code=400,
-            content={"message": "diningData.diningId is required"},
-        )
-
+    job = lambda: _run_recommendation(request, phase, default_count)
     try:
-        # Langfuse 핸들러 생성 (analyze: 재분석 식별자)
-        handler = get_langfuse_callback(
-            prefix="analyze",
-            source_id=request.dining_data.dining_id
+        if not settings.REQUEST_COALESCING_ENABLED:
+            return await asyncio.wait_for(job(), timeout=settings.RECOMMENDATION_TIMEOUT_SEC)
+        return await request_coalescer.run(
+            make_request_key(phase, request),
+            job,
+            RecommendationsResponse,
+            timeout=settings.RECOMMENDATION_TIMEOUT_SEC,
+            idempotency_key=make_idempotency_key(phase, request, idempotency_key),
         )
-        
-        # 세션 ID 및 유저 ID 전파 (dining_id를 user_id로 활용)
-        with propagate_attributes(
-            session_id="analyze", 
-            user_id=str(request.dining_data.dining_id)
-        ):
-            result = await asyncio.wait_for(
-                recommendation_workflow(request, callbacks=[handler]), 
-                timeout=180.0
-            )
     except asyncio.TimeoutError:
         raise HTTPException(
             status_code=504,
@@ -210,49 +197,66 @@ async def analyze_refresh(request: RecommendationsRequest):
                 "error": "추천 프로세스가 너무 오래 걸려 중단되었습니다. 잠시 후 다시 시도해주세요."
             },
         )
-    finally:
-        flush_langfuse()
 
-    if result.get("is_error") == True:
-        raise HTTPException(
+
+@router.post(
+    "/recommendations",
+    summary="식당 추천시 호출하는 API",
+    response_model=RecommendationsResponse,
+)
+async def recommendations(
+    request: RecommendationsRequest,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    debug_timing: Optional[str] = Header(None, alias="X-Debug-Timing"),
+):
+    """
+    식당 추천시 호출하는 API로 내부 그래프 처리 후 최종 5개의 식당 정보를 반환합니다.
+    Idempotency-Key 헤더를 보내면 같은 키로 완료된 요청의 응답을 그대로 반환합니다.
+    (디버그 설정 시) X-Debug-Timing 헤더를 보내면 Server-Timing 헤더로 단계별 소요 시간을 함께 반환합니다.
+    """
+    if request.dining_data is None:
+        return JSONResponse(
             status_code=400,
-            detail={
-                "error": result.get("error_message"),
-            },
+            content={"success": False, "message": "diningData is required"},
         )
 
-    mongo = MongoManager()
-    updated_phase = await mongo.save_dining_session(result)
-    print(updated_phase)
-
-    # # 상위 5개 식당 매핑
-    recommended_items = []
-    for res in result.get("filtered_restaurants", [])[:5]:
-        budget_rec = res.get("budget_recommendation", {})
-        menu_details = budget_rec.get("menu_details", [])
+    if not request.user_ids:
+        return JSONResponse(
+            status_code=400,
+            content={"success": False, "message": "user_ids is empty"},
+        )
 
-        if menu_details:
-            menu_summary = ", ".join(
-                [f"{m['title']} {m['count']}개" for m in menu_details]
-            )
-        else:
-            menu_summary = "추천 메뉴 구성 중"
+    result = await _coalesced_recommendation(request, "recommendations", 1, idempotency_key)
+    _attach_debug_timing(response, result, debug_timing)
+    return result
 
-        distance_m = res.get("distance", 0)
-        reason = f"{menu_summary} | 거리: {distance_m}m"
 
-        recommended_items.append(
-            {
-                "restaurant_id": str(res.get("id") or res.get("_id")),
-                "score": float(res.get("total_score", 0.0)),
-                "reasoning_description": reason[:500],
-            }
+@router.post(
+    "/analyze_refresh",
+    summary="사용자가 재추천을 원할 경우 호출하는 API",
+    response_model=RecommendationsResponse,
+)
+async def analyze_refresh(
+    request: RecommendationsRequest,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    debug_timing: Optional[str] = Header(None, alias="X-Debug-Timing"),
+):
+    """
+    식당 재추천시 호출하는 API로 내부 그래프 처리 후 최종 5개의 식당 정보를 반환합니다.
+    Idempotency-Key 헤더를 보내면 같은 키로 완료된 요청의 응답을 그대로 반환합니다.
+    (디버그 설정 시) X-Debug-Timing 헤더를 보내면 Server-Timing 헤더로 단계별 소요 시간을 함께 반환합니다.
+    """
+    if request.dining_data.dining_id is None:
+        return JSONResponse(
+            status_code=400,
+            content={"message": "diningData.diningId is required"},
         )
 
-    return RecommendationsResponse(
-        recommendation_count=updated_phase or 0,
-        recommended_items=recommended_items,
-    )
+    result = await _coalesced_recommendation(request, "analyze_refresh", 0, idempotency_key)
+    _attach_debug_timing(response, result, debug_timing)
+    return result
 
 
 @router.post(
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, PrivateAttr
 from pydantic.alias_generators import to_camel
-from typing import List
+from typing import List, Optional
 from src.recommendation.schemas.recommended_item import RecommendedItem
 
 
@@ -16,3 +16,6 @@ class RecommendationsResponse(BaseModel):
     recommended_items: List[RecommendedItem] = Field(
         ..., description="추천 식당 정보 상위 5개"
     )
+
+    # 요청 단위 실행 시간 기록 (응답 본문/멱등 저장에는 포함되지 않음, Server-Timing 디버그 헤더용)
+    _timing_ledger: Optional[dict] = PrivateAttr(default=None)
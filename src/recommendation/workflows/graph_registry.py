@@ -0,0 +1,41 @@
+from typing import Callable, Dict, Optional
+from langgraph.graph.state import CompiledStateGraph
+
+
+class GraphRegistry:
+    """
+    프로세스 전역 컴파일 그래프 저장소
+
+    그래프 빌더를 이름으로 등록해두고, 최초 1회만 컴파일하여 재사용합니다.
+    FastAPI 시작 시 warmup()을 호출하면 요청 처리 전에 모든 그래프가 준비됩니다.
+    """
+
+    def __init__(self):
+        self._builders: Dict[str, Callable[[], CompiledStateGraph]] = {}
+        self._graphs: Dict[str, CompiledStateGraph] = {}
+
+    def register(self, name: str, builder: Callable[[], CompiledStateGraph]):
+        """그래프 빌더 등록 (컴파일은 get() 또는 warmup() 시점에 수행)"""
+        self._builders[name] = builder
+
+    def get(self, name: str) -> CompiledStateGraph:
+        """컴파일된 그래프 반환 (없으면 컴파일 후 캐싱)"""
+        graph: Optional[CompiledStateGraph] = self._graphs.get(name)
+        if graph is None:
+            if name not in self._builders:
+                raise KeyError(f"등록되지 않은 그래프입니다: {name}")
+            graph = self._builders[name]()
+            self._graphs[name] = graph
+        return graph
+
+    def warmup(self):
+        """등록된 모든 그래프를 미리 컴파일"""
+        for name in list(self._builders):
+            self.get(name)
+
+    def clear(self):
+        """컴파일된 그래프 캐시 초기화 (테스트/리로드 용도)"""
+        self._graphs.clear()
+
+
+graph_registry = GraphRegistry()
@@ -6,9 +6,11 @@ from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
 
 from src.recommendation.entities.persona import Persona
-from src.recommendation.repositories.persona_repository import PersonaRepository
+from langchain_core.runnables import RunnableConfig
+from src.recommendation.repositories.user_loader import get_user_loader
 from src.recommendation.workflows.states.recommendation_state import RecommendationState
 from src.shared.llm.llm_client import get_llm
+from src.shared.llm.llm_scheduler import PRIORITY_HIGH, llm_key, llm_scheduler
 
 # Initialize logger
 logger = logging.getLogger(__name__)
@@ -29,7 +31,7 @@ class RecommendationResult(BaseModel):
     )
 
 
-async def iterative_discussion_node(state: RecommendationState) -> dict:
+async def iterative_discussion_node(state: RecommendationState, config: RunnableConfig) -> dict:
     """
     Personas and filtered restaurants are analyzed to provide a ranked recommendation.
     """
@@ -37,14 +39,18 @@ async def iterative_discussion_node(state: RecommendationState) -> dict:
     filtered_restaurants = state["filtered_restaurants"]
 
     # 1. Fetch Personas
-    persona_repo = PersonaRepository()
+    # Prefetched at START by prefetch_users_node; falls back to the request-scoped loader.
+    user_profiles = state.get("user_profiles")
+    if user_profiles is None:
+        user_profiles = [doc for doc in await get_user_loader(config).load_many(user_ids) if doc]
+    profiles_by_id = {doc.get("id"): doc for doc in user_profiles}
     personas: List[Persona] = []
 
     for uid in user_ids:
+        doc = profiles_by_id.get(uid)
         # Assuming user_ids are integers matching Persona IDs
-        p = await persona_repo.find_by_id(uid)
-        if p:
-            personas.append(p)
+        if doc:
+            personas.append(Persona.model_validate(doc))
         else:
             logger.warning(f"Persona not found for user_id: {uid}")
 
@@ -109,13 +115,15 @@ async def iterative_discussion_node(state: RecommendationState) -> dict:
     chain = prompt | llm | parser
 
     try:
-        result = await chain.ainvoke(
-            {
-                "personas": personas_data,
-                "restaurants": restaurants_context,
-                "format_instructions": parser.get_format_instructions(),
-            }
-        )
+        # Final ranking step of the workflow, so schedule it ahead of earlier-stage calls
+        async with llm_scheduler.slot(*llm_key(llm), priority=PRIORITY_HIGH):
+            result = await chain.ainvoke(
+                {
+                    "personas": personas_data,
+                    "restaurants": restaurants_context,
+                    "format_instructions": parser.get_format_instructions(),
+                }
+            )
 
         # Re-order filtered_restaurants based on the LLM result
         ranked_items = result.get("items", [])
@@ -0,0 +1,26 @@
+from time import time
+from langchain_core.runnables import RunnableConfig
+from src.recommendation.repositories.user_loader import get_user_loader
+from src.recommendation.workflows.states.recommendation_state import RecommendationState
+
+
+async def prefetch_users_node(state: RecommendationState, config: RunnableConfig) -> dict:
+    """
+    참여자 사용자/페르소나 문서 미리 조회
+    START에서 필터링 서브 그래프와 동시에 실행되며, 같은 요청 단위 로더를 쓰므로
+    allergy_node는 이 조회 결과를 기다렸다가 공유합니다. (users 조회는 요청당 1회)
+    """
+    start_time = time()
+    try:
+        docs = await get_user_loader(config).load_many(state["user_ids"])
+    except Exception as e:
+        # 실패 시 이후 노드가 로더로 다시 조회
+        print(f"참여자 정보 사전 조회 실패: {e}")
+        return {"status_message": f"참여자 정보 사전 조회 실패: {e}"}
+
+    user_profiles = [doc for doc in docs if doc]
+    print(f"참여자 정보 사전 조회 소요 시간: {time() - start_time:.4f}초")
+    return {
+        "user_profiles": user_profiles,
+        "status_message": f"참여자 정보 조회 완료: {len(user_profiles)}명",
+    }
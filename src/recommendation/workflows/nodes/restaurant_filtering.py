@@ -1,10 +1,18 @@
 from langgraph.graph import StateGraph, START, END
 from datetime import datetime
 from src.recommendation.workflows.states.recommendation_state import RecommendationState
+from src.recommendation.workflows.graph_registry import graph_registry
 # 서브 노드
 from src.recommendation.features.restaurant_filtering.nodes.distance_node import distance_node
 from src.recommendation.features.restaurant_filtering.nodes.allergy_node import allergy_node
 from src.recommendation.features.restaurant_filtering.nodes.budget_node import budget_node
+from src.recommendation.features.restaurant_filtering.nodes.streaming_filter_node import streaming_filter_node
+from src.recommendation.features.restaurant_filtering.nodes.parallel_filter_nodes import (
+    allergy_verdict_node,
+    budget_score_node,
+    filter_join_node,
+)
+from src.core.config import settings
 
 # 에러 처리 노드
 def __error_handler_node(state: RecommendationState) -> str:
@@ -12,18 +20,66 @@ def __error_handler_node(state: RecommendationState) -> str:
         return "error"
     return "next"
 
-sub_builder = StateGraph(RecommendationState)
+# 거리 필터링 후 분기 (에러면 종료, 아니면 알러지/예산 동시 실행)
+def __fan_out(state: RecommendationState) -> list:
+    if state.get("is_error"):
+        return [END]
+    return ["allergy", "budget"]
+
+RESTAURANT_FILTERING_GRAPH = "restaurant_filtering"
+
+
+def build_restaurant_filtering_graph():
+    """식당 필터링 서브 그래프 생성 (graph_registry를 통해 프로세스당 1회 컴파일)"""
+    if settings.FILTERING_MODE == "parallel":
+        return build_parallel_restaurant_filtering_graph()
+
+    sub_builder = StateGraph(RecommendationState)
+
+    if settings.FILTERING_MODE == "stream":
+        # 스트리밍 모드: 거리순 배치마다 알러지/예산 검사, 필요한 개수가 모이면 조기 종료
+        sub_builder.add_node("stream_filter", streaming_filter_node)
+        sub_builder.add_edge(START, "stream_filter")
+        sub_builder.add_edge("stream_filter", END)
+        return sub_builder.compile()
+
+    # 프로덕션 용
+    # 1. 서브 그래프 조립
+    sub_builder.add_node("distance", distance_node)
+    sub_builder.add_node("allergy", allergy_node)
+    sub_builder.add_node("budget", budget_node)
+    # 2. 서브 그래프 연결
+    sub_builder.add_edge(START, "distance")
+    sub_builder.add_conditional_edges("distance", __error_handler_node, {"error": END, "next": "allergy"})
+    sub_builder.add_conditional_edges("allergy", __error_handler_node, {"error": END, "next": "budget"})
+    sub_builder.add_edge("budget", END)
+
+    # 3. 컴파일
+    return sub_builder.compile()
+
+
+def build_parallel_restaurant_filtering_graph():
+    """
+    식당 필터링 서브 그래프 (fan-out/fan-in)
+    distance 이후 알러지 판정과 예산 점수 계산을 동시에 실행하고 join 노드에서 교집합을 구합니다.
+    """
+    sub_builder = StateGraph(RecommendationState)
+
+    # 1. 서브 그래프 조립
+    sub_builder.add_node("distance", distance_node)
+    sub_builder.add_node("allergy", allergy_verdict_node)
+    sub_builder.add_node("budget", budget_score_node)
+    sub_builder.add_node("join", filter_join_node)
+    # 2. 서브 그래프 연결 (distance -> [allergy, budget] -> join)
+    sub_builder.add_edge(START, "distance")
+    sub_builder.add_conditional_edges(
+        "distance", __fan_out, ["allergy", "budget", END]
+    )
+    sub_builder.add_edge(["allergy", "budget"], "join")
+    sub_builder.add_edge("join", END)
 
-# 프로덕션 용
-# 1. 서브 그래프 조립
-sub_builder.add_node("distance", distance_node)
-sub_builder.add_node("allergy", allergy_node)
-sub_builder.add_node("budget", budget_node)
-# 2. 서브 그래프 연결
-sub_builder.add_edge(START, "distance")
-sub_builder.add_conditional_edges("distance", __error_handler_node, {"error": END, "next": "allergy"})
-sub_builder.add_conditional_edges("allergy", __error_handler_node, {"error": END, "next": "budget"})
-sub_builder.add_edge("budget", END)
+    # 3. 컴파일
+    return sub_builder.compile()
 
 # # 디버그 용
 # # 1. 서브 그래프 조립
@@ -35,5 +91,4 @@ sub_builder.add_edge("budget", END)
 # sub_builder.add_edge("budget", END)
 
 
-# 3. 컴파일
-restaurant_filtering_node = sub_builder.compile()
\ No newline at end of file
+graph_registry.register(RESTAURANT_FILTERING_GRAPH, build_restaurant_filtering_graph)
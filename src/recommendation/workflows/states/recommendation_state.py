@@ -38,6 +38,8 @@ class RecommendationState(TypedDict):
     rejected_restaurants: List[dict]
     current_recommendation: dict
     personas: List[dict]
+    # START에서 미리 조회한 참여자 users 문서 (prefetch_users_node)
+    user_profiles: List[dict]
 
     status_message: Annotated[List[dict], add_status_with_time]
     iteration_count: int
@@ -55,6 +57,13 @@ class RecommendationState(TypedDict):
     is_initial_workflow: bool
     vote_result_list: List[dict]
 
+    # 병렬 필터링 (fan-out 결과, join 노드에서 교집합)
+    allergy_safe_ids: List[str]
+    budget_restaurants: List[dict]
+
     # 에러 처리
     is_error: bool
     error_message: str
+
+    # 요청 단위 노드/LLM/DB 실행 시간 기록 (TimingLedger.to_record, dining_sessions.timingLedger에 저장)
+    timing_ledger: dict
@@ -14,12 +14,17 @@ from src.recommendation.workflows.nodes.utility_node import (
     analyze_refresh_branch,
 )
 from src.recommendation.workflows.nodes.restaurant_filtering import (
-    restaurant_filtering_node,
+    RESTAURANT_FILTERING_GRAPH,
 )
-from src.recommendation.workflows.nodes.analyze_refresh import analyze_refresh_node
+from src.recommendation.workflows.nodes.analyze_refresh import ANALYZE_REFRESH_GRAPH
 from src.recommendation.workflows.nodes.iterative_discussion import (
     iterative_discussion_node,
 )
+from src.recommendation.workflows.nodes.prefetch_users import prefetch_users_node
+from src.recommendation.workflows.graph_registry import graph_registry
+from src.recommendation.repositories.user_loader import UserLoader, USER_LOADER_KEY
+from src.shared.metrics.timing_ledger import TimingLedger, timing_ledger_scope
+from src.core.config import settings
 
 # 내장 라이브러리
 from datetime import datetime
@@ -92,25 +97,25 @@ def __mock_node(state: RecommendationState) -> str:
     }
 
 
-async def recommendation_workflow(request: RecommendationsRequest, callbacks: list = None):
+RECOMMENDATION_GRAPH = "recommendation"
+
+
+def build_recommendation_graph():
     """
-    레스토랑 추천 워크플로우 그래프 생성
+    레스토랑 추천 메인 그래프 생성
 
-    Args:
-        request: RecommendationsRequest
+    서브 그래프(restaurant_filtering, analyze_refresh)는 graph_registry에서 가져오며,
+    store는 요청마다 ainvoke 시점에 바인딩합니다.
 
     Returns:
-        RecommendationsResponse
+        CompiledStateGraph
     """
-    # 1. 헬퍼 함수를 통한 초기 상태 생성
-    initial_state = __initial_state(request)
-
-    # 2. 그래프 생성
+    # 1. 그래프 생성
     workflow = StateGraph(RecommendationState)
 
-    # 3. 노드 선언
-    workflow.add_node("restaurant_filtering", restaurant_filtering_node)
-    workflow.add_node("analyze_refresh", analyze_refresh_node)
+    # 2. 노드 선언
+    workflow.add_node("restaurant_filtering", graph_registry.get(RESTAURANT_FILTERING_GRAPH))
+    workflow.add_node("analyze_refresh", graph_registry.get(ANALYZE_REFRESH_GRAPH))
 
     # 합의 과정
     """
@@ -130,10 +135,11 @@ async def recommendation_workflow(request: RecommendationsRequest, callbacks: li
     )
     """
     workflow.add_node("iterative_discussion", iterative_discussion_node)
+    workflow.add_node("prefetch_users", prefetch_users_node)
     workflow.add_node("mock_node", __mock_node)
     workflow.add_edge("mock_node", END)
 
-    # 4. 엣지(연결) 구조
+    # 3. 엣지(연결) 구조
 
     workflow.add_conditional_edges(
         START,
@@ -144,7 +150,9 @@ async def recommendation_workflow(request: RecommendationsRequest, callbacks: li
             "analyze_refresh": "analyze_refresh",
         },
     )
-    workflow.add_edge("restaurant_filtering", "iterative_discussion")
+    # 참여자 정보는 START에서 필터링과 동시에 조회하고, 둘 다 끝나면 토론 단계로 진행
+    workflow.add_edge(START, "prefetch_users")
+    workflow.add_edge(["restaurant_filtering", "prefetch_users"], "iterative_discussion")
     workflow.add_edge("iterative_discussion", END)
 
     workflow.add_conditional_edges(
@@ -153,8 +161,44 @@ async def recommendation_workflow(request: RecommendationsRequest, callbacks: li
         {"filter": "restaurant_filtering", "error": END, "next": END},
     )
 
-    _store = InMemoryStore()
-    app = workflow.compile(store=_store)
-    result_state = await app.ainvoke(initial_state, config={"callbacks": callbacks} if callbacks else {})
+    return workflow.compile()
+
+
+graph_registry.register(RECOMMENDATION_GRAPH, build_recommendation_graph)
+
+
+def init_recommendation_graphs():
+    """FastAPI 시작 시 메인/서브 그래프를 미리 컴파일"""
+    graph_registry.warmup()
+
+
+async def recommendation_workflow(request: RecommendationsRequest, callbacks: list = None):
+    """
+    레스토랑 추천 워크플로우 실행
+
+    Args:
+        request: RecommendationsRequest
+        callbacks: 요청 단위 콜백 (Langfuse 등)
+
+    Returns:
+        RecommendationsResponse
+    """
+    # 1. 헬퍼 함수를 통한 초기 상태 생성
+    initial_state = __initial_state(request)
+
+    # 2. 컴파일된 그래프 재사용 (store만 요청 단위로 교체, 얕은 복사)
+    app = graph_registry.get(RECOMMENDATION_GRAPH).copy({"store": InMemoryStore()})
+
+    # 3. 요청 단위 설정 (사용자 문서는 요청 내 노드들이 같은 배치 로더를 공유)
+    config = {"configurable": {USER_LOADER_KEY: UserLoader()}}
+    if callbacks:
+        config["callbacks"] = callbacks
+
+    # 4. 노드/LLM/DB 실행 시간 기록 (하위 태스크와 Mongo 드라이버 스레드까지 ContextVar로 전달)
+    ledger = TimingLedger(settings.TIMING_LEDGER_MAX_ENTRIES) if settings.TIMING_LEDGER_ENABLED else None
+    with timing_ledger_scope(ledger):
+        result_state = await app.ainvoke(initial_state, config=config)
+    if ledger is not None:
+        result_state["timing_ledger"] = ledger.to_record()
 
     return result_state
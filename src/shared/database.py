@@ -1,5 +1,7 @@
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from src.core.config import settings
+from src.shared.metrics.collectors import mongo_metrics_listener
+from src.shared.metrics.timing_ledger import ledger_mongo_listener
 from src.recommendation.schemas.dining_session import DiningSession, RestaurantCandidate
 from bson import ObjectId
 from typing import Optional, Union
@@ -15,6 +17,28 @@ class Database:
 
 db_wrapper = Database()
 
+def _client_options() -> dict:
+    """커넥션 풀/타임아웃 설정 (지표 수집 / 요청별 실행 시간 기록용 명령 리스너 포함)"""
+    options = {
+        "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": settings.MONGO_MAX_IDLE_TIME_MS,
+        "waitQueueTimeoutMS": settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "connectTimeoutMS": settings.MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    }
+    listeners = []
+    if settings.METRICS_ENABLED:
+        listeners.append(mongo_metrics_listener)
+    if settings.TIMING_LEDGER_ENABLED:
+        listeners.append(ledger_mongo_listener)
+    if listeners:
+        options["event_listeners"] = listeners
+    return options
+
+def _create_client() -> AsyncIOMotorClient:
+    return AsyncIOMotorClient(settings.MONGODB_URI, **_client_options())
+
 def get_client() -> AsyncIOMotorClient:
     """MongoDB Client 싱글톤 반환 (이벤트 루프 변화 대응)"""
     try:
@@ -23,14 +47,60 @@ def get_client() -> AsyncIOMotorClient:
         current_loop = None
     # 클라이언트가 없거나, 기존 클라이언트의 루프와 현재 루프가 다를 경우 새로 생성
     if db_wrapper.client is None:
-        db_wrapper.client = AsyncIOMotorClient(settings.MONGODB_URI)
+        db_wrapper.client = _create_client()
     elif current_loop and db_wrapper.client.get_io_loop() != current_loop:
         # 기존 클라이언트의 소켓 등을 닫고 새로 생성
         db_wrapper.client.close()
-        db_wrapper.client = AsyncIOMotorClient(settings.MONGODB_URI)
+        db_wrapper.client = _create_client()
         
     return db_wrapper.client
 
+async def connect_to_mongo():
+    """앱 시작 시 공용 커넥션 풀 생성 (lifespan에서 호출)"""
+    get_client()
+
+async def ensure_indexes():
+    """
+    앱 시작 시 필요한 인덱스 생성 (이미 있으면 무시)
+    - dining_sessions.diningId: 세션 upsert가 동시에 실행돼도 문서가 하나만 생기도록 유니크 인덱스
+    - allergy_verdicts.createdAt: 알러지 LLM 판정 캐시 만료용 TTL 인덱스
+    - restaurants.allergen_tagging_version: 알러지 재태깅 대상 조회
+    - restaurants.price_features.min_meal_price: 예산 사전 필터
+    - idempotent_responses.createdAt: 멱등 키 응답 저장소 만료용 TTL 인덱스
+    """
+    db = get_db()
+    try:
+        await db["dining_sessions"].create_index("diningId", unique=True)
+    except Exception as e:
+        # 기존 중복 데이터 등으로 실패해도 서비스는 계속 동작
+        print(f"dining_sessions 인덱스 생성 실패: {e}")
+    try:
+        await db["allergy_verdicts"].create_index(
+            "createdAt", expireAfterSeconds=settings.ALLERGY_VERDICT_CACHE_TTL_SEC
+        )
+    except Exception as e:
+        print(f"allergy_verdicts 인덱스 생성 실패: {e}")
+    try:
+        await db["restaurants"].create_index("allergen_tagging_version")
+    except Exception as e:
+        print(f"restaurants 알러지 인덱스 생성 실패: {e}")
+    try:
+        await db["restaurants"].create_index("price_features.min_meal_price")
+    except Exception as e:
+        print(f"restaurants 가격 인덱스 생성 실패: {e}")
+    try:
+        await db["idempotent_responses"].create_index(
+            "createdAt", expireAfterSeconds=settings.IDEMPOTENCY_TTL_SEC
+        )
+    except Exception as e:
+        print(f"idempotent_responses 인덱스 생성 실패: {e}")
+
+async def close_mongo_connection():
+    """앱 종료 시 공용 커넥션 풀 정리 (lifespan에서 호출)"""
+    if db_wrapper.client is not None:
+        db_wrapper.client.close()
+        db_wrapper.client = None
+
 def get_db() -> AsyncIOMotorDatabase:
     """기본 데이터베이스(damo) 반환"""
     client = get_client()
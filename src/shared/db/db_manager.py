@@ -2,8 +2,10 @@ import os
 from datetime import datetime
 from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo import UpdateOne, errors, GEOSPHERE, ReturnDocument
-from typing import List, Dict, Any, Optional, Union
+from typing import AsyncIterator, List, Dict, Any, Optional, Union
 from src.core.config import settings
+from src.shared.database import get_client
+from src.shared.db.projections import get_restaurant_projection
 from src.recommendation.schemas.recommendations_request import RecommendationsRequest
 from src.recommendation.workflows.states.recommendation_state import RecommendationState
 
@@ -14,8 +16,9 @@ class MongoManager:
         current_uri = uri or settings.MONGODB_URI
         current_db_name = db_name or settings.DB_NAME
 
-        # 1. 비동기 클라이언트 생성
-        self.client = AsyncIOMotorClient(current_uri)
+        # 1. 비동기 클라이언트 (기본은 앱 공용 커넥션 풀을 빌려 사용)
+        # uri를 직접 넘긴 경우에만 별도 클라이언트를 생성합니다.
+        self.client = AsyncIOMotorClient(current_uri) if uri else get_client()
         self.db = self.client[current_db_name]
         self.collection = self.db[col_name] if col_name else None
 
@@ -33,10 +36,14 @@ class MongoManager:
             return None
 
     async def read_all(
-        self, query: Dict[str, Any] = {}, limit: int = 0
+        self,
+        query: Dict[str, Any] = {},
+        limit: int = 0,
+        projection: Optional[Dict[str, int]] = None,
     ) -> List[Dict[str, Any]]:
         # motor에서는 find() 호출 후 to_list()를 명시적으로 호출해야 합니다.
-        cursor = self.collection.find(query).limit(limit)
+        # projection이 None이면 전체 문서를 조회합니다.
+        cursor = self.collection.find(query, projection).limit(limit)
         return await cursor.to_list(length=None)
 
     async def read_one(self, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -67,6 +74,32 @@ class MongoManager:
             print(f"단계 업데이트 에러: {e}")
             return None
 
+    async def upsert_and_return(
+        self,
+        filter_query: Dict[str, Any],
+        update_query: Dict[str, Any],
+        projection: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        문서를 원자적으로 upsert하고 변경 후 문서를 반환합니다. (DB 왕복 1회)
+
+        동시 요청이 같은 문서를 동시에 생성하려다 유니크 인덱스에 막히면
+        이미 생성된 문서를 대상으로 한 번 더 수행합니다.
+        """
+        for attempt in range(2):
+            try:
+                return await self.collection.find_one_and_update(
+                    filter_query,
+                    update_query,
+                    projection=projection,
+                    upsert=True,
+                    return_document=ReturnDocument.AFTER,
+                )
+            except errors.DuplicateKeyError:
+                if attempt == 1:
+                    raise
+        return None
+
     async def update_one(
         self, filter_query: Dict[str, Any], update_data: Dict[str, Any]
     ) -> int:
@@ -75,39 +108,180 @@ class MongoManager:
         return result.modified_count
 
     async def find_by_location(
-        self, longitude: float, latitude: float, max_distance: int = 5000
+        self,
+        longitude: float,
+        latitude: float,
+        max_distance: int = 5000,
+        with_distance: bool = False,
+        limit: int = 0,
+        projection: Optional[str] = None,
+        max_meal_price: Optional[float] = None,
     ) -> List[Dict[str, Any]]:
         """
         주어진 좌표를 기준으로 반경 내의 식당 목록을 거리순으로 조회합니다.
         (motor 비동기 방식 적용)
+
+        Args:
+            longitude: 경도
+            latitude: 위도
+            max_distance: 최대 반경 (m)
+            with_distance: True이면 $geoNear 집계로 서버에서 계산한
+                거리(distance, m)와 거리 점수(distance_score, 1.0 ~ 0.0)를 함께 반환
+            limit: 최대 반환 개수 (0이면 제한 없음)
+            projection: 필드 프로젝션 프로필 이름 (projections.RESTAURANT_PROJECTIONS, None이면 전체 문서)
+            max_meal_price: 1인 예산. 가장 저렴한 메인 메뉴가 이보다 비싼 식당 제외
+                (price_features.min_meal_price 기준, 가격 특성이 없는 식당은 포함)
         """
         if self.collection is None:
             raise ValueError(
                 "컬렉션이 설정되지 않았습니다. set_collection()을 호출하세요."
             )
+        point = {"type": "Point", "coordinates": [longitude, latitude]}
+        fields = get_restaurant_projection(projection)
+        filters = self._location_filters(max_meal_price)
+
+        if with_distance:
+            return await self._find_by_geo_near(point, max_distance, limit, fields, filters)
+
         query = {
             "location": {
                 "$near": {
-                    "$geometry": {
-                        "type": "Point",
-                        "coordinates": [longitude, latitude],
-                    },
+                    "$geometry": point,
                     "$maxDistance": max_distance,
                 }
-            }
+            },
+            **filters,
         }
 
         # motor 방식: find() 후 to_list() 사용
-        cursor = self.collection.find(query)
+        cursor = self.collection.find(query, fields).limit(limit)
+        return await cursor.to_list(length=None)
+
+    async def stream_by_location(
+        self,
+        longitude: float,
+        latitude: float,
+        max_distance: int = 5000,
+        batch_size: int = 20,
+        projection: Optional[str] = None,
+        max_meal_price: Optional[float] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        반경 내 식당을 가까운 순으로 batch_size개씩 나눠 반환하는 비동기 제너레이터
+        (find_by_location(with_distance=True)와 같은 필드/조건, 서버 커서도 batch_size 단위로 조회)
+
+        호출 측에서 필요한 만큼만 받고 멈추면(aclosing 사용) 커서를 닫아 나머지는 전송되지 않습니다.
+        """
+        if self.collection is None:
+            raise ValueError(
+                "컬렉션이 설정되지 않았습니다. set_collection()을 호출하세요."
+            )
+        point = {"type": "Point", "coordinates": [longitude, latitude]}
+        fields = get_restaurant_projection(projection)
+        filters = self._location_filters(max_meal_price)
+        pipeline = self._geo_near_pipeline(point, max_distance, 0, fields, filters)
+
+        cursor = self.collection.aggregate(pipeline, batchSize=batch_size)
+        try:
+            batch: List[Dict[str, Any]] = []
+            async for doc in cursor:
+                batch.append(doc)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        finally:
+            await cursor.close()
+
+    @staticmethod
+    def _location_filters(max_meal_price: Optional[float] = None) -> Dict[str, Any]:
+        """위치 조회 공통 조건 (예산 사전 필터)"""
+        filters: Dict[str, Any] = {}
+        if max_meal_price is not None:
+            # 메인 메뉴가 없거나 가격 특성이 계산되지 않은 식당(null/필드 없음)은 통과
+            filters["$or"] = [
+                {"price_features.min_meal_price": {"$lte": max_meal_price}},
+                {"price_features.min_meal_price": None},
+            ]
+        return filters
+
+    @staticmethod
+    def _geo_near_pipeline(
+        point: Dict[str, Any],
+        max_distance: int,
+        limit: int = 0,
+        fields: Optional[Dict[str, int]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """$geoNear 집계 파이프라인 (거리 계산 및 정렬을 DB에서 처리)"""
+        pipeline: List[Dict[str, Any]] = [
+            {
+                "$geoNear": {
+                    "near": point,
+                    "key": "location",
+                    "distanceField": "distance",
+                    "maxDistance": max_distance,
+                    "query": filters or {},
+                    "spherical": True,
+                }
+            },
+            {
+                "$addFields": {
+                    # 가까울수록 1.0, max_distance 지점이면 0.0
+                    "distance_score": {
+                        "$round": [
+                            {
+                                "$max": [
+                                    0.0,
+                                    {
+                                        "$subtract": [
+                                            1.0,
+                                            {"$divide": ["$distance", max(max_distance, 1)]},
+                                        ]
+                                    },
+                                ]
+                            },
+                            4,
+                        ]
+                    },
+                    "distance": {"$toInt": "$distance"},
+                }
+            },
+        ]
+        if limit:
+            pipeline.append({"$limit": limit})
+        if fields:
+            # 서버에서 계산한 거리 필드는 항상 포함
+            pipeline.append(
+                {"$project": {**fields, "distance": 1, "distance_score": 1}}
+            )
+
+        return pipeline
+
+    async def _find_by_geo_near(
+        self,
+        point: Dict[str, Any],
+        max_distance: int,
+        limit: int = 0,
+        fields: Optional[Dict[str, int]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """$geoNear 집계로 거리 계산 및 정렬을 DB에서 처리"""
+        pipeline = self._geo_near_pipeline(point, max_distance, limit, fields, filters)
+        cursor = self.collection.aggregate(pipeline)
         return await cursor.to_list(length=None)
 
     # 회식 세션을 저장하는 함수
     async def save_dining_session(self, result: RecommendationState):
         """
         추천 결과를 dining_sessions 컬렉션에 저장 또는 업데이트합니다.
-        1. 데이터가 들어오면 diningId 기반으로 문서를 검색한다.
-        1-1. (문서가 있을 경우) 특정 항목을 업데이트한다. (후보 리스트 및 업데이트 시간)
-        1-2. (문서가 없을 경우) 새로운 문서를 만든다.
+        diningId 기준 단일 upsert(find_one_and_update)로 처리하여 DB 왕복은 1회입니다.
+        1-1. (문서가 있을 경우) 후보 리스트/업데이트 시간 갱신, 상태 메시지/거절 식당 추가, 페이즈 +1
+        1-2. (문서가 없을 경우) 새로운 문서를 만들고 페이즈를 1로 시작한다.
+
+        Returns:
+            저장 후 currentPhase (실패 시 False 또는 None)
         """
         try:
             # 컬렉션 전환
@@ -119,6 +293,7 @@ class MongoManager:
             rejected_candidates = result.get("rejected_restaurants")
             phases = result.get("vote_result_list")
             status_message = result.get("status_message")
+            timing_ledger = result.get("timing_ledger")
 
             if dining_data is None:
                 print("세션 저장 실패: dining_data가 없습니다.")
@@ -153,55 +328,52 @@ class MongoManager:
                     for p in phases
                 ]
 
-            # 문서 검색 (diningId 기준)
-            existing = await self.read_one({"diningId": dining_id})
+            # diningId 기준 upsert 한 번으로 생성/수정 + 페이즈 증가를 처리
             now = datetime.now()
-
-            if existing:
-                # 있을 경우 (UPDATE)
-                update_query = {
-                    "$set": {
-                        "userIds": user_ids,
-                        "restaurantCandidate": restaurant_candidates,
-                        "phases": phases,
-                        "updatedAt": now,
-                    },
-                    "$push": {"statusMessage": {"$each": status_message}},
-                }
-
-                # 거절된 식당이 있으면 push ($each 사용으로 리스트 병합)
-                if rejected_candidates:
-                    update_query["$push"]["rejectedCandidate"] = {
-                        "$each": rejected_candidates
-                    }
-
-                await self.collection.update_one({"diningId": dining_id}, update_query)
-                updated_doc = await self.update_phase_count({"diningId": dining_id}, "currentPhase")
-                return updated_doc.get("currentPhase") if updated_doc else None
-            else:
-                # 없을 경우 (CREATE)
-                session_data = {
+            update_query = {
+                # 생성/수정 공통
+                "$set": {
                     "userIds": user_ids,
-                    "diningId": dining_id,
+                    "restaurantCandidate": restaurant_candidates,
+                    "phases": phases,
+                    "updatedAt": now,
+                },
+                # 생성 시에만 기록 (diningId는 필터 조건에서 자동으로 채워짐)
+                "$setOnInsert": {
                     "budget": dining_info.get("budget"),
-                    "currentPhase": 1,
                     "diningDate": dining_info.get("diningDate")
                     or dining_info.get("dining_date"),
                     "finalRestaurant": None,
                     "groupsId": dining_info.get("groupsId")
                     or dining_info.get("groups_id"),
                     "isCompleted": False,
-                    "phases": phases,
-                    "restaurantCandidate": restaurant_candidates,
-                    "rejectedCandidate": [],
-                    "statusMessage": status_message,
                     "x": dining_info.get("x"),
                     "y": dining_info.get("y"),
                     "createdAt": now,
-                    "updatedAt": now,
+                },
+                # 없으면 빈 배열로 생성된 뒤 추가됨 ($each 사용으로 리스트 병합)
+                "$push": {
+                    "statusMessage": {"$each": status_message or []},
+                },
+                # 생성 시 1, 이후 호출마다 1씩 증가
+                "$inc": {"currentPhase": 1},
+            }
+            # 거절된 식당이 있을 때만 push, 없으면 생성 시 빈 배열로 시작 (같은 필드에 두 연산자를 함께 쓸 수 없음)
+            if rejected_candidates:
+                update_query["$push"]["rejectedCandidate"] = {"$each": rejected_candidates}
+            else:
+                update_query["$setOnInsert"]["rejectedCandidate"] = []
+            if timing_ledger:
+                # 요청별 실행 시간 기록은 최근 N개만 보관 (문서 크기 제한)
+                update_query["$push"]["timingLedger"] = {
+                    "$each": [timing_ledger],
+                    "$slice": -settings.TIMING_LEDGER_MAX_RECORDS,
                 }
-                await self.create_one(session_data)
-                return 1
+
+            updated_doc = await self.upsert_and_return(
+                {"diningId": dining_id}, update_query, projection={"currentPhase": 1}
+            )
+            return updated_doc.get("currentPhase") if updated_doc else None
         except Exception as e:
             print(f"세션 저장 중 오류 발생: {str(e)}")
             return False
@@ -0,0 +1,85 @@
+"""
+restaurants 컬렉션 조회용 필드 프로젝션 프로필
+
+식당 문서에는 메뉴 이미지(image_url), review_ids, 편의시설, 영업시간 등
+추천 과정에서 쓰지 않는 필드가 많기 때문에, 호출하는 쪽에서 필요한 필드만
+프로필 이름으로 지정해 가져옵니다.
+"""
+
+from typing import Dict, Optional
+
+
+def _fields(*names: str) -> Dict[str, int]:
+    return {name: 1 for name in names}
+
+
+# 거리/알러지/예산 필터링에 필요한 필드 (위치 + 메뉴 이름/가격/설명)
+_FILTERING_FIELDS = (
+    "id",
+    "place_name",
+    "location",
+    "menus.title",
+    "menus.price",
+    "menus.description",
+    # 오프라인 알러지 태깅 결과 (allergen_tagging)
+    "menus.allergens",
+    "unsafe_for",
+    "safe_main_counts",
+    "allergen_menus_hash",
+    "allergen_confirmed",
+    # 사전 계산된 메뉴 가격 특성 (price_features)
+    "price_features",
+)
+
+# LLM 프롬프트 구성에 필요한 필드 (이름, 카테고리, 키워드)
+_PROMPT_FIELDS = (
+    "id",
+    "place_name",
+    "category_group_name",
+    "category_detail",
+    "restaurant_review_keywords",
+)
+
+# RestaurantDocument 검증에 필요한 필수 필드
+_DOCUMENT_FIELDS = (
+    "place_name",
+    "address_name",
+    "road_address_name",
+    "category_group_name",
+    "category_detail",
+    "place_url",
+    "x",
+    "y",
+)
+
+RESTAURANT_PROJECTIONS: Dict[str, Optional[Dict[str, int]]] = {
+    # 전체 문서
+    "full": None,
+    "filtering": _fields(*_FILTERING_FIELDS),
+    "prompt": _fields(*_PROMPT_FIELDS),
+    # 추천 그래프 전체(필터링 -> 토론 -> dining_sessions 저장)에서 쓰는 필드
+    "candidate": _fields(
+        *_FILTERING_FIELDS,
+        *_PROMPT_FIELDS,
+        "address_name",
+        "road_address_name",
+        "business_hour",
+    ),
+    # RestaurantDocument로 변환 가능한 최소 필드 + 메뉴 이름/가격
+    "summary": _fields(*_DOCUMENT_FIELDS, "menus.title", "menus.price"),
+}
+
+
+def get_restaurant_projection(profile: Optional[str]) -> Optional[Dict[str, int]]:
+    """
+    프로필 이름으로 프로젝션을 반환합니다. (None이면 전체 문서)
+
+    Raises:
+        ValueError: 등록되지 않은 프로필 이름인 경우
+    """
+    if profile is None:
+        return None
+    if profile not in RESTAURANT_PROJECTIONS:
+        raise ValueError(f"알 수 없는 프로젝션 프로필입니다: {profile}")
+    projection = RESTAURANT_PROJECTIONS[profile]
+    return dict(projection) if projection is not None else None
@@ -0,0 +1,3 @@
+from .distance import haversine, distance_score
+
+__all__ = ["haversine", "distance_score"]
@@ -0,0 +1,20 @@
+import math
+
+EARTH_RADIUS_M = 6371000  # 지구 반지름 (m)
+METERS_PER_DEGREE_LAT = 111320  # 위도 1도당 거리 (m)
+
+
+def haversine(lon1: float, lat1: float, lon2: float, lat2: float) -> float:
+    """두 좌표 사이의 거리 (m)"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = math.radians(lat2 - lat1)
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def distance_score(distance: float, max_distance: float) -> float:
+    """가까울수록 1.0, max_distance 지점이면 0.0 (소수점 4자리)"""
+    if max_distance <= 0:
+        return 0.0
+    return round(max(0.0, 1.0 - (distance / max_distance)), 4)
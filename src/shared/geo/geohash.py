@@ -0,0 +1,51 @@
+from typing import Tuple
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def encode(longitude: float, latitude: float, precision: int = 7) -> str:
+    """좌표를 geohash 문자열로 변환 (precision 7 ≒ 153m x 153m 셀)"""
+    lon_range = [-180.0, 180.0]
+    lat_range = [-90.0, 90.0]
+    chars = []
+    bit, ch, even = 0, 0, True
+
+    while len(chars) < precision:
+        target, value = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (target[0] + target[1]) / 2
+        if value >= mid:
+            ch = (ch << 1) | 1
+            target[0] = mid
+        else:
+            ch = ch << 1
+            target[1] = mid
+        even = not even
+        bit += 1
+        if bit == 5:
+            chars.append(_BASE32[ch])
+            bit, ch = 0, 0
+    return "".join(chars)
+
+
+def decode_bbox(geohash: str) -> Tuple[float, float, float, float]:
+    """geohash 셀의 경계 (min_lon, min_lat, max_lon, max_lat)"""
+    lon_range = [-180.0, 180.0]
+    lat_range = [-90.0, 90.0]
+    even = True
+    for c in geohash:
+        value = _BASE32.index(c)
+        for shift in range(4, -1, -1):
+            target = lon_range if even else lat_range
+            mid = (target[0] + target[1]) / 2
+            if (value >> shift) & 1:
+                target[0] = mid
+            else:
+                target[1] = mid
+            even = not even
+    return lon_range[0], lat_range[0], lon_range[1], lat_range[1]
+
+
+def decode_center(geohash: str) -> Tuple[float, float]:
+    """geohash 셀의 중심 좌표 (longitude, latitude)"""
+    min_lon, min_lat, max_lon, max_lat = decode_bbox(geohash)
+    return (min_lon + max_lon) / 2, (min_lat + max_lat) / 2
@@ -0,0 +1,347 @@
+"""
+오프라인 LLM 백엔드 (성능 측정 / 용량 산정용)
+
+settings.LLM_BACKEND로 선택하며, llm_client의 get_llm / get_openai_llm이 반환하는
+인스턴스 자체를 바꾸므로 체인 코드는 그대로 둔 채 전체 파이프라인에 적용됩니다.
+- live: 실제 Gemini / OpenAI 호출 (기본값)
+- record: 실제 호출 후 응답과 지연 시간을 프롬프트 해시 단위로 디스크에 저장
+- replay: 저장된 응답을 재생 (없으면 ReplayMissError, 네트워크 호출 없음)
+- synthetic: 지연 시간 분포를 따르는 가짜 응답 (알러지 판정 / 순위 JSON / 투표 형식 생성)
+"""
+
+import ast
+import asyncio
+import hashlib
+import json
+import random
+import re
+from pathlib import Path
+from time import monotonic
+from typing import Any, Callable, Dict, List, Optional, get_args, get_origin
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import Runnable, RunnableLambda
+from pydantic import BaseModel, ConfigDict
+from src.core.config import settings
+
+CANDIDATE_ID_PATTERN = re.compile(r"\(ID: ([^)\n]+)\)")
+# ID 없이 "1. 식당이름 (..." 형태로만 나열된 후보 (moderator 후보 포맷)
+NUMBERED_CANDIDATE_PATTERN = re.compile(r"^\s*\d+\. \**(.+?)\**\s\(", re.MULTILINE)
+CONTEXT_ITEM_PATTERN = re.compile(r"'id': (?:ObjectId\()?'([^']*)'\)?, 'place_name': '([^']*)'")
+
+
+class ReplayMissError(RuntimeError):
+    """replay 모드에서 저장된 응답이 없는 프롬프트"""
+
+
+def prompt_text(messages: List[BaseMessage]) -> str:
+    return "\n".join(m.text for m in messages)
+
+
+def prompt_hash(provider: str, model: str, temperature: float, messages: List[BaseMessage], schema: Optional[str] = None) -> str:
+    """모델 설정 + 메시지(역할/내용) + 구조화 출력 스키마 기준 해시 (record/replay 키)"""
+    payload = {
+        "provider": provider,
+        "model": model,
+        "temperature": temperature,
+        "schema": schema,
+        "messages": [[m.type, m.content] for m in messages],
+    }
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def candidate_ids(text: str) -> List[str]:
+    """프롬프트에 나열된 후보 식당 ID (ID가 없으면 이름)"""
+    ids = CANDIDATE_ID_PATTERN.findall(text) or NUMBERED_CANDIDATE_PATTERN.findall(text)
+    return list(dict.fromkeys(ids))
+
+
+def _schema_name(schema: Any) -> str:
+    return getattr(schema, "__name__", str(schema))
+
+
+def _validate(schema: Any, data: Any) -> Any:
+    if isinstance(schema, type) and issubclass(schema, BaseModel):
+        return schema.model_validate(data)
+    return data
+
+
+def _dump(output: Any) -> Any:
+    return output.model_dump(mode="json") if isinstance(output, BaseModel) else output
+
+
+class OfflineChatModel(BaseChatModel):
+    """오프라인 백엔드 공통 (provider/model/temperature는 record/replay 키와 스케줄러 구분에 사용)"""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    provider: str
+    model: str
+    temperature: float = 0.7
+
+    @property
+    def _llm_type(self) -> str:
+        return f"{self.backend}-{self.provider}"
+
+    @property
+    def backend(self) -> str:
+        raise NotImplementedError
+
+    def _get_ls_params(self, stop: Optional[List[str]] = None, **kwargs: Any) -> Dict[str, Any]:
+        # 지표/트레이싱에서 live 모델과 같은 provider/model 이름으로 집계
+        params = super()._get_ls_params(stop=stop, **kwargs)
+        params["ls_provider"] = self.provider
+        params["ls_model_name"] = self.model
+        return params
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        raise NotImplementedError(f"{self.backend} 백엔드는 비동기 호출(ainvoke)만 지원합니다.")
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        content = await self._respond(messages)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    def with_structured_output(self, schema: Any, **kwargs: Any) -> Runnable:
+        async def astructured(input: Any) -> Any:
+            return await self._respond_structured(self._convert_input(input).to_messages(), schema, **kwargs)
+
+        return RunnableLambda(self._sync_unsupported, afunc=astructured)
+
+    def _sync_unsupported(self, input: Any) -> Any:
+        raise NotImplementedError(f"{self.backend} 백엔드는 비동기 호출(ainvoke)만 지원합니다.")
+
+    async def _respond(self, messages: List[BaseMessage]) -> Any:
+        raise NotImplementedError
+
+    async def _respond_structured(self, messages: List[BaseMessage], schema: Any, **kwargs: Any) -> Any:
+        raise NotImplementedError
+
+
+class RecordReplayChatModel(OfflineChatModel):
+    """
+    record: 실제 모델(live_llm) 호출 결과를 cassette_dir/<해시 앞 2자리>/<해시>.json에 저장
+    replay: 저장된 결과만 사용 (replay_latency면 기록된 지연 시간만큼 대기)
+    """
+
+    mode: str = "replay"
+    cassette_dir: str
+    replay_latency: bool = False
+    live_llm: Optional[BaseChatModel] = None
+
+    @property
+    def backend(self) -> str:
+        return self.mode
+
+    def _path(self, key: str) -> Path:
+        return Path(self.cassette_dir) / key[:2] / f"{key}.json"
+
+    async def _respond(self, messages: List[BaseMessage]) -> Any:
+        return await self._cassette(messages, None, lambda: self.live_llm.ainvoke(messages), lambda m: m.content)
+
+    async def _respond_structured(self, messages: List[BaseMessage], schema: Any, **kwargs: Any) -> Any:
+        output = await self._cassette(
+            messages,
+            schema,
+            lambda: self.live_llm.with_structured_output(schema, **kwargs).ainvoke(messages),
+            _dump,
+        )
+        return _validate(schema, output)
+
+    async def _cassette(
+        self,
+        messages: List[BaseMessage],
+        schema: Any,
+        call: Callable[[], Any],
+        serialize: Callable[[Any], Any],
+    ) -> Any:
+        schema_name = _schema_name(schema) if schema is not None else None
+        key = prompt_hash(self.provider, self.model, self.temperature, messages, schema_name)
+        path = self._path(key)
+
+        if self.mode == "replay":
+            if not path.exists():
+                raise ReplayMissError(f"저장된 LLM 응답이 없습니다: {key} ({self.provider}:{self.model})")
+            record = json.loads(path.read_text(encoding="utf-8"))
+            if self.replay_latency:
+                await asyncio.sleep(record.get("latency_ms", 0) / 1000)
+            return record["output"]
+
+        start = monotonic()
+        output = serialize(await call())
+        record = {
+            "key": key,
+            "provider": self.provider,
+            "model": self.model,
+            "temperature": self.temperature,
+            "schema": schema_name,
+            "latency_ms": round((monotonic() - start) * 1000, 1),
+            "prompt": prompt_text(messages),
+            "output": output,
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(record, ensure_ascii=False, indent=2), encoding="utf-8")
+        return output
+
+
+class SyntheticChatModel(OfflineChatModel):
+    """
+    네트워크 없이 프롬프트 형태에 맞는 가짜 응답 생성
+
+    응답 내용은 프롬프트 해시 + seed로 결정되어 같은 입력에는 항상 같은 결과를 주고,
+    지연 시간은 latency_dist(fixed / uniform / lognormal)에서 샘플링합니다.
+    - 알러지 판정(BatchAllergyCheckResult): 식당별 is_safe를 safe_ratio 확률로 생성
+    - 순위 JSON(ranked_restaurant_ids / items): 후보 ID를 섞은 순서로 생성
+    - 투표("선택: / 이유:" 형식): 후보 중 1개 선택
+    """
+
+    latency_dist: str = "lognormal"
+    latency_ms: float = 800.0
+    latency_spread: float = 0.5
+    safe_ratio: float = 0.8
+    seed: int = 42
+    calls: int = 0
+
+    @property
+    def backend(self) -> str:
+        return "synthetic"
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """지연 시간(초) 샘플링 (latency_ms는 fixed/uniform의 평균, lognormal의 중앙값)"""
+        if self.latency_dist == "fixed":
+            latency = self.latency_ms
+        elif self.latency_dist == "uniform":
+            latency = rng.uniform(self.latency_ms * (1 - self.latency_spread), self.latency_ms * (1 + self.latency_spread))
+        else:
+            latency = rng.lognormvariate(0, self.latency_spread) * self.latency_ms
+        return max(latency, 0.0) / 1000
+
+    def _rng(self, text: str) -> random.Random:
+        digest = hashlib.sha256(f"{self.seed}|{self.model}|{text}".encode("utf-8")).hexdigest()
+        return random.Random(int(digest[:16], 16))
+
+    async def _wait(self, text: str):
+        self.calls += 1
+        # 같은 프롬프트라도 호출 순서에 따라 지연 시간은 달라지도록 호출 횟수를 섞음
+        await asyncio.sleep(self.sample_latency(self._rng(f"{text}|{self.calls}")))
+
+    async def _respond(self, messages: List[BaseMessage]) -> Any:
+        text = prompt_text(messages)
+        await self._wait(text)
+        return self.synthesize_text(text)
+
+    async def _respond_structured(self, messages: List[BaseMessage], schema: Any, **kwargs: Any) -> Any:
+        text = prompt_text(messages)
+        await self._wait(text)
+        return _validate(schema, self.synthesize_structured(text, schema))
+
+    def synthesize_text(self, text: str) -> str:
+        rng = self._rng(text)
+        if "ranked_restaurant_ids" in text:
+            ids = candidate_ids(text)
+            rng.shuffle(ids)
+            return json.dumps(
+                {"ranked_restaurant_ids": ids, "reasoning": "합성 응답: 토론 선호도 기준 정렬"},
+                ensure_ascii=False,
+            )
+        if "선택:" in text and "이유:" in text:
+            ids = candidate_ids(text)
+            choice = rng.choice(ids) if ids else "unknown"
+            return f"선택: {choice}\n이유: 합성 응답으로 선택한 식당입니다."
+        if "reasoning_description" in text and "restaurant_id" in text:
+            items = [
+                {"restaurant_id": rid, "place_name": name, "reasoning_description": "합성 응답: 그룹 취향 기준 정렬"}
+                for rid, name in dict.fromkeys(CONTEXT_ITEM_PATTERN.findall(text))
+            ]
+            rng.shuffle(items)
+            return json.dumps({"items": items}, ensure_ascii=False)
+        return "합성 응답입니다. 후보 식당들의 장단점을 비교해 보면 모두 무난한 선택지입니다."
+
+    def synthesize_structured(self, text: str, schema: Any) -> Any:
+        rng = self._rng(text)
+        name = _schema_name(schema)
+        targets = _trailing_literal(text)
+        if name == "BatchAllergyCheckResult":
+            return {
+                "results": [
+                    {
+                        "place_name": item.get("n", ""),
+                        "is_safe": rng.random() < self.safe_ratio,
+                        "reason": "합성 판정",
+                    }
+                    for item in targets
+                ]
+            }
+        if name == "BatchMenuAllergenConfirmation":
+            return {"results": [{"menu_title": item.get("m", ""), "allergy_types": item.get("k", [])} for item in targets]}
+        return _default_instance(schema)
+
+
+def _trailing_literal(text: str) -> List[Dict[str, Any]]:
+    """프롬프트 마지막 줄의 파이썬 리터럴 목록 (알러지 판정 프롬프트는 검토 대상을 마지막 줄에 나열)"""
+    try:
+        value = ast.literal_eval(text.strip().rsplit("\n", 1)[-1])
+    except (ValueError, SyntaxError):
+        return []
+    return [item for item in value if isinstance(item, dict)] if isinstance(value, list) else []
+
+
+def _default_value(annotation: Any) -> Any:
+    origin = get_origin(annotation)
+    if origin in (list, List):
+        return []
+    if origin in (dict, Dict):
+        return {}
+    if origin is not None:
+        args = [a for a in get_args(annotation) if a is not type(None)]
+        return _default_value(args[0]) if args else None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return _default_instance(annotation)
+    return {str: "", bool: True, int: 0, float: 0.0}.get(annotation)
+
+
+def _default_instance(schema: Any) -> Dict[str, Any]:
+    """알 수 없는 스키마는 필드 타입별 기본값으로 채움"""
+    if not (isinstance(schema, type) and issubclass(schema, BaseModel)):
+        return {}
+    return {name: _default_value(field.annotation) for name, field in schema.model_fields.items()}
+
+
+def build_llm(provider: str, model: str, temperature: float, live_factory: Callable[[], BaseChatModel]) -> BaseChatModel:
+    """settings.LLM_BACKEND에 맞는 LLM 인스턴스 생성"""
+    backend = settings.LLM_BACKEND
+    if backend == "live":
+        return live_factory()
+    if backend in ("record", "replay"):
+        return RecordReplayChatModel(
+            provider=provider,
+            model=model,
+            temperature=temperature,
+            mode=backend,
+            cassette_dir=settings.LLM_CASSETTE_DIR,
+            replay_latency=settings.LLM_REPLAY_LATENCY,
+            live_llm=live_factory() if backend == "record" else None,
+        )
+    return SyntheticChatModel(
+        provider=provider,
+        model=model,
+        temperature=temperature,
+        latency_dist=settings.LLM_SYNTHETIC_LATENCY_DIST,
+        latency_ms=settings.LLM_SYNTHETIC_LATENCY_MS,
+        latency_spread=settings.LLM_SYNTHETIC_LATENCY_SPREAD,
+        safe_ratio=settings.LLM_SYNTHETIC_SAFE_RATIO,
+        seed=settings.LLM_SYNTHETIC_SEED,
+    )
@@ -1,26 +1,149 @@
+import asyncio
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+import httpx
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_openai import ChatOpenAI
 from src.core.config import settings
+from src.shared.llm.llm_backends import build_llm
 
+# (provider, model, temperature)
+ClientKey = Tuple[str, str, float]
 
-def get_llm(temperature: float = 0.7) -> ChatGoogleGenerativeAI:
+
+class LLMClientRegistry:
     """
-    Gemini LLM 인스턴스를 반환합니다.
+    LLM 클라이언트 레지스트리 (provider + model + temperature 단위로 인스턴스 재사용)
+
+    요청마다 LLM 인스턴스를 새로 만들면 SDK 클라이언트와 커넥션 풀도 매번 새로 생겨
+    TLS 핸드셰이크를 반복하게 됩니다. 같은 설정의 인스턴스는 프로세스 안에서 공유하고,
+    OpenAI 계열은 keep-alive 커넥션 풀(httpx)을 모델 간에도 함께 사용합니다.
+    이벤트 루프가 바뀌면(테스트, 배치 스크립트 등) 기존 커넥션은 쓸 수 없으므로 새로 만듭니다.
     """
 
-    return ChatGoogleGenerativeAI(
-        model=settings.GEMINI_MODEL,
-        temperature=temperature,
-        google_api_key=settings.GOOGLE_API_KEY,
-        convert_system_message_to_human=True,  # 시스템 메시지 호환성 옵션
+    def __init__(self):
+        self._clients: Dict[ClientKey, Any] = {}
+        self._http_client: Optional[httpx.Client] = None
+        self._http_async_client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # 루프 변경으로 교체된 비동기 클라이언트 정리 태스크 (GC로 취소되지 않도록 참조 보관)
+        self._close_tasks: Set[asyncio.Task] = set()
+
+    def get(self, provider: str, model: str, temperature: float, factory: Callable[[], Any]) -> Any:
+        self._check_loop()
+        key = (provider, model, float(temperature))
+        client = self._clients.get(key)
+        if client is None:
+            client = factory()
+            self._clients[key] = client
+        return client
+
+    def http_limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.LLM_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=settings.LLM_HTTP_KEEPALIVE_EXPIRY_SEC,
+        )
+
+    def http_client(self) -> httpx.Client:
+        if self._http_client is None:
+            self._http_client = httpx.Client(
+                limits=self.http_limits(), timeout=settings.LLM_HTTP_TIMEOUT_SEC
+            )
+        return self._http_client
+
+    def http_async_client(self) -> httpx.AsyncClient:
+        if self._http_async_client is None:
+            self._http_async_client = httpx.AsyncClient(
+                limits=self.http_limits(), timeout=settings.LLM_HTTP_TIMEOUT_SEC
+            )
+        return self._http_async_client
+
+    def _check_loop(self):
+        try:
+            current_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._loop is None:
+            self._loop = current_loop
+        elif self._loop is not current_loop:
+            # 이전 루프에 묶인 비동기 커넥션은 재사용할 수 없으므로 클라이언트를 새로 생성
+            self._clients.clear()
+            if self._http_async_client is not None:
+                task = current_loop.create_task(self._close_stale_client(self._http_async_client))
+                self._close_tasks.add(task)
+                task.add_done_callback(self._close_tasks.discard)
+            self._http_async_client = None
+            self._loop = current_loop
+
+    @staticmethod
+    async def _close_stale_client(client: httpx.AsyncClient):
+        """교체된 비동기 클라이언트의 커넥션 풀 정리 (이전 루프가 닫혀 있어도 실패를 무시)"""
+        try:
+            await client.aclose()
+        except Exception as e:
+            print(f"[LLMClientRegistry] 이전 HTTP 클라이언트 종료 실패: {e}")
+
+    async def aclose(self):
+        """앱 종료 시 공용 커넥션 풀 정리 (lifespan에서 호출)"""
+        if self._http_async_client is not None:
+            await self._http_async_client.aclose()
+        if self._http_client is not None:
+            self._http_client.close()
+        self._clients.clear()
+        self._http_client = None
+        self._http_async_client = None
+        self._loop = None
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+
+llm_registry = LLMClientRegistry()
+
+
+def get_llm(temperature: float = 0.7, model: Optional[str] = None) -> ChatGoogleGenerativeAI:
+    """
+    Gemini LLM 인스턴스를 반환합니다. (같은 모델/temperature는 공유 인스턴스)
+    settings.LLM_BACKEND가 live가 아니면 record/replay/synthetic 백엔드를 반환합니다.
+    """
+    model = model or settings.GEMINI_MODEL
+    return llm_registry.get(
+        "gemini",
+        model,
+        temperature,
+        lambda: build_llm(
+            "gemini",
+            model,
+            temperature,
+            lambda: ChatGoogleGenerativeAI(
+                model=model,
+                temperature=temperature,
+                google_api_key=settings.GOOGLE_API_KEY,
+                convert_system_message_to_human=True,  # 시스템 메시지 호환성 옵션
+            ),
+        ),
     )
 
-def get_openai_llm(temperature: float = 0.7) -> ChatOpenAI:
+def get_openai_llm(temperature: float = 0.7, model: Optional[str] = None) -> ChatOpenAI:
     """
-    OpenAI LLM 인스턴스를 반환합니다.
+    OpenAI LLM 인스턴스를 반환합니다. (같은 모델/temperature는 공유 인스턴스, 커넥션 풀 공유)
+    settings.LLM_BACKEND가 live가 아니면 record/replay/synthetic 백엔드를 반환합니다.
     """
-    return ChatOpenAI(
-        model=settings.OPENAI_MODEL,
-        temperature=temperature,
-        openai_api_key=settings.OPENAI_API_KEY,
+    model = model or settings.OPENAI_MODEL
+    return llm_registry.get(
+        "openai",
+        model,
+        temperature,
+        lambda: build_llm(
+            "openai",
+            model,
+            temperature,
+            lambda: ChatOpenAI(
+                model=model,
+                temperature=temperature,
+                openai_api_key=settings.OPENAI_API_KEY,
+                http_client=llm_registry.http_client(),
+                http_async_client=llm_registry.http_async_client(),
+            ),
+        ),
     )
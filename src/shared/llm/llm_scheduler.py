@@ -0,0 +1,190 @@
+import asyncio
+import heapq
+import itertools
+from contextlib import asynccontextmanager
+from time import monotonic
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_openai import ChatOpenAI
+from src.core.config import settings
+from src.shared.llm.llm_backends import OfflineChatModel
+
+# 숫자가 작을수록 먼저 실행 (워크플로 후반 단계를 먼저 끝내 꼬리 지연을 줄임)
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 5
+PRIORITY_LOW = 9
+
+# (provider, model)
+RateKey = Tuple[str, str]
+
+
+def llm_key(llm: Any) -> RateKey:
+    """LLM 인스턴스의 (provider, model) 반환 (토큰 버킷 구분용)"""
+    if isinstance(llm, ChatOpenAI):
+        return "openai", llm.model_name
+    if isinstance(llm, ChatGoogleGenerativeAI):
+        return "gemini", llm.model
+    if isinstance(llm, OfflineChatModel):
+        return llm.provider, llm.model
+    return "other", type(llm).__name__
+
+
+class TokenBucket:
+    """초당 rate개씩 채워지고 최대 burst개까지 쌓이는 토큰 버킷"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = monotonic()
+
+    def reserve(self) -> float:
+        """
+        토큰 1개 예약 후 기다려야 하는 시간(초) 반환
+        토큰이 모자라면 잔량을 음수로 두어 먼저 예약한 호출부터 순서대로 실행됩니다.
+        """
+        now = monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.rate
+
+
+class LLMScheduler:
+    """
+    프로세스 전역 LLM 호출 스케줄러
+
+    - 동시 실행 상한(max_concurrency): 초과 호출은 우선순위 -> 도착 순으로 대기
+    - provider/model별 토큰 버킷: 초당 호출 수를 제한해 429 응답 폭주 방지
+    - 대기열 길이 / 대기 시간 통계(stats)
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        rate_per_sec: float = 10.0,
+        burst: int = 20,
+        rate_limits: Optional[Dict[str, float]] = None,
+        enabled: bool = True,
+    ):
+        self.max_concurrency = max_concurrency
+        self.rate_per_sec = rate_per_sec
+        self.burst = burst
+        # "provider:model" -> 초당 호출 수 (지정하지 않은 모델은 rate_per_sec)
+        self.rate_limits = rate_limits or {}
+        self.enabled = enabled
+        self._buckets: Dict[RateKey, TokenBucket] = {}
+        self._active = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.calls = 0
+        self.queued_calls = 0
+        self.throttled_calls = 0
+        self.total_wait_sec = 0.0
+        self.max_wait_sec = 0.0
+        self.calls_by_key: Dict[str, int] = {}
+
+    @asynccontextmanager
+    async def slot(
+        self, provider: str, model: str, priority: int = PRIORITY_NORMAL
+    ) -> AsyncIterator[None]:
+        """
+        LLM 호출 1건 실행 권한 획득
+
+        Example:
+            >>> async with llm_scheduler.slot("openai", "gpt-5-nano", PRIORITY_HIGH):
+            ...     response = await chain.ainvoke(...)
+        """
+        if not self.enabled:
+            yield
+            return
+
+        self._check_loop()
+        enqueued_at = monotonic()
+        # 속도 제한 대기는 슬롯을 잡기 전에 끝내 대기 중인 호출이 동시 실행 슬롯을 차지하지 않도록 함
+        delay = self._bucket(provider, model).reserve()
+        if delay > 0:
+            self.throttled_calls += 1
+            await asyncio.sleep(delay)
+        await self._acquire(priority)
+        try:
+            self._record(f"{provider}:{model}", monotonic() - enqueued_at)
+            yield
+        finally:
+            self._release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active": self._active,
+            "queued": self.queue_depth(),
+            "max_concurrency": self.max_concurrency,
+            "calls": self.calls,
+            "queued_calls": self.queued_calls,
+            "throttled_calls": self.throttled_calls,
+            "avg_wait_sec": round(self.total_wait_sec / self.calls, 4) if self.calls else 0.0,
+            "max_wait_sec": round(self.max_wait_sec, 4),
+            "calls_by_model": dict(self.calls_by_key),
+        }
+
+    def queue_depth(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    def _bucket(self, provider: str, model: str) -> TokenBucket:
+        key = (provider, model)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            rate = self.rate_limits.get(f"{provider}:{model}", self.rate_per_sec)
+            bucket = TokenBucket(rate, self.burst)
+            self._buckets[key] = bucket
+        return bucket
+
+    async def _acquire(self, priority: int):
+        if self._active < self.max_concurrency and not self.queue_depth():
+            self._active += 1
+            return
+
+        self.queued_calls += 1
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # 슬롯을 넘겨받은 직후 취소되면 다음 대기자에게 반납
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+
+    def _release(self):
+        # 슬롯을 반납하지 않고 다음 대기자에게 그대로 넘김 (취소된 대기자는 건너뜀)
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._active -= 1
+
+    def _record(self, key: str, waited: float):
+        self.calls += 1
+        self.total_wait_sec += waited
+        self.max_wait_sec = max(self.max_wait_sec, waited)
+        self.calls_by_key[key] = self.calls_by_key.get(key, 0) + 1
+
+    def _check_loop(self):
+        current_loop = asyncio.get_running_loop()
+        if self._loop is not current_loop:
+            # 이전 루프의 대기자/실행 중 호출은 더 이상 진행되지 않으므로 초기화
+            self._active = 0
+            self._waiters = []
+            self._loop = current_loop
+
+
+llm_scheduler = LLMScheduler(
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    rate_per_sec=settings.LLM_RATE_PER_SEC,
+    burst=settings.LLM_RATE_BURST,
+    rate_limits=settings.LLM_RATE_LIMITS,
+    enabled=settings.LLM_SCHEDULER_ENABLED,
+)
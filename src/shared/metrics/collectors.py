@@ -0,0 +1,219 @@
+"""
+서비스 지표 정의 및 수집기
+
+- 그래프 노드 / LLM 호출: LangChain 전역 콜백(configure hook)으로 모든 실행에서 자동 수집
+  (요청마다 넘기는 Langfuse 콜백과 무관하게, 노드 내부에서 callbacks를 새로 지정한 LLM 호출도 포함)
+- Mongo 명령: pymongo CommandListener (클라이언트 생성 시 event_listeners로 등록)
+- HTTP 요청: FastAPI 미들웨어 (처리 중 요청 수, 라우트별 지연 시간)
+- LLM 스케줄러 / 중복 요청 병합 상태: /metrics 조회 시점의 현재값
+"""
+
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.tracers.context import register_configure_hook
+from pymongo import monitoring
+from src.shared.metrics.metrics_registry import SLOW_BUCKETS, metrics_registry
+
+HTTP_REQUESTS_IN_FLIGHT = metrics_registry.gauge(
+    "damo_http_requests_in_flight", "처리 중인 HTTP 요청 수"
+)
+HTTP_REQUEST_DURATION = metrics_registry.histogram(
+    "damo_http_request_duration_seconds", "HTTP 요청 처리 시간", ("method", "route", "status"), SLOW_BUCKETS
+)
+GRAPH_NODE_DURATION = metrics_registry.histogram(
+    "damo_graph_node_duration_seconds", "LangGraph 노드 실행 시간", ("node", "status"), SLOW_BUCKETS
+)
+LLM_CALL_DURATION = metrics_registry.histogram(
+    "damo_llm_call_duration_seconds", "LLM 호출 시간", ("provider", "model", "node", "status"), SLOW_BUCKETS
+)
+LLM_TOKENS = metrics_registry.counter(
+    "damo_llm_tokens_total", "LLM 사용 토큰 수", ("provider", "model", "node", "type")
+)
+MONGO_COMMAND_DURATION = metrics_registry.histogram(
+    "damo_mongo_command_duration_seconds", "MongoDB 명령 처리 시간", ("command", "collection", "status")
+)
+LLM_SCHEDULER_ACTIVE = metrics_registry.gauge(
+    "damo_llm_scheduler_active", "LLM 스케줄러에서 실행 중인 호출 수"
+)
+LLM_SCHEDULER_QUEUED = metrics_registry.gauge(
+    "damo_llm_scheduler_queued", "LLM 스케줄러 대기열 길이"
+)
+RECOMMENDATIONS_IN_FLIGHT = metrics_registry.gauge(
+    "damo_recommendations_in_flight", "실행 중인 추천 워크플로 수 (중복 요청 병합 후)"
+)
+
+# 노드 밖(페르소나 생성 등)에서 호출된 LLM의 node 레이블
+NO_NODE = "none"
+
+
+def own_node_run(metadata: Optional[Dict[str, Any]], run_name: Optional[str]) -> Optional[str]:
+    """LangGraph 노드 자체 실행이면 노드 이름, 아니면 None"""
+    node = (metadata or {}).get("langgraph_node")
+    # 노드 내부 체인(프롬프트 | LLM 등)도 같은 메타데이터를 물려받으므로 노드 자체 실행만 기록
+    if node and run_name == node:
+        return node
+    return None
+
+
+def llm_labels(metadata: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """LLM 실행 메타데이터에서 provider / model / node 추출"""
+    metadata = metadata or {}
+    return {
+        "provider": str(metadata.get("ls_provider") or "unknown"),
+        "model": str(metadata.get("ls_model_name") or "unknown"),
+        "node": str(metadata.get("langgraph_node") or NO_NODE),
+    }
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """그래프 노드 / LLM 호출 시간과 토큰 수 집계 (run_id 기준으로 시작 시각 보관)"""
+
+    run_inline = True
+
+    def __init__(self):
+        self._runs: Dict[UUID, Tuple[str, Dict[str, str], float]] = {}
+
+    # 그래프 노드
+    def on_chain_start(self, serialized, inputs, *, run_id: UUID, metadata: Optional[Dict[str, Any]] = None, **kwargs):
+        node = own_node_run(metadata, kwargs.get("name"))
+        if node:
+            self._runs[run_id] = ("node", {"node": node}, perf_counter())
+
+    def on_chain_end(self, outputs, *, run_id: UUID, **kwargs):
+        self._finish(run_id, "success")
+
+    def on_chain_error(self, error, *, run_id: UUID, **kwargs):
+        self._finish(run_id, "error")
+
+    # LLM
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, metadata: Optional[Dict[str, Any]] = None, **kwargs):
+        self._start_llm(run_id, metadata)
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, metadata: Optional[Dict[str, Any]] = None, **kwargs):
+        self._start_llm(run_id, metadata)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs):
+        labels = self._finish(run_id, "success")
+        if labels is None:
+            return
+        input_tokens, output_tokens = token_usage(response)
+        if input_tokens:
+            LLM_TOKENS.inc(input_tokens, type="input", **labels)
+        if output_tokens:
+            LLM_TOKENS.inc(output_tokens, type="output", **labels)
+
+    def on_llm_error(self, error, *, run_id: UUID, **kwargs):
+        self._finish(run_id, "error")
+
+    def _start_llm(self, run_id: UUID, metadata: Optional[Dict[str, Any]]):
+        self._runs[run_id] = ("llm", llm_labels(metadata), perf_counter())
+
+    def _finish(self, run_id: UUID, status: str) -> Optional[Dict[str, str]]:
+        entry = self._runs.pop(run_id, None)
+        if entry is None:
+            return None
+        kind, labels, started = entry
+        elapsed = perf_counter() - started
+        if kind == "node":
+            GRAPH_NODE_DURATION.observe(elapsed, status=status, **labels)
+        else:
+            LLM_CALL_DURATION.observe(elapsed, status=status, **labels)
+        return labels
+
+
+def token_usage(response: LLMResult) -> Tuple[int, int]:
+    """(입력 토큰, 출력 토큰) - 메시지 usage_metadata 우선, 없으면 llm_output.token_usage"""
+    input_tokens = output_tokens = 0
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                input_tokens += usage.get("input_tokens", 0)
+                output_tokens += usage.get("output_tokens", 0)
+    if not (input_tokens or output_tokens):
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        input_tokens = usage.get("prompt_tokens", 0)
+        output_tokens = usage.get("completion_tokens", 0)
+    return input_tokens, output_tokens
+
+
+class MongoMetricsListener(monitoring.CommandListener):
+    """Mongo 명령별 처리 시간 (드라이버가 측정한 duration_micros 사용)"""
+
+    def __init__(self):
+        self._collections: Dict[Tuple[Any, int], str] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent):
+        collection = event.command.get(event.command_name)
+        self._collections[(event.connection_id, event.request_id)] = (
+            collection if isinstance(collection, str) else ""
+        )
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent):
+        self._observe(event, "success")
+
+    def failed(self, event: monitoring.CommandFailedEvent):
+        self._observe(event, "error")
+
+    def _observe(self, event, status: str):
+        collection = self._collections.pop((event.connection_id, event.request_id), "")
+        MONGO_COMMAND_DURATION.observe(
+            event.duration_micros / 1_000_000,
+            command=event.command_name,
+            collection=collection,
+            status=status,
+        )
+
+
+metrics_callback_handler = MetricsCallbackHandler()
+mongo_metrics_listener = MongoMetricsListener()
+
+# 기본값이 설정된 ContextVar를 훅으로 등록하면 모든 LangChain 실행에 핸들러가 붙음
+_metrics_callback_var: Optional[ContextVar] = None
+
+
+def install_langchain_metrics():
+    """LangChain 전역 콜백 훅 등록 (앱 시작 시 1회)"""
+    global _metrics_callback_var
+    if _metrics_callback_var is not None:
+        return
+    _metrics_callback_var = ContextVar("damo_metrics_callback", default=metrics_callback_handler)
+    register_configure_hook(_metrics_callback_var, inheritable=True)
+
+
+def collect_runtime_gauges():
+    """/metrics 조회 시점의 LLM 스케줄러 / 중복 요청 병합 상태"""
+    from src.shared.llm.llm_scheduler import llm_scheduler
+    from src.shared.request_coalescer import request_coalescer
+
+    stats = llm_scheduler.stats()
+    LLM_SCHEDULER_ACTIVE.set(stats["active"])
+    LLM_SCHEDULER_QUEUED.set(stats["queued"])
+    RECOMMENDATIONS_IN_FLIGHT.set(request_coalescer.stats()["inflight"])
+
+
+metrics_registry.add_collector(collect_runtime_gauges)
+
+
+async def http_metrics_middleware(request, call_next):
+    """처리 중 요청 수와 라우트(경로 템플릿)별 처리 시간"""
+    HTTP_REQUESTS_IN_FLIGHT.inc()
+    started = perf_counter()
+    status = "500"
+    try:
+        response = await call_next(request)
+        status = str(response.status_code)
+        return response
+    finally:
+        HTTP_REQUESTS_IN_FLIGHT.dec()
+        route = request.scope.get("route")
+        HTTP_REQUEST_DURATION.observe(
+            perf_counter() - started,
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=status,
+        )
@@ -0,0 +1,257 @@
+"""
+요청 단위 실행 시간 기록 (timing ledger)
+
+추천 요청 하나에서 실행된 그래프 노드 / LLM 호출 / Mongo 명령의 시작·종료 시각, 소요 시간,
+시도 횟수, 토큰 수를 구조화해 모읍니다. 결과는 RecommendationState.timing_ledger를 거쳐
+dining_sessions.timingLedger에 저장되고, 디버그 헤더(Server-Timing)로도 돌려줄 수 있습니다.
+
+- 노드 / LLM: LangChain 전역 콜백 훅 (install_timing_ledger, 노드 내부에서 callbacks를 새로 지정한 LLM 호출도 포함)
+- Mongo: pymongo CommandListener (Motor가 실행 스레드로 contextvars를 복사하므로 요청 구분 가능)
+두 경로 모두 현재 요청의 ledger를 담은 ContextVar로 활성화됩니다.
+"""
+
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from time import perf_counter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.runnables.config import var_child_runnable_config
+from langchain_core.tracers.context import register_configure_hook
+from pymongo import monitoring
+from src.shared.metrics.collectors import NO_NODE, llm_labels, own_node_run, token_usage
+
+
+def node_path(checkpoint_ns: str) -> str:
+    """"restaurant_filtering:<id>|distance_node:<id>" -> "restaurant_filtering/distance_node" """
+    return "/".join(segment.split(":")[0] for segment in checkpoint_ns.split("|") if segment)
+
+
+class TimingLedger(BaseCallbackHandler):
+    """
+    요청 하나의 실행 시간 기록
+
+    항목(entry) 형식 (dining_sessions 필드 규칙에 맞춰 camelCase)
+    - type: "node" / "llm" / "db"
+    - name: 노드 이름 / 모델 이름 / Mongo 명령 이름
+    - node: 실행 위치 (서브 그래프 포함 경로, 예: restaurant_filtering/allergy_node)
+    - start / end: ISO 시각, durationMs: 소요 시간
+    - attempt: 같은 (type, node, name)이 요청 안에서 몇 번째 실행인지 (재시도/반복 구분)
+    - status: "success" / "error"
+    - tokensIn / tokensOut: LLM 토큰 수 (노드 항목은 하위 LLM 호출 합계)
+    """
+
+    run_inline = True
+
+    def __init__(self, max_entries: int = 500):
+        self.max_entries = max_entries
+        self.started_at = datetime.now()
+        self._started = perf_counter()
+        self.entries: List[Dict[str, Any]] = []
+        self.dropped = 0
+        self._open: Dict[Any, Dict[str, Any]] = {}
+        # 실행 중인 노드 (checkpoint_ns -> 항목), LLM 토큰을 노드 항목에 합산할 때 사용
+        self._open_nodes: Dict[str, Dict[str, Any]] = {}
+        self._attempts: Counter = Counter()
+        # Mongo 리스너는 드라이버 스레드에서 호출됨
+        self._lock = threading.Lock()
+
+    # --- 공통 ---
+    def _begin(self, key: Any, entry_type: str, name: str, node: str, **extra: Any) -> Dict[str, Any]:
+        with self._lock:
+            self._attempts[(entry_type, node, name)] += 1
+            entry = {
+                "type": entry_type,
+                "name": name,
+                "node": node,
+                "start": datetime.now().isoformat(),
+                "attempt": self._attempts[(entry_type, node, name)],
+                **extra,
+                "_t0": perf_counter(),
+            }
+            self._open[key] = entry
+        return entry
+
+    def _end(self, key: Any, status: str, duration_ms: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._open.pop(key, None)
+            if entry is None:
+                return None
+            started = entry.pop("_t0")
+            elapsed = duration_ms if duration_ms is not None else (perf_counter() - started) * 1000
+            entry["end"] = datetime.now().isoformat()
+            entry["durationMs"] = round(elapsed, 2)
+            entry["status"] = status
+            if len(self.entries) < self.max_entries:
+                self.entries.append(entry)
+            else:
+                self.dropped += 1
+        return entry
+
+    # --- 그래프 노드 ---
+    def on_chain_start(self, serialized, inputs, *, run_id: UUID, metadata: Optional[Dict[str, Any]] = None, **kwargs):
+        node = own_node_run(metadata, kwargs.get("name"))
+        if not node:
+            return
+        checkpoint_ns = metadata.get("langgraph_checkpoint_ns") or node
+        self._open_nodes[checkpoint_ns] = self._begin(
+            run_id, "node", node, node_path(checkpoint_ns), tokensIn=0, tokensOut=0, _checkpoint_ns=checkpoint_ns
+        )
+
+    def on_chain_end(self, outputs, *, run_id: UUID, **kwargs):
+        self._end_node(run_id, "success")
+
+    def on_chain_error(self, error, *, run_id: UUID, **kwargs):
+        self._end_node(run_id, "error")
+
+    def _end_node(self, run_id: UUID, status: str):
+        entry = self._end(run_id, status)
+        if entry is not None:
+            self._open_nodes.pop(entry.pop("_checkpoint_ns"), None)
+
+    # --- LLM ---
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, metadata: Optional[Dict[str, Any]] = None, **kwargs):
+        self._start_llm(run_id, metadata)
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, metadata: Optional[Dict[str, Any]] = None, **kwargs):
+        self._start_llm(run_id, metadata)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs):
+        entry = self._end(run_id, "success")
+        if entry is None:
+            return
+        tokens_in, tokens_out = token_usage(response)
+        entry["tokensIn"], entry["tokensOut"] = tokens_in, tokens_out
+        parent = self._open_nodes.get(entry.pop("_checkpoint_ns", None))
+        if parent is not None:
+            parent["tokensIn"] += tokens_in
+            parent["tokensOut"] += tokens_out
+
+    def on_llm_error(self, error, *, run_id: UUID, **kwargs):
+        entry = self._end(run_id, "error")
+        if entry is not None:
+            entry.pop("_checkpoint_ns", None)
+
+    def _start_llm(self, run_id: UUID, metadata: Optional[Dict[str, Any]]):
+        labels = llm_labels(metadata)
+        # 서브 그래프 안의 노드도 구분하도록 node는 langgraph_node 대신 전체 경로 사용
+        checkpoint_ns = (metadata or {}).get("langgraph_checkpoint_ns")
+        self._begin(
+            run_id,
+            "llm",
+            labels["model"],
+            node_path(checkpoint_ns) if checkpoint_ns else NO_NODE,
+            provider=labels["provider"],
+            tokensIn=0,
+            tokensOut=0,
+            _checkpoint_ns=checkpoint_ns,
+        )
+
+    # --- Mongo ---
+    def db_started(self, key: Tuple[Any, int], command_name: str, collection: str):
+        config = var_child_runnable_config.get() or {}
+        checkpoint_ns = (config.get("metadata") or {}).get("langgraph_checkpoint_ns")
+        self._begin(
+            key, "db", command_name, node_path(checkpoint_ns) if checkpoint_ns else NO_NODE, collection=collection
+        )
+
+    def db_finished(self, key: Tuple[Any, int], status: str, duration_ms: float):
+        self._end(key, status, duration_ms)
+
+    # --- 결과 ---
+    def to_record(self) -> Dict[str, Any]:
+        """dining_sessions.timingLedger에 추가할 요청 단위 기록"""
+        with self._lock:
+            entries = sorted(self.entries, key=lambda e: e["start"])
+        return {
+            "startedAt": self.started_at.isoformat(),
+            "totalMs": round((perf_counter() - self._started) * 1000, 2),
+            "entries": entries,
+            "droppedEntries": self.dropped,
+        }
+
+
+_current_ledger: ContextVar[Optional[TimingLedger]] = ContextVar("damo_timing_ledger", default=None)
+_ledger_hook_installed = False
+
+
+def install_timing_ledger():
+    """LangChain 전역 콜백 훅 등록 (앱 시작 시 1회, 현재 요청의 ledger가 설정된 동안 모든 실행에 콜백으로 붙음)"""
+    global _ledger_hook_installed
+    if _ledger_hook_installed:
+        return
+    register_configure_hook(_current_ledger, inheritable=True)
+    _ledger_hook_installed = True
+
+
+def get_current_ledger() -> Optional[TimingLedger]:
+    return _current_ledger.get()
+
+
+@contextmanager
+def timing_ledger_scope(ledger: Optional[TimingLedger]) -> Iterator[Optional[TimingLedger]]:
+    """블록 안(하위 태스크 포함)에서 실행되는 노드/LLM/Mongo 명령을 ledger에 기록"""
+    token = _current_ledger.set(ledger)
+    try:
+        yield ledger
+    finally:
+        _current_ledger.reset(token)
+
+
+class LedgerMongoListener(monitoring.CommandListener):
+    """현재 요청의 ledger가 있으면 Mongo 명령을 기록 (하트비트 등 요청 밖 명령은 무시)"""
+
+    def started(self, event: monitoring.CommandStartedEvent):
+        ledger = _current_ledger.get()
+        if ledger is None:
+            return
+        collection = event.command.get(event.command_name)
+        ledger.db_started(
+            (event.connection_id, event.request_id),
+            event.command_name,
+            collection if isinstance(collection, str) else "",
+        )
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent):
+        self._finish(event, "success")
+
+    def failed(self, event: monitoring.CommandFailedEvent):
+        self._finish(event, "error")
+
+    def _finish(self, event, status: str):
+        ledger = _current_ledger.get()
+        if ledger is not None:
+            ledger.db_finished((event.connection_id, event.request_id), status, event.duration_micros / 1000)
+
+
+ledger_mongo_listener = LedgerMongoListener()
+
+
+def server_timing_header(record: Optional[Dict[str, Any]]) -> str:
+    """
+    Server-Timing 헤더 값 (최상위 노드별 합계 + LLM / DB 합계 + 전체)
+    예: restaurant_filtering;dur=812.3, iterative_discussion;dur=2411.0, llm;dur=2950.1;desc="9 calls", total;dur=3301.2
+    """
+    if not record:
+        return ""
+    node_totals: Dict[str, float] = {}
+    type_totals = {"llm": [0.0, 0], "db": [0.0, 0]}
+    for entry in record.get("entries", []):
+        if entry["type"] == "node":
+            if "/" not in entry["node"]:
+                node_totals[entry["name"]] = node_totals.get(entry["name"], 0.0) + entry["durationMs"]
+        else:
+            type_totals[entry["type"]][0] += entry["durationMs"]
+            type_totals[entry["type"]][1] += 1
+
+    metrics = [f"{name};dur={total:.1f}" for name, total in node_totals.items()]
+    for entry_type, label in (("llm", "calls"), ("db", "ops")):
+        total, count = type_totals[entry_type]
+        if count:
+            metrics.append(f'{entry_type};dur={total:.1f};desc="{count} {label}"')
+    metrics.append(f"total;dur={record.get('totalMs', 0.0):.1f}")
+    return ", ".join(metrics)
@@ -0,0 +1,161 @@
+import asyncio
+import hashlib
+from collections import OrderedDict
+from datetime import datetime
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from pydantic import BaseModel
+from src.core.config import settings
+from src.shared.database import get_db
+
+IDEMPOTENCY_COLLECTION = "idempotent_responses"
+
+
+def make_request_key(phase: str, request: BaseModel) -> str:
+    """
+    dining_id + 단계(API 이름) + 요청 본문 해시로 중복 요청 키 생성
+    투표 결과가 바뀐 재추천은 본문 해시가 달라 별도 요청으로 처리됩니다.
+    """
+    body = request.model_dump_json(by_alias=True)
+    body_hash = hashlib.sha1(body.encode("utf-8")).hexdigest()
+    dining_id = getattr(getattr(request, "dining_data", None), "dining_id", None)
+    return f"{dining_id}|{phase}|{body_hash}"
+
+
+def make_idempotency_key(phase: str, request: BaseModel, idempotency_key: Optional[str]) -> Optional[str]:
+    """
+    Idempotency-Key 헤더 값을 단계(API 이름) + dining_id 범위로 한정
+    같은 헤더 값을 다른 API나 다른 dining_id에 재사용해도 이전 응답이 반환되지 않습니다.
+    """
+    if not idempotency_key:
+        return None
+    dining_id = getattr(getattr(request, "dining_data", None), "dining_id", None)
+    return f"{phase}|{dining_id}|{idempotency_key}"
+
+
+class RequestCoalescer:
+    """
+    같은 요청의 동시 실행을 하나로 합치는 single-flight 실행기
+
+    - 같은 키로 진행 중인 작업이 있으면 새로 실행하지 않고 그 결과를 함께 기다립니다.
+    - 작업은 호출자와 분리된 태스크로 실행되어, 먼저 온 요청이 타임아웃/연결 종료로
+      끊겨도 계속 진행되고 재시도 요청이 이어서 결과를 받습니다. (max_run_sec에서 중단)
+    - idempotency_key를 주면 완료된 응답을 저장해 두었다가 같은 키의 요청에 그대로 반환합니다.
+      (인메모리 LRU + Mongo idempotent_responses 컬렉션)
+    """
+
+    def __init__(
+        self,
+        max_run_sec: float = 360.0,
+        idempotency_ttl_sec: int = 86400,
+        max_entries: int = 1024,
+        collection_name: str = IDEMPOTENCY_COLLECTION,
+    ):
+        self.max_run_sec = max_run_sec
+        self.idempotency_ttl_sec = idempotency_ttl_sec
+        self.max_entries = max_entries
+        self.collection_name = collection_name
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._responses: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.started = 0
+        self.coalesced = 0
+        self.replayed = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "inflight": len(self._inflight),
+            "started": self.started,
+            "coalesced": self.coalesced,
+            "replayed": self.replayed,
+        }
+
+    async def run(
+        self,
+        key: str,
+        job: Callable[[], Awaitable[BaseModel]],
+        response_model: type,
+        timeout: Optional[float] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> BaseModel:
+        """
+        키 단위로 합쳐서 job 실행 후 결과 반환
+
+        Args:
+            key: 중복 판단 키 (make_request_key)
+            job: 실제 처리 함수 (워크플로 실행 + 세션 저장 + 응답 생성)
+            response_model: 저장된 응답을 복원할 모델
+            timeout: 이 호출자가 기다릴 최대 시간 (초과 시 TimeoutError, 작업은 계속 진행)
+            idempotency_key: 지정하면 완료된 응답을 저장하고 재사용 (make_idempotency_key로 범위 한정)
+        """
+        if idempotency_key:
+            stored = await self._load_response(idempotency_key)
+            if stored is not None:
+                self.replayed += 1
+                return response_model.model_validate(stored)
+            # 같은 멱등 키의 요청은 본문이 달라도 하나로 합침
+            key = f"idempotency|{idempotency_key}"
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.started += 1
+            task = asyncio.create_task(self._execute(key, job, idempotency_key))
+            self._inflight[key] = task
+        else:
+            self.coalesced += 1
+
+        # 호출자가 취소/타임아웃되어도 공유 작업은 취소되지 않도록 shield
+        return await asyncio.wait_for(asyncio.shield(task), timeout)
+
+    async def _execute(
+        self, key: str, job: Callable[[], Awaitable[BaseModel]], idempotency_key: Optional[str]
+    ) -> BaseModel:
+        try:
+            response = await asyncio.wait_for(job(), self.max_run_sec)
+            if idempotency_key:
+                await self._store_response(idempotency_key, response.model_dump(by_alias=True))
+            return response
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _load_response(self, idempotency_key: str) -> Optional[Dict[str, Any]]:
+        entry = self._responses.get(idempotency_key)
+        if entry is not None:
+            expires_at, response = entry
+            if expires_at >= monotonic():
+                self._responses.move_to_end(idempotency_key)
+                return response
+            del self._responses[idempotency_key]
+        try:
+            doc = await get_db()[self.collection_name].find_one({"_id": idempotency_key})
+        except Exception as e:
+            # 조회 실패 시 새로 처리
+            print(f"멱등 응답 조회 실패: {e}")
+            return None
+        if doc is None:
+            return None
+        self._put(idempotency_key, doc["response"])
+        return doc["response"]
+
+    async def _store_response(self, idempotency_key: str, response: Dict[str, Any]):
+        self._put(idempotency_key, response)
+        try:
+            await get_db()[self.collection_name].update_one(
+                {"_id": idempotency_key},
+                {"$set": {"response": response, "createdAt": datetime.now()}},
+                upsert=True,
+            )
+        except Exception as e:
+            # 저장 실패해도 이번 응답은 그대로 반환
+            print(f"멱등 응답 저장 실패: {e}")
+
+    def _put(self, idempotency_key: str, response: Dict[str, Any]):
+        self._responses[idempotency_key] = (monotonic() + self.idempotency_ttl_sec, response)
+        self._responses.move_to_end(idempotency_key)
+        while len(self._responses) > self.max_entries:
+            self._responses.popitem(last=False)
+
+
+request_coalescer = RequestCoalescer(
+    max_run_sec=settings.RECOMMENDATION_MAX_RUN_SEC,
+    idempotency_ttl_sec=settings.IDEMPOTENCY_TTL_SEC,
+)
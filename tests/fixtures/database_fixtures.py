@@ -0,0 +1,63 @@
+"""MongoDB 테스트 헬퍼 (명령 수 집계)"""
+
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict
+from unittest.mock import patch
+from pymongo import monitoring
+from src.shared import database
+
+
+class MongoCommandCounter(monitoring.CommandListener):
+    """
+    드라이버가 서버로 보낸 명령 수 집계 (find / aggregate / getMore / update ... = Mongo 왕복 횟수)
+
+    전역으로 등록하지 않고 count_mongo_commands() 안에서 새로 만든 클라이언트에만
+    event_listeners로 붙여, 측정과 무관한 테스트의 클라이언트에는 영향을 주지 않습니다.
+    """
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+
+    def started(self, event: monitoring.CommandStartedEvent):
+        self.counts[event.command_name] += 1
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent):
+        pass
+
+    def failed(self, event: monitoring.CommandFailedEvent):
+        pass
+
+    def reset(self):
+        self.counts.clear()
+
+    def snapshot(self) -> Dict[str, int]:
+        return dict(self.counts)
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+
+mongo_command_counter = MongoCommandCounter()
+
+
+@asynccontextmanager
+async def count_mongo_commands() -> AsyncIterator[MongoCommandCounter]:
+    """
+    명령 수 집계 리스너를 붙인 공용 클라이언트로 다시 연결
+    (블록을 벗어나면 클라이언트를 닫아 이후 테스트는 리스너 없는 클라이언트를 사용)
+    """
+    client_options = database._client_options
+
+    def counted_client_options() -> dict:
+        options = client_options()
+        options["event_listeners"] = [*options.get("event_listeners", []), mongo_command_counter]
+        return options
+
+    await database.close_mongo_connection()
+    with patch.object(database, "_client_options", counted_client_options):
+        try:
+            yield mongo_command_counter
+        finally:
+            await database.close_mongo_connection()
@@ -0,0 +1,43 @@
+"""LLM 테스트 헬퍼 (synthetic 백엔드 전환, 호출 수 집계)"""
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict
+from unittest.mock import patch
+from src.core.config import settings
+from src.shared.llm.llm_client import llm_registry
+from src.shared.llm.llm_scheduler import llm_scheduler
+
+
+@asynccontextmanager
+async def synthetic_llm(
+    latency_ms: float = 300.0,
+    latency_dist: str = "lognormal",
+    latency_spread: float = 0.5,
+    safe_ratio: float = 0.8,
+) -> AsyncIterator[None]:
+    """
+    블록 안에서 생성되는 모든 LLM을 synthetic 백엔드로 교체 (네트워크/비용 없이 지연 시간만 재현)
+    """
+    overrides = {
+        "LLM_BACKEND": "synthetic",
+        "LLM_SYNTHETIC_LATENCY_MS": latency_ms,
+        "LLM_SYNTHETIC_LATENCY_DIST": latency_dist,
+        "LLM_SYNTHETIC_LATENCY_SPREAD": latency_spread,
+        "LLM_SYNTHETIC_SAFE_RATIO": safe_ratio,
+    }
+    with patch.multiple(settings, **overrides):
+        # 이미 만들어진 live 인스턴스를 버리고 새 설정으로 생성
+        await llm_registry.aclose()
+        try:
+            yield
+        finally:
+            await llm_registry.aclose()
+
+
+def llm_call_counts() -> Dict[str, int]:
+    """지금까지 스케줄러를 거친 provider:model별 LLM 호출 수"""
+    return dict(llm_scheduler.calls_by_key)
+
+
+def diff_counts(after: Dict[str, int], before: Dict[str, int]) -> Dict[str, int]:
+    return {key: after[key] - before.get(key, 0) for key in after if after[key] != before.get(key, 0)}
@@ -0,0 +1,187 @@
+"""추천 API 벤치마크/부하 테스트 헬퍼 (요청 페이로드, 시드 데이터, 노드별 시간 측정, 인프로세스 앱)"""
+
+import random
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from time import perf_counter
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+import httpx
+import numpy as np
+from langchain_core.callbacks import BaseCallbackHandler
+from unittest.mock import patch
+from src.recommendation.enums.user_enums import AllergyType
+from src.recommendation.router import routes_v1
+from src.shared.database import get_db
+from tests.fixtures.database_fixtures import count_mongo_commands
+from tests.fixtures.restaurant_corpus import generate_restaurant_corpus
+
+# 요청 예시 좌표 (경도, 위도)
+CENTER: Tuple[float, float] = (127.1111, 37.3947)
+
+
+def latency_summary(values_ms: Sequence[float]) -> Dict[str, float]:
+    """지연 시간 분포 요약 (ms)"""
+    if not values_ms:
+        return {"count": 0}
+    p50, p95, p99 = np.percentile(values_ms, [50, 95, 99])
+    return {
+        "count": len(values_ms),
+        "mean": round(float(np.mean(values_ms)), 2),
+        "p50": round(float(p50), 2),
+        "p95": round(float(p95), 2),
+        "p99": round(float(p99), 2),
+        "max": round(float(np.max(values_ms)), 2),
+    }
+
+
+class NodeTimer(BaseCallbackHandler):
+    """LangGraph 노드별 실행 시간 집계 (서브 그래프 노드 포함, 노드 이름 -> ms 목록)"""
+
+    run_inline = True
+
+    def __init__(self):
+        self.durations: Dict[str, List[float]] = defaultdict(list)
+        self._starts: Dict[UUID, Tuple[str, float]] = {}
+
+    def on_chain_start(self, serialized, inputs, *, run_id: UUID, metadata: Optional[Dict[str, Any]] = None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        # 노드 내부 체인(프롬프트 | LLM 등)도 같은 메타데이터를 물려받으므로 노드 자체 실행만 기록
+        if node and kwargs.get("name") == node:
+            self._starts[run_id] = (node, perf_counter())
+
+    def on_chain_end(self, outputs, *, run_id: UUID, **kwargs):
+        self._finish(run_id)
+
+    def on_chain_error(self, error, *, run_id: UUID, **kwargs):
+        self._finish(run_id)
+
+    def _finish(self, run_id: UUID):
+        entry = self._starts.pop(run_id, None)
+        if entry is not None:
+            node, started = entry
+            self.durations[node].append((perf_counter() - started) * 1000)
+
+    def reset(self):
+        self.durations.clear()
+        self._starts.clear()
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {node: latency_summary(values) for node, values in sorted(self.durations.items())}
+
+
+def make_dining_data(
+    dining_id: int, budget: int = 100000, x: float = CENTER[0], y: float = CENTER[1], groups_id: int = 1
+) -> Dict[str, Any]:
+    return {
+        "diningId": dining_id,
+        "groupsId": groups_id,
+        "diningDate": "2025-01-29T19:00:00",
+        "budget": budget,
+        "x": f"{x:.6f}",
+        "y": f"{y:.6f}",
+    }
+
+
+def make_recommendation_payload(
+    dining_id: int,
+    user_ids: List[int],
+    budget: int = 100000,
+    x: float = CENTER[0],
+    y: float = CENTER[1],
+    vote_result_list: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """/recommendations, /analyze_refresh 요청 본문 (camelCase)"""
+    payload = {
+        "diningData": make_dining_data(dining_id, budget, x, y),
+        "userIds": user_ids,
+    }
+    if vote_result_list is not None:
+        payload["voteResultList"] = vote_result_list
+    return payload
+
+
+def make_vote_results(restaurant_ids: List[str], user_ids: List[int], rng: random.Random) -> List[Dict[str, Any]]:
+    """추천 결과에 대한 무작위 좋아요/싫어요 투표"""
+    results = []
+    for restaurant_id in restaurant_ids:
+        liked = [uid for uid in user_ids if rng.random() < 0.5]
+        disliked = [uid for uid in user_ids if uid not in liked]
+        results.append({
+            "restaurantId": restaurant_id,
+            "likeCount": len(liked),
+            "dislikeCount": len(disliked),
+            "likedUserIds": liked,
+            "dislikedUserIds": disliked,
+        })
+    return results
+
+
+def make_fix_payload(dining_id: int, restaurant_id: str, vote_result_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """/restaurant_fix 요청 본문"""
+    return {
+        "diningData": make_dining_data(dining_id),
+        "restaurantId": restaurant_id,
+        "voteResultList": vote_result_list,
+    }
+
+
+def make_user_docs(user_ids: List[int], rng: random.Random) -> List[Dict[str, Any]]:
+    """users 컬렉션 문서 (알러지는 약 30% 확률로 1개)"""
+    allergy_types = [a.value for a in AllergyType]
+    return [
+        {
+            "id": uid,
+            "nickname": f"사용자{uid}",
+            "gender": rng.choice(["MALE", "FEMALE"]),
+            "ageGroup": rng.choice(["TWENTIES", "THIRTIES", "FORTIES"]),
+            "allergies": [rng.choice(allergy_types)] if rng.random() < 0.3 else [],
+            "likeFoods": rng.sample(["KOREAN", "JAPANESE", "CHINESE", "WESTERN"], 2),
+            "likeIngredients": [],
+            "otherCharacteristics": "",
+            "reviews": [],
+            "basePersona": f"사용자{uid}은(는) 매운 음식과 고기 요리를 좋아합니다.",
+        }
+        for uid in user_ids
+    ]
+
+
+def make_restaurant_docs(
+    count: int,
+    center: Tuple[float, float] = CENTER,
+    rng: Optional[random.Random] = None,
+    radius_m: float = 900,
+    id_prefix: str = "bench",
+) -> List[Dict[str, Any]]:
+    """중심 좌표 반경 안의 합성 식당 문서 (restaurant_corpus 생성기 사용)"""
+    return generate_restaurant_corpus(count, center, rng, radius_m=radius_m, id_prefix=id_prefix)
+
+
+async def seed_recommendation_data(
+    user_ids: List[int],
+    restaurants: List[Dict[str, Any]],
+) -> None:
+    """users / restaurants 컬렉션 시드 (지리 인덱스 포함)"""
+    db = get_db()
+    if user_ids:
+        await db["users"].insert_many(make_user_docs(user_ids, random.Random(0)))
+    if restaurants:
+        await db["restaurants"].create_index([("location", "2dsphere")])
+        await db["restaurants"].insert_many(restaurants)
+
+
+@asynccontextmanager
+async def recommendation_app(node_timer: Optional[NodeTimer] = None) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    FastAPI 앱을 lifespan까지 포함해 프로세스 안에서 실행하고 httpx 클라이언트 반환
+    (Langfuse 콜백 대신 node_timer를 요청 콜백으로 사용)
+    """
+    from main import app, lifespan
+
+    with patch.object(routes_v1, "get_langfuse_callback", return_value=node_timer or NodeTimer()), \
+            patch.object(routes_v1, "flush_langfuse"):
+        # 이벤트 리스너(Mongo 명령 수 집계)가 적용된 새 클라이언트로 연결
+        async with count_mongo_commands(), lifespan(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+                yield client
@@ -0,0 +1,246 @@
+"""
+restaurants 컬렉션 합성 데이터 생성기 (벤치마크/부하 테스트용)
+
+서울 상권과 비슷한 밀도와 분포를 흉내 냅니다.
+- 위치: 먹자골목/역세권 같은 밀집 구역(가우시안 클러스터) + 주변 주택가(균일 분포), location GeoJSON 포함
+- 업종: 한식/중식/일식/양식/분식/치킨/고기/술집/카페 비율과 업종별 실제 메뉴, 가격대
+- 메뉴: 메인/사이드/음료 구성과 재료 설명 (알러지 키워드 스캔, 예산 점수 계산 대상)
+
+같은 seed와 인자는 항상 같은 문서 목록을 생성합니다.
+"""
+
+import math
+import random
+from typing import Any, Dict, List, Optional, Tuple
+from src.recommendation.features.restaurant_filtering.allergen_matcher import get_allergen_matcher, menus_hash
+from src.recommendation.features.restaurant_filtering.allergen_tagging import summarize_allergens, tag_menus
+from src.recommendation.features.restaurant_filtering.price_features import compute_price_features
+
+# 식당 밀도 (개/km²): 강남역·홍대 등 핵심 상권 ~ 외곽 주거지역
+DENSITY_PER_KM2 = {"core": 3000, "urban": 1200, "residential": 300}
+
+# 밀집 구역 클러스터에 속하는 식당 비율
+CLUSTER_RATIO = 0.7
+
+# 업종별 (가중치, 카테고리 상세, 메인 메뉴, 사이드 메뉴)
+# 메뉴: (이름, 가격 범위(원), 재료 설명)
+CATEGORIES: Dict[str, Tuple[int, str, List[Tuple[str, Tuple[int, int], str]], List[Tuple[str, Tuple[int, int], str]]]] = {
+    "한식": (25, "음식점 > 한식", [
+        ("김치찌개", (8000, 10000), "돼지고기, 묵은지, 두부"),
+        ("된장찌개", (8000, 9500), "두부, 애호박, 바지락"),
+        ("제육볶음", (9000, 11000), "돼지고기, 고추장, 양파"),
+        ("순두부찌개", (8500, 10000), "순두부, 바지락, 달걀"),
+        ("비빔밥", (9000, 12000), "나물, 달걀, 고추장"),
+        ("갈비탕", (12000, 16000), "소갈비, 당면, 대파"),
+        ("불고기 정식", (11000, 14000), "소고기, 간장 양념"),
+        ("고등어구이 정식", (10000, 13000), "고등어, 공기밥"),
+    ], [
+        ("계란말이", (5000, 8000), "달걀, 대파"),
+        ("해물파전", (13000, 18000), "밀가루, 새우, 오징어"),
+        ("공기밥", (1000, 2000), ""),
+    ]),
+    "중식": (12, "음식점 > 중식 > 중화요리", [
+        ("짜장면", (7000, 9000), "춘장, 돼지고기, 밀면"),
+        ("짬뽕", (8000, 11000), "오징어, 홍합, 새우"),
+        ("볶음밥", (8000, 10000), "달걀, 새우, 쌀"),
+        ("마파두부밥", (9000, 11000), "두부, 돼지고기"),
+        ("탕수육", (16000, 25000), "돼지고기, 전분"),
+        ("깐풍기", (20000, 28000), "닭고기, 땅콩"),
+    ], [
+        ("군만두", (5000, 7000), "돼지고기, 밀가루"),
+        ("계란탕", (4000, 6000), "달걀"),
+    ]),
+    "일식": (10, "음식점 > 일식 > 초밥,롤", [
+        ("연어덮밥", (12000, 16000), "연어, 쌀, 간장"),
+        ("모둠초밥", (15000, 25000), "광어, 연어, 새우"),
+        ("돈카츠", (10000, 14000), "돼지고기, 빵가루, 달걀"),
+        ("우동", (8000, 11000), "밀면, 어묵"),
+        ("규동", (9000, 12000), "소고기, 양파"),
+    ], [
+        ("미소된장국", (2000, 3000), "된장, 두부"),
+        ("새우튀김", (6000, 9000), "새우, 밀가루"),
+        ("타코야끼", (5000, 7000), "문어, 밀가루"),
+    ]),
+    "양식": (8, "음식점 > 양식 > 이탈리안", [
+        ("까르보나라", (14000, 19000), "베이컨, 달걀, 생크림, 치즈"),
+        ("토마토 파스타", (13000, 17000), "토마토, 마늘"),
+        ("마르게리따 피자", (17000, 24000), "밀가루, 모짜렐라 치즈, 토마토"),
+        ("안심 스테이크", (28000, 42000), "소고기"),
+        ("리조또", (15000, 19000), "쌀, 버섯, 치즈"),
+    ], [
+        ("시저 샐러드", (9000, 13000), "로메인, 치즈, 달걀"),
+        ("감자튀김", (6000, 8000), "감자"),
+        ("마늘빵", (4000, 6000), "밀가루, 버터"),
+    ]),
+    "분식": (12, "음식점 > 분식", [
+        ("김밥", (3500, 5500), "쌀, 달걀, 햄, 단무지"),
+        ("라볶이", (6000, 8000), "라면, 떡, 어묵"),
+        ("돈까스", (8000, 10000), "돼지고기, 빵가루"),
+        ("잔치국수", (6000, 8000), "밀면, 멸치 육수"),
+        ("오므라이스", (8000, 9500), "달걀, 쌀, 케첩"),
+    ], [
+        ("떡볶이", (4000, 6000), "떡, 어묵, 고추장"),
+        ("튀김 모둠", (4000, 6000), "새우, 오징어, 밀가루"),
+        ("순대", (4000, 6000), "돼지 부산물"),
+    ]),
+    "치킨": (10, "음식점 > 치킨", [
+        ("후라이드치킨", (18000, 22000), "닭고기, 밀가루"),
+        ("양념치킨", (19000, 23000), "닭고기, 고추장 양념, 땅콩"),
+        ("간장치킨", (19000, 23000), "닭고기, 간장"),
+    ], [
+        ("치즈볼", (4000, 6000), "치즈, 찹쌀"),
+        ("감자튀김", (4000, 6000), "감자"),
+    ]),
+    "고기": (13, "음식점 > 한식 > 육류,고기", [
+        ("삼겹살", (14000, 18000), "국내산 돼지고기"),
+        ("목살", (14000, 18000), "국내산 돼지고기"),
+        ("소갈비살", (25000, 35000), "소고기"),
+        ("양념갈비", (16000, 22000), "돼지갈비, 간장 양념"),
+    ], [
+        ("된장찌개", (3000, 5000), "두부, 된장"),
+        ("냉면", (6000, 8000), "메밀면, 육수"),
+        ("계란찜", (4000, 5000), "달걀"),
+        ("공기밥", (1000, 2000), ""),
+    ]),
+    "술집": (7, "음식점 > 술집 > 요리주점", [
+        ("모둠전", (18000, 24000), "달걀, 밀가루, 동태"),
+        ("오징어볶음", (16000, 20000), "오징어, 고추장"),
+        ("닭볶음탕", (22000, 28000), "닭고기, 감자"),
+        ("골뱅이무침", (16000, 20000), "골뱅이, 소면"),
+    ], [
+        ("감자전", (9000, 12000), "감자"),
+        ("마른안주", (9000, 13000), "땅콩, 쥐포"),
+    ]),
+    "카페": (3, "음식점 > 카페 > 브런치", [
+        ("에그 베네딕트", (13000, 17000), "달걀, 베이컨, 잉글리시 머핀"),
+        ("프렌치토스트", (11000, 14000), "식빵, 달걀, 우유"),
+    ], [
+        ("크로플", (5000, 7000), "크루아상 생지, 버터"),
+        ("치즈케이크", (6000, 8000), "크림치즈, 밀가루"),
+    ]),
+}
+
+DRINKS = [("콜라", (2000, 3000)), ("사이다", (2000, 3000)), ("소주", (5000, 6000)), ("맥주", (5000, 7000)), ("하이볼", (7000, 9000))]
+CAFE_DRINKS = [("아메리카노", (4500, 5500)), ("카페라떼", (5000, 6000)), ("자몽에이드", (6000, 7000))]
+REVIEW_KEYWORDS = ["음식이 맛있어요", "친절해요", "가성비가 좋아요", "양이 많아요", "단체모임 하기 좋아요", "매장이 넓어요", "재료가 신선해요", "분위기가 좋아요"]
+NAME_SUFFIXES = ["본점", "역점", "2호점", "직영점", ""]
+
+# 위도 1도 ≒ 110,540m, 경도 1도 ≒ 111,320m * cos(위도)
+_M_PER_DEG_LAT = 110540
+
+
+def radius_for_density(count: int, density_per_km2: float = DENSITY_PER_KM2["core"]) -> float:
+    """count개 식당이 주어진 밀도로 분포할 때의 반경 (m)"""
+    return math.sqrt(count / (density_per_km2 * math.pi)) * 1000
+
+
+def _price(rng: random.Random, price_range: Tuple[int, int]) -> int:
+    # 실제 메뉴판처럼 500원 단위
+    return int(rng.randint(*price_range) // 500 * 500)
+
+
+def make_menus(category: str, rng: random.Random) -> List[Dict[str, Any]]:
+    """업종별 메뉴판 (메인 2~6개 + 사이드 0~3개 + 음료 0~3개)"""
+    _, _, mains, sides = CATEGORIES[category]
+    drinks = CAFE_DRINKS if category == "카페" else DRINKS
+    picked = (
+        rng.sample(mains, rng.randint(min(2, len(mains)), min(6, len(mains))))
+        + rng.sample(sides, rng.randint(0, min(3, len(sides))))
+    )
+    menus = [
+        {"title": title, "price": _price(rng, price_range), "description": description}
+        for title, price_range, description in picked
+    ]
+    menus += [
+        {"title": title, "price": _price(rng, price_range), "description": ""}
+        for title, price_range in rng.sample(drinks, rng.randint(0, 3))
+    ]
+    return menus
+
+
+def _offset(lon0: float, lat0: float, dx_m: float, dy_m: float) -> Tuple[float, float]:
+    lon = lon0 + dx_m / (111320 * math.cos(math.radians(lat0)))
+    lat = lat0 + dy_m / _M_PER_DEG_LAT
+    return lon, lat
+
+
+def generate_restaurant_corpus(
+    count: int,
+    center: Tuple[float, float] = (127.0276, 37.4979),
+    rng: Optional[random.Random] = None,
+    radius_m: Optional[float] = None,
+    density: str = "core",
+    id_prefix: str = "synthetic",
+    with_price_features: bool = False,
+    with_allergen_tags: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    합성 restaurants 문서 생성
+
+    Args:
+        count: 생성할 식당 수
+        center: 중심 좌표 (경도, 위도), 기본값은 강남역
+        radius_m: 분포 반경 (m), 지정하지 않으면 density 밀도에 맞춰 계산
+        density: "core" / "urban" / "residential" (DENSITY_PER_KM2)
+        with_price_features: 오프라인 배치(price_features)가 이미 실행된 상태로 생성
+        with_allergen_tags: 오프라인 배치(allergen_tagging)가 이미 실행된 상태로 생성
+    """
+    rng = rng or random.Random(0)
+    if radius_m is None:
+        radius_m = radius_for_density(count, DENSITY_PER_KM2[density])
+    lon0, lat0 = center
+
+    # 밀집 구역: 반경 안에 면적 비례 개수의 클러스터 (반경 60~200m)
+    cluster_count = max(1, int((radius_m / 300) ** 2))
+    clusters = []
+    for _ in range(cluster_count):
+        distance = radius_m * 0.8 * math.sqrt(rng.random())
+        angle = rng.uniform(0, 2 * math.pi)
+        clusters.append((distance * math.cos(angle), distance * math.sin(angle), rng.uniform(60, 200)))
+
+    categories = list(CATEGORIES)
+    weights = [CATEGORIES[c][0] for c in categories]
+
+    docs = []
+    for i in range(count):
+        if rng.random() < CLUSTER_RATIO:
+            cx, cy, sigma = rng.choice(clusters)
+            dx, dy = rng.gauss(cx, sigma), rng.gauss(cy, sigma)
+            # 반경 밖으로 벗어난 점은 경계 안쪽으로 당김
+            norm = math.hypot(dx, dy)
+            if norm > radius_m:
+                dx, dy = dx * radius_m / norm * 0.99, dy * radius_m / norm * 0.99
+        else:
+            distance = radius_m * math.sqrt(rng.random())
+            angle = rng.uniform(0, 2 * math.pi)
+            dx, dy = distance * math.cos(angle), distance * math.sin(angle)
+        lon, lat = _offset(lon0, lat0, dx, dy)
+
+        category = rng.choices(categories, weights)[0]
+        menus = make_menus(category, rng)
+        name = f"{category}식당{i}"
+        doc = {
+            "id": f"{id_prefix}_{i}",
+            "place_name": f"{name} {rng.choice(NAME_SUFFIXES)}".strip(),
+            "category_group_name": "카페" if category == "카페" else "음식점",
+            "category_detail": CATEGORIES[category][1],
+            "address_name": "서울 강남구 역삼동",
+            "road_address_name": "서울 강남구 강남대로",
+            "place_url": f"http://place.map.kakao.com/{9000000 + i}",
+            "x": f"{lon:.7f}",
+            "y": f"{lat:.7f}",
+            "location": {"type": "Point", "coordinates": [lon, lat]},
+            "menus": menus,
+            "review_count": int(rng.lognormvariate(4, 1.2)),
+            "restaurant_review_keywords": rng.sample(REVIEW_KEYWORDS, 3),
+        }
+        if with_price_features:
+            doc["price_features"] = compute_price_features(menus)
+        if with_allergen_tags:
+            menu_tags = tag_menus(menus, get_allergen_matcher())
+            for menu, tags in zip(menus, menu_tags):
+                menu["allergens"] = tags
+            doc.update(summarize_allergens(menus, menu_tags))
+            doc["allergen_menus_hash"] = menus_hash(menus)
+        docs.append(doc)
+    return docs
@@ -0,0 +1,109 @@
+"""dining_sessions 저장 성능 벤치마크
+
+기존 방식(read_one -> update_one -> find_one_and_update, 3회 왕복)과
+단일 upsert 방식(save_dining_session, 1회 왕복)의 지연 시간을 함께 출력합니다.
+(지연 시간은 공용 mongod 상태에 따라 흔들리므로 비교 결과는 출력만 하고,
+통과 조건은 저장 1회당 Mongo 명령 수(findAndModify 1회)로 확인합니다)
+
+실행: pytest tests/performance/test_dining_session_performance.py -s
+"""
+
+import time
+import random
+import statistics
+import pytest
+from datetime import datetime
+from pymongo import ReturnDocument
+from src.shared.db.db_manager import MongoManager
+from src.recommendation.schemas.dining_data import DiningData
+from tests.fixtures.database_fixtures import count_mongo_commands
+
+ITERATIONS = 30
+
+
+def _make_state(dining_id: int) -> dict:
+    return {
+        "user_ids": [1001, 1002, 1003],
+        "dining_id": dining_id,
+        "dining_data": DiningData(
+            dining_id=dining_id,
+            groups_id=10,
+            dining_date=datetime(2024, 2, 1, 19, 0),
+            budget=50000,
+            x="127.1111",
+            y="37.3947",
+        ),
+        "filtered_restaurants": [{"id": f"rest_{i}", "total_score": 0.5} for i in range(15)],
+        "rejected_restaurants": [{"id": "rest_rejected"}],
+        "vote_result_list": [],
+        "status_message": [{"msg": "벤치마크", "timestamp": datetime.now().isoformat()}],
+    }
+
+
+async def _legacy_save(mongo: MongoManager, state: dict):
+    """기존 3회 왕복 방식 재현 (비교 기준)"""
+    mongo.set_collection("dining_sessions")
+    dining_id = str(state["dining_id"])
+    existing = await mongo.read_one({"diningId": dining_id})
+    if existing:
+        await mongo.collection.update_one(
+            {"diningId": dining_id},
+            {
+                "$set": {
+                    "userIds": state["user_ids"],
+                    "restaurantCandidate": state["filtered_restaurants"],
+                    "updatedAt": datetime.now(),
+                },
+                "$push": {
+                    "statusMessage": {"$each": state["status_message"]},
+                    "rejectedCandidate": {"$each": state["rejected_restaurants"]},
+                },
+            },
+        )
+        await mongo.collection.find_one_and_update(
+            {"diningId": dining_id},
+            {"$inc": {"currentPhase": 1}},
+            return_document=ReturnDocument.AFTER,
+        )
+    else:
+        await mongo.create_one({"diningId": dining_id, "currentPhase": 1})
+
+
+async def _measure(save, state: dict) -> list:
+    latencies = []
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        await save(state)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+@pytest.mark.asyncio
+async def test_save_dining_session_single_round_trip():
+    # 명령 수 집계 리스너가 적용된 새 클라이언트로 연결
+    async with count_mongo_commands() as mongo_command_counter:
+        mongo = MongoManager()
+        legacy_state = _make_state(random.randint(1, 10**9))
+        upsert_state = _make_state(random.randint(1, 10**9))
+
+        # 세션 생성 후 갱신 경로를 반복 측정
+        await _legacy_save(mongo, legacy_state)
+        await mongo.save_dining_session(upsert_state)
+
+        legacy = await _measure(lambda s: _legacy_save(mongo, s), legacy_state)
+        upsert = await _measure(mongo.save_dining_session, upsert_state)
+
+        legacy_p50 = statistics.median(legacy)
+        upsert_p50 = statistics.median(upsert)
+        print(
+            f"\n[dining_sessions 저장] 기존 p50: {legacy_p50:.2f}ms / "
+            f"upsert p50: {upsert_p50:.2f}ms ({legacy_p50 / upsert_p50:.1f}x)"
+        )
+
+        # 저장 1회 = findAndModify 1회 (지연 시간과 달리 실행 환경에 따라 흔들리지 않음)
+        mongo_command_counter.reset()
+        phase = await mongo.save_dining_session(upsert_state)
+        assert mongo_command_counter.snapshot() == {"findAndModify": 1}
+
+        # 페이즈는 최초 1 + 반복 횟수만큼 증가
+        assert phase == ITERATIONS + 2
@@ -0,0 +1,161 @@
+"""필터링 노드 마이크로 벤치마크 (후보 수에 따른 CPU 시간 / 최대 메모리)
+
+합성 식당 코퍼스(tests/fixtures/restaurant_corpus.py)를 후보 수별로 만들어
+요청 경로의 CPU 단계만 측정합니다. (Mongo / LLM 왕복 제외)
+- distance: 인메모리 공간 인덱스 반경 검색 + 예산 사전 필터 (distance_node)
+- allergy_keywords: 태깅 결과 판정 + 키워드 스캔 (allergy_node의 LLM 이전 단계)
+- budget: 예산 점수 계산 및 정렬 (budget_node)
+
+각 단계는 태깅/가격 특성 배치가 실행된 경우와 아닌 경우를 나눠 측정합니다.
+시간은 tracemalloc 없이 반복 측정한 중앙값, 메모리는 별도 1회 실행의 tracemalloc 최대치입니다.
+
+실행: pytest tests/performance/test_filtering_performance.py -s
+환경 변수:
+- BENCH_FILTER_SIZES: 후보 수 목록 (기본 100,1000,10000,50000)
+- BENCH_FILTER_REPEATS: 시간 측정 반복 횟수 (기본 5)
+- BENCH_OUTPUT_DIR: 결과 JSON 저장 디렉터리 (기본 bench_results, 파일명 filtering_performance.json)
+"""
+
+import inspect
+import json
+import os
+import random
+import statistics
+import time
+import tracemalloc
+import pytest
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+from unittest.mock import patch
+from src.recommendation.features.restaurant_filtering.nodes import distance_node as distance_node_module
+from src.recommendation.features.restaurant_filtering.nodes.allergy_node import screen_allergy_keywords
+from src.recommendation.features.restaurant_filtering.nodes.budget_node import budget_node
+from src.recommendation.features.restaurant_filtering.nodes.distance_node import distance_node
+from src.recommendation.features.restaurant_filtering.spatial_index import RestaurantSpatialIndex
+from src.recommendation.schemas.dining_data import DiningData
+from tests.fixtures.restaurant_corpus import generate_restaurant_corpus
+
+SIZES = [int(s) for s in os.getenv("BENCH_FILTER_SIZES", "100,1000,10000,50000").split(",")]
+REPEATS = int(os.getenv("BENCH_FILTER_REPEATS", "5"))
+OUTPUT_PATH = Path(os.getenv("BENCH_OUTPUT_DIR", "bench_results")) / "filtering_performance.json"
+
+CENTER = (127.0276, 37.4979)
+# distance_node 검색 반경(1km) 안에 후보 전체가 들어오도록 배치
+CORPUS_RADIUS_M = 950
+USER_IDS = [1, 2, 3, 4]
+GROUP_ALLERGIES = {"SHRIMP", "PEANUT"}
+TAG_FIELDS = {"allergens", "safe_main_counts", "unsafe_for", "allergen_menus_hash"}
+
+_results: Dict[int, Dict[str, Any]] = {}
+
+
+def _state(budget: int = 100000) -> Dict[str, Any]:
+    return {
+        "user_ids": USER_IDS,
+        "dining_data": DiningData(
+            dining_id=1,
+            groups_id=1,
+            dining_date=datetime(2025, 1, 29, 19, 0),
+            budget=budget,
+            x=str(CENTER[0]),
+            y=str(CENTER[1]),
+        ),
+    }
+
+
+def _strip(docs: List[Dict[str, Any]], fields: set) -> List[Dict[str, Any]]:
+    """오프라인 배치 결과 필드를 뺀 사본 (배치 미실행 상태)"""
+    return [{k: v for k, v in doc.items() if k not in fields} for doc in docs]
+
+
+async def _measure(run: Callable[[], Any]) -> Dict[str, float]:
+    """워밍업 1회 후 REPEATS회 시간 측정, 별도 1회 tracemalloc 최대 메모리 측정"""
+    async def call():
+        result = run()
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    await call()
+    times_ms = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        await call()
+        times_ms.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    try:
+        await call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "median_ms": round(statistics.median(times_ms), 3),
+        "min_ms": round(min(times_ms), 3),
+        "peak_mb": round(peak / 1024 / 1024, 3),
+    }
+
+
+def _write_report():
+    report = {
+        "benchmark": "filtering_performance",
+        "created_at": datetime.now().isoformat(),
+        "repeats": REPEATS,
+        "group_allergies": sorted(GROUP_ALLERGIES),
+        "results": {str(size): _results[size] for size in sorted(_results)},
+    }
+    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    OUTPUT_PATH.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("size", SIZES)
+async def test_filtering_nodes_scaling(size):
+    corpus = generate_restaurant_corpus(
+        size, CENTER, random.Random(size), radius_m=CORPUS_RADIUS_M,
+        with_price_features=True, with_allergen_tags=True,
+    )
+    untagged = _strip(corpus, TAG_FIELDS | {"price_features"})
+
+    results: Dict[str, Any] = {}
+
+    # 1. distance_node (인메모리 공간 인덱스 경로)
+    for variant, docs in (("precomputed", corpus), ("raw", untagged)):
+        index = RestaurantSpatialIndex()
+        for doc in docs:
+            index.upsert(doc)
+        index.is_ready = True
+        with patch.object(distance_node_module, "restaurant_index", index):
+            output = await distance_node(_state())
+            assert output["filtered_restaurants"], "거리 필터링 결과가 비어 있습니다"
+            results[f"distance[{variant}]"] = await _measure(lambda: distance_node(_state()))
+    candidates = output["filtered_restaurants"]
+
+    # 2. allergy_node 키워드 단계 (태깅 결과 판정 / 런타임 키워드 스캔)
+    for variant, docs in (("tagged", corpus), ("keyword_scan", untagged)):
+        safe, risky = screen_allergy_keywords(docs, GROUP_ALLERGIES)
+        results[f"allergy_keywords[{variant}]"] = {
+            **await _measure(lambda: screen_allergy_keywords(docs, GROUP_ALLERGIES)),
+            "safe": len(safe),
+            "llm_review": len(risky),
+        }
+
+    # 3. budget_node (사전 계산된 가격 특성 / 요청 시 메뉴 분류)
+    distance_scores = {r["id"]: r["distance_score"] for r in candidates}
+    for variant, docs in (("precomputed", corpus), ("raw", untagged)):
+        scored = [dict(doc, distance_score=distance_scores.get(doc["id"], 0.0)) for doc in docs]
+        state = {**_state(), "filtered_restaurants": scored}
+        output = await budget_node(state)
+        results[f"budget[{variant}]"] = {
+            **await _measure(lambda: budget_node(state)),
+            "survived": len(output["filtered_restaurants"]),
+        }
+
+    _results[size] = results
+    _write_report()
+
+    print(f"\n후보 {size}개")
+    for name, result in results.items():
+        print(f"  {name:<32} 중앙값 {result['median_ms']:>10.3f}ms  최대 메모리 {result['peak_mb']:>8.3f}MB")
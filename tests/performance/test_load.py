@@ -0,0 +1,276 @@
+"""추천 API 동시 부하 테스트
+
+uvicorn 단일 프로세스(이벤트 루프 1개)에 여러 모임의 추천 요청이 동시에 몰릴 때의 동작을 측정합니다.
+모임(dining session)은 포아송 과정으로 도착하며(open-loop, 응답을 기다리지 않고 다음 요청 발생),
+각 모임은 최초 추천(/recommendations) 후 투표 결과(vote_result_list)를 담은 재추천(/analyze_refresh)을
+0~N회 이어서 보냅니다. 인원 수, 인당 예산, 좌표(서울 주요 상권 주변)는 모임마다 무작위입니다.
+
+측정 지표
+- 처리량: 초당 완료 요청 수
+- 큐 대기: 예정 도착 시각 대비 실제 전송 지연(이벤트 루프 포화), LLM 스케줄러 대기 시간
+- 이벤트 루프 지연: 주기적 sleep이 예정보다 늦게 깨어난 정도
+- 오류율: 상태 코드/예외별 실패 비율 (504 = 추천 타임아웃)
+
+FastAPI 앱은 lifespan까지 포함해 같은 프로세스에서 실행하고, LLM은 synthetic 백엔드를 사용합니다.
+
+실행: pytest tests/performance/test_load.py -s
+환경 변수:
+- BENCH_LOAD_RATE: 초당 모임 도착 수 (기본 2.0)
+- BENCH_LOAD_DURATION_SEC: 도착 발생 시간 (기본 30)
+- BENCH_LOAD_MAX_REFRESH: 모임당 최대 재추천 횟수 (기본 2)
+- BENCH_LOAD_THINK_SEC: 재추천 전 투표 대기 시간 (기본 1.0)
+- BENCH_LOAD_MAX_ERROR_RATE: 허용 오류율 (기본 0.01)
+- BENCH_LLM_LATENCY_MS: synthetic LLM 지연 시간 중앙값 (기본 300)
+- BENCH_OUTPUT_DIR: 결과 JSON 저장 디렉터리 (기본 bench_results, 파일명 load.json)
+"""
+
+import asyncio
+import json
+import os
+import random
+import time
+import pytest
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+import httpx
+from src.core.config import settings
+from src.shared.llm.llm_scheduler import llm_scheduler
+from src.shared.request_coalescer import request_coalescer
+from tests.fixtures.llm_fixtures import synthetic_llm
+from tests.fixtures.recommendation_fixtures import (
+    NodeTimer,
+    latency_summary,
+    make_recommendation_payload,
+    make_restaurant_docs,
+    make_vote_results,
+    recommendation_app,
+    seed_recommendation_data,
+)
+
+ARRIVAL_RATE = float(os.getenv("BENCH_LOAD_RATE", "2.0"))
+DURATION_SEC = float(os.getenv("BENCH_LOAD_DURATION_SEC", "30"))
+MAX_REFRESH = int(os.getenv("BENCH_LOAD_MAX_REFRESH", "2"))
+THINK_SEC = float(os.getenv("BENCH_LOAD_THINK_SEC", "1.0"))
+MAX_ERROR_RATE = float(os.getenv("BENCH_LOAD_MAX_ERROR_RATE", "0.01"))
+LLM_LATENCY_MS = float(os.getenv("BENCH_LLM_LATENCY_MS", "300"))
+OUTPUT_PATH = Path(os.getenv("BENCH_OUTPUT_DIR", "bench_results")) / "load.json"
+
+API = "/ai/api/v1"
+USER_POOL = list(range(20001, 20201))
+RESTAURANTS_PER_HUB = 80
+LOOP_LAG_INTERVAL_SEC = 0.05
+
+# 모임 장소 후보 (경도, 위도)
+HUBS: List[Tuple[float, float]] = [
+    (127.1111, 37.3947),  # 판교
+    (127.0276, 37.4979),  # 강남
+    (126.9237, 37.5563),  # 홍대
+    (126.9780, 37.5665),  # 시청
+    (127.0557, 37.5445),  # 성수
+]
+
+
+class EventLoopLagMonitor:
+    """일정 간격으로 sleep 후 예정보다 늦게 깨어난 시간(ms)을 기록"""
+
+    def __init__(self, interval_sec: float = LOOP_LAG_INTERVAL_SEC):
+        self.interval_sec = interval_sec
+        self.lags_ms: List[float] = []
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval_sec
+            await asyncio.sleep(self.interval_sec)
+            self.lags_ms.append(max(0.0, (loop.time() - expected) * 1000))
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+class LoadStats:
+    """요청 단위 결과 수집"""
+
+    def __init__(self):
+        self.latencies_ms: Dict[str, List[float]] = {"recommendations": [], "analyze_refresh": []}
+        self.dispatch_delays_ms: List[float] = []
+        self.outcomes: Counter = Counter()
+        self.inflight = 0
+        self.max_inflight = 0
+        self.completed = 0
+
+    def begin(self):
+        self.inflight += 1
+        self.max_inflight = max(self.max_inflight, self.inflight)
+
+    def end(self, phase: str, started: float, outcome: str):
+        self.inflight -= 1
+        self.completed += 1
+        self.outcomes[outcome] += 1
+        if outcome == "200":
+            self.latencies_ms[phase].append((time.perf_counter() - started) * 1000)
+
+    @property
+    def errors(self) -> int:
+        return sum(count for outcome, count in self.outcomes.items() if outcome != "200")
+
+
+def make_session_plan(dining_id: int, rng: random.Random) -> Dict[str, Any]:
+    """모임 1개의 요청 시나리오 (인원/예산/좌표/재추천 횟수 무작위)"""
+    group_size = rng.choices([2, 3, 4, 5, 6, 8], weights=[3, 4, 5, 3, 2, 1])[0]
+    lon, lat = rng.choice(HUBS)
+    return {
+        "dining_id": dining_id,
+        "user_ids": rng.sample(USER_POOL, group_size),
+        "budget": group_size * rng.choice([10000, 15000, 20000, 30000, 50000]),
+        "x": lon + rng.uniform(-0.003, 0.003),
+        "y": lat + rng.uniform(-0.003, 0.003),
+        "refreshes": rng.randint(0, MAX_REFRESH),
+    }
+
+
+async def _post(client: httpx.AsyncClient, phase: str, payload: Dict[str, Any], stats: LoadStats):
+    stats.begin()
+    started = time.perf_counter()
+    try:
+        response = await client.post(f"{API}/{phase}", json=payload)
+    except Exception as e:
+        stats.end(phase, started, type(e).__name__)
+        return None
+    stats.end(phase, started, str(response.status_code))
+    return response if response.status_code == 200 else None
+
+
+async def run_session(client: httpx.AsyncClient, plan: Dict[str, Any], stats: LoadStats, rng: random.Random):
+    """최초 추천 -> (투표 대기 -> 재추천) x N"""
+    def payload(vote_result_list=None):
+        return make_recommendation_payload(
+            plan["dining_id"], plan["user_ids"], plan["budget"], plan["x"], plan["y"], vote_result_list
+        )
+
+    response = await _post(client, "recommendations", payload(), stats)
+    for _ in range(plan["refreshes"]):
+        if response is None:
+            return
+        restaurant_ids = [item["restaurantId"] for item in response.json()["recommendedItems"]]
+        await asyncio.sleep(rng.expovariate(1 / THINK_SEC) if THINK_SEC > 0 else 0)
+        votes = make_vote_results(restaurant_ids, plan["user_ids"], rng)
+        response = await _post(client, "analyze_refresh", payload(votes), stats)
+
+
+async def generate_load(client: httpx.AsyncClient, stats: LoadStats, rng: random.Random) -> float:
+    """포아송 도착으로 모임 시나리오를 발생시키고 모두 끝날 때까지 대기, 경과 시간(초) 반환"""
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    tasks = []
+    scheduled = 0.0
+    dining_id = rng.randint(10**9, 10**10)
+    while True:
+        scheduled += rng.expovariate(ARRIVAL_RATE)
+        if scheduled > DURATION_SEC:
+            break
+        await asyncio.sleep(max(0.0, started + scheduled - loop.time()))
+        stats.dispatch_delays_ms.append(max(0.0, (loop.time() - started - scheduled) * 1000))
+        dining_id += 1
+        plan = make_session_plan(dining_id, rng)
+        tasks.append(asyncio.create_task(run_session(client, plan, stats, random.Random(dining_id))))
+    await asyncio.gather(*tasks)
+    return loop.time() - started
+
+
+def _scheduler_snapshot() -> Dict[str, float]:
+    """스케줄러 누적 통계 기록, 최대 대기 시간은 이번 실행분만 보도록 0으로 초기화"""
+    before = {
+        "calls": llm_scheduler.calls,
+        "total_wait_sec": llm_scheduler.total_wait_sec,
+        "queued_calls": llm_scheduler.queued_calls,
+        "throttled_calls": llm_scheduler.throttled_calls,
+        "max_wait_sec": llm_scheduler.max_wait_sec,
+    }
+    llm_scheduler.max_wait_sec = 0.0
+    return before
+
+
+def _scheduler_delta(before: Dict[str, float]) -> Dict[str, Any]:
+    calls = llm_scheduler.calls - before["calls"]
+    wait = llm_scheduler.total_wait_sec - before["total_wait_sec"]
+    run_max_wait = llm_scheduler.max_wait_sec
+    # 프로세스 전체 최대값은 원래대로 복원
+    llm_scheduler.max_wait_sec = max(before["max_wait_sec"], run_max_wait)
+    return {
+        "calls": calls,
+        "queued_calls": llm_scheduler.queued_calls - before["queued_calls"],
+        "throttled_calls": llm_scheduler.throttled_calls - before["throttled_calls"],
+        "avg_wait_ms": round(wait / calls * 1000, 2) if calls else 0.0,
+        "max_wait_ms": round(run_max_wait * 1000, 2),
+    }
+
+
+@pytest.mark.asyncio
+async def test_concurrent_dining_sessions_load():
+    rng = random.Random(0)
+    stats = LoadStats()
+    monitor = EventLoopLagMonitor()
+
+    async with synthetic_llm(latency_ms=LLM_LATENCY_MS), recommendation_app(NodeTimer()) as client:
+        restaurants = []
+        for index, hub in enumerate(HUBS):
+            restaurants += make_restaurant_docs(RESTAURANTS_PER_HUB, center=hub, rng=rng, id_prefix=f"hub{index}")
+        await seed_recommendation_data(USER_POOL, restaurants)
+
+        scheduler_before = _scheduler_snapshot()
+        monitor.start()
+        elapsed = await generate_load(client, stats, rng)
+        await monitor.stop()
+
+    total = stats.completed
+    error_rate = stats.errors / total if total else 0.0
+    report = {
+        "benchmark": "load",
+        "created_at": datetime.now().isoformat(),
+        "config": {
+            "arrival_rate_per_sec": ARRIVAL_RATE,
+            "duration_sec": DURATION_SEC,
+            "max_refresh": MAX_REFRESH,
+            "think_sec": THINK_SEC,
+            "llm_latency_ms": LLM_LATENCY_MS,
+            "llm_max_concurrency": settings.LLM_MAX_CONCURRENCY,
+            "recommendation_timeout_sec": settings.RECOMMENDATION_TIMEOUT_SEC,
+            "filtering_mode": settings.FILTERING_MODE,
+        },
+        "elapsed_sec": round(elapsed, 2),
+        "requests": total,
+        "throughput_rps": round(total / elapsed, 3) if elapsed else 0.0,
+        "max_inflight": stats.max_inflight,
+        "latency_ms": {phase: latency_summary(values) for phase, values in stats.latencies_ms.items()},
+        "dispatch_delay_ms": latency_summary(stats.dispatch_delays_ms),
+        "event_loop_lag_ms": latency_summary(monitor.lags_ms),
+        "llm_scheduler": _scheduler_delta(scheduler_before),
+        "coalescer": request_coalescer.stats(),
+        "outcomes": dict(stats.outcomes),
+        "error_rate": round(error_rate, 4),
+    }
+    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    OUTPUT_PATH.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    print(f"\n요청 {total}건 / {elapsed:.1f}초 -> 처리량 {report['throughput_rps']} req/s (동시 최대 {stats.max_inflight})")
+    for phase, summary in report["latency_ms"].items():
+        if summary["count"]:
+            print(f"[{phase}] p50 {summary['p50']:.1f}ms / p95 {summary['p95']:.1f}ms / p99 {summary['p99']:.1f}ms")
+    print(f"이벤트 루프 지연 p99 {report['event_loop_lag_ms'].get('p99', 0)}ms, "
+          f"LLM 대기 평균 {report['llm_scheduler']['avg_wait_ms']}ms, 오류율 {error_rate:.2%} {dict(stats.outcomes)}")
+    print(f"결과 저장: {OUTPUT_PATH}")
+
+    assert total > 0
+    assert error_rate <= MAX_ERROR_RATE, f"오류율 {error_rate:.2%} > {MAX_ERROR_RATE:.2%}: {dict(stats.outcomes)}"
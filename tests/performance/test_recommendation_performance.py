@@ -0,0 +1,176 @@
+"""추천 API 종단 간 지연 시간 벤치마크
+
+FastAPI 앱을 프로세스 안에서 실행(lifespan 포함)하고, 로컬 MongoDB 테스트 DB와
+synthetic LLM 백엔드(네트워크/비용 없음, 지연 시간 분포만 재현)로 아래 시나리오를 측정합니다.
+- cold: 새 dining_id로 최초 추천 (/recommendations)
+- refresh: 같은 참여자의 재추천 (/analyze_refresh, 이전 후보 재사용)
+- different_user_refresh: 참여자가 바뀐 재추천 (/analyze_refresh, 필터링 재실행)
+- restaurant_fix: 최종 식당 확정 (/restaurant_fix)
+
+시나리오별 p50/p95/p99 지연 시간, 노드별 실행 시간, Mongo 왕복(명령) 수, LLM 호출 수를
+JSON으로 저장하므로 변경 전후 결과를 비교할 수 있습니다.
+
+실행: pytest tests/performance/test_recommendation_performance.py -s
+환경 변수:
+- BENCH_ITERATIONS: 시나리오별 요청 수 (기본 10)
+- BENCH_RESTAURANTS: 시드 식당 수 (기본 200)
+- BENCH_LLM_LATENCY_MS: synthetic LLM 지연 시간 중앙값 (기본 300)
+- BENCH_OUTPUT_DIR: 결과 JSON 저장 디렉터리 (기본 bench_results, 파일명 recommendation_performance.json)
+"""
+
+import json
+import os
+import random
+import time
+import pytest
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List
+from src.core.config import settings
+from tests.fixtures.database_fixtures import mongo_command_counter
+from tests.fixtures.llm_fixtures import diff_counts, llm_call_counts, synthetic_llm
+from tests.fixtures.recommendation_fixtures import (
+    NodeTimer,
+    latency_summary,
+    make_fix_payload,
+    make_recommendation_payload,
+    make_restaurant_docs,
+    make_vote_results,
+    recommendation_app,
+    seed_recommendation_data,
+)
+
+ITERATIONS = int(os.getenv("BENCH_ITERATIONS", "10"))
+RESTAURANT_COUNT = int(os.getenv("BENCH_RESTAURANTS", "200"))
+LLM_LATENCY_MS = float(os.getenv("BENCH_LLM_LATENCY_MS", "300"))
+OUTPUT_PATH = Path(os.getenv("BENCH_OUTPUT_DIR", "bench_results")) / "recommendation_performance.json"
+
+API = "/ai/api/v1"
+USER_IDS = [9001, 9002, 9003, 9004]
+NEW_USER_ID = 9005
+
+
+async def _run_scenario(
+    name: str, send: Callable[[int], Awaitable[Any]], node_timer: NodeTimer
+) -> Dict[str, Any]:
+    """시나리오 1개를 ITERATIONS회 순차 실행하고 지표 집계"""
+    node_timer.reset()
+    mongo_command_counter.reset()
+    llm_before = llm_call_counts()
+
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    for i in range(ITERATIONS):
+        start = time.perf_counter()
+        response = await send(i)
+        latencies.append((time.perf_counter() - start) * 1000)
+        if response.status_code != 200:
+            errors[str(response.status_code)] = errors.get(str(response.status_code), 0) + 1
+
+    llm_calls = diff_counts(llm_call_counts(), llm_before)
+    result = {
+        "latency_ms": latency_summary(latencies),
+        "errors": errors,
+        "mongo_round_trips": {
+            "total": mongo_command_counter.total,
+            "per_request": round(mongo_command_counter.total / ITERATIONS, 2),
+            "by_command": mongo_command_counter.snapshot(),
+        },
+        "llm_calls": {
+            "total": sum(llm_calls.values()),
+            "per_request": round(sum(llm_calls.values()) / ITERATIONS, 2),
+            "by_model": llm_calls,
+        },
+        "nodes_ms": node_timer.summary(),
+    }
+    latency = result["latency_ms"]
+    print(
+        f"\n[{name}] p50 {latency['p50']:.1f}ms / p95 {latency['p95']:.1f}ms / p99 {latency['p99']:.1f}ms"
+        f" | Mongo {result['mongo_round_trips']['per_request']}회/요청"
+        f" | LLM {result['llm_calls']['per_request']}회/요청 | 오류 {sum(errors.values())}건"
+    )
+    return result
+
+
+def _write_report(scenarios: Dict[str, Any]) -> Path:
+    report = {
+        "benchmark": "recommendation_performance",
+        "created_at": datetime.now().isoformat(),
+        "iterations": ITERATIONS,
+        "restaurants": RESTAURANT_COUNT,
+        "llm": {"backend": "synthetic", "latency_ms": LLM_LATENCY_MS},
+        "settings": {
+            key: getattr(settings, key)
+            for key in (
+                "FILTERING_MODE",
+                "GEO_CACHE_ENABLED",
+                "ALLERGY_VERDICT_CACHE_ENABLED",
+                "BUDGET_PREFILTER_ENABLED",
+                "RESTAURANT_INDEX_ENABLED",
+                "LLM_MAX_CONCURRENCY",
+            )
+        },
+        "scenarios": scenarios,
+    }
+    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    OUTPUT_PATH.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    return OUTPUT_PATH
+
+
+@pytest.mark.asyncio
+async def test_recommendation_end_to_end_latency():
+    rng = random.Random(0)
+    node_timer = NodeTimer()
+    dining_ids = [rng.randint(10**9, 10**10) + i for i in range(ITERATIONS)]
+    recommended: Dict[int, List[str]] = {}
+
+    async with synthetic_llm(latency_ms=LLM_LATENCY_MS), recommendation_app(node_timer) as client:
+        await seed_recommendation_data(
+            USER_IDS + [NEW_USER_ID], make_restaurant_docs(RESTAURANT_COUNT, rng=rng)
+        )
+
+        async def cold(i: int):
+            response = await client.post(
+                f"{API}/recommendations", json=make_recommendation_payload(dining_ids[i], USER_IDS)
+            )
+            if response.status_code == 200:
+                recommended[dining_ids[i]] = [
+                    item["restaurantId"] for item in response.json()["recommendedItems"]
+                ]
+            return response
+
+        def refresh(user_ids: List[int]):
+            async def send(i: int):
+                votes = make_vote_results(recommended.get(dining_ids[i], []), USER_IDS, rng)
+                payload = make_recommendation_payload(dining_ids[i], user_ids, vote_result_list=votes)
+                response = await client.post(f"{API}/analyze_refresh", json=payload)
+                if response.status_code == 200:
+                    recommended[dining_ids[i]] = [
+                        item["restaurantId"] for item in response.json()["recommendedItems"]
+                    ]
+                return response
+            return send
+
+        async def fix(i: int):
+            candidates = recommended.get(dining_ids[i]) or ["unknown"]
+            votes = make_vote_results(candidates, USER_IDS, rng)
+            return await client.post(
+                f"{API}/restaurant_fix", json=make_fix_payload(dining_ids[i], candidates[0], votes)
+            )
+
+        scenarios = {
+            "cold": await _run_scenario("cold", cold, node_timer),
+            "refresh": await _run_scenario("refresh", refresh(USER_IDS), node_timer),
+            "different_user_refresh": await _run_scenario(
+                "different_user_refresh", refresh(USER_IDS + [NEW_USER_ID]), node_timer
+            ),
+            "restaurant_fix": await _run_scenario("restaurant_fix", fix, node_timer),
+        }
+
+    path = _write_report(scenarios)
+    print(f"\n결과 저장: {path}")
+
+    for name, result in scenarios.items():
+        assert not result["errors"], f"{name} 시나리오 오류: {result['errors']}"
+    assert scenarios["cold"]["llm_calls"]["total"] > 0
+    assert scenarios["restaurant_fix"]["llm_calls"]["total"] == 0
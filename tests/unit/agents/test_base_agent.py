@@ -71,3 +71,24 @@ def test_base_agent_cannot_instantiate():
     # When/Then
     with pytest.raises(TypeError):
         BaseAgent(llm=mock_llm, name="test")
+
+
+def test_chain_cache_evicts_least_recently_used(monkeypatch):
+    """체인 캐시는 최대 항목 수를 넘으면 가장 오래 쓰지 않은 LLM의 체인을 제거"""
+    # Given
+    from src.core.config import settings
+    monkeypatch.setattr(BaseAgent, "_chain_cache", type(BaseAgent._chain_cache)())
+    monkeypatch.setattr(settings, "AGENT_CHAIN_CACHE_MAX_ENTRIES", 2)
+    llms = [Mock(), Mock(), Mock()]
+    build = Mock(side_effect=lambda llm: {"chain": llm})
+
+    # When
+    ConcreteAgent(llm=llms[0], name="a")._get_chains(build)
+    ConcreteAgent(llm=llms[1], name="b")._get_chains(build)
+    ConcreteAgent(llm=llms[0], name="a")._get_chains(build)
+    ConcreteAgent(llm=llms[2], name="c")._get_chains(build)
+
+    # Then
+    cached = [entry[0] for entry in BaseAgent._chain_cache.values()]
+    assert cached == [llms[0], llms[2]]
+    assert build.call_count == 3
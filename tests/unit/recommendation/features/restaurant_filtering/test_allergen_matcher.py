@@ -0,0 +1,37 @@
+from src.recommendation.features.restaurant_filtering.allergen_matcher import (
+    AllergenMatcher,
+    get_allergen_matcher,
+)
+
+
+def _matcher() -> AllergenMatcher:
+    return AllergenMatcher({
+        "SHRIMP": ["새우", "새우젓"],
+        "CRAB": ["게", "꽃게"],
+        "MILK": ["우유", "치즈"],
+    })
+
+
+def test_scan_finds_overlapping_keywords_in_one_pass():
+    matches = _matcher().scan("꽃게탕 새우젓 무침")
+
+    assert ("꽃게", "CRAB") in matches
+    assert ("게", "CRAB") in matches
+    assert ("새우", "SHRIMP") in matches
+    assert ("새우젓", "SHRIMP") in matches
+
+
+def test_scan_filters_by_allergy_types():
+    matcher = _matcher()
+
+    assert matcher.scan("치즈 새우 피자", {"MILK"}) == [("치즈", "MILK")]
+    assert matcher.scan("치즈 새우 피자", set()) == []
+    assert matcher.match_types("우유 라떼") == {"MILK"}
+    assert matcher.match_types("아메리카노") == set()
+
+
+def test_get_allergen_matcher_is_loaded_once():
+    matcher = get_allergen_matcher()
+
+    assert matcher is get_allergen_matcher()
+    assert matcher.keywords_map
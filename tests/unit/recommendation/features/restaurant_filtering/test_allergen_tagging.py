@@ -0,0 +1,91 @@
+import pytest
+from datetime import datetime
+from src.recommendation.features.restaurant_filtering.allergen_matcher import (
+    AllergenMatcher,
+    menus_hash,
+)
+from src.recommendation.features.restaurant_filtering.allergen_tagging import (
+    build_allergen_update,
+    summarize_allergens,
+    tag_menus,
+    tagged_verdict,
+)
+
+MENUS = [
+    {"title": "새우볶음밥", "price": 9000, "description": ""},
+    {"title": "김치찌개", "price": 8000, "description": ""},
+    {"title": "새우튀김", "price": 6000, "description": ""},
+    {"title": "콜라", "price": 2000, "description": ""},
+]
+
+
+def _tagged_restaurant(menus, matcher, confirmed=False):
+    menu_tags = tag_menus(menus, matcher)
+    restaurant = {
+        "menus": [{**menu, "allergens": tags} for menu, tags in zip(menus, menu_tags)],
+        **summarize_allergens(menus, menu_tags),
+        "allergen_menus_hash": menus_hash(menus),
+        "allergen_confirmed": confirmed,
+    }
+    return restaurant
+
+
+def test_summary_counts_safe_main_menus_per_allergen():
+    matcher = AllergenMatcher({"SHRIMP": ["새우"], "MILK": ["우유"]})
+
+    menu_tags = tag_menus(MENUS, matcher)
+    summary = summarize_allergens(MENUS, menu_tags)
+
+    assert menu_tags == [["SHRIMP"], [], ["SHRIMP"], []]
+    assert summary["allergens"] == ["SHRIMP"]
+    # 메인 메뉴(8,000원 이상) 2개 중 새우 없는 메뉴 1개
+    assert summary["safe_main_counts"]["SHRIMP"] == 1
+    assert summary["safe_main_counts"]["MILK"] == 2
+    assert summary["unsafe_for"] == []
+
+
+def test_unsafe_for_lists_allergens_without_safe_main():
+    matcher = AllergenMatcher({"SHRIMP": ["새우"]})
+    menus = [{"title": "새우볶음밥", "price": 9000}, {"title": "새우탕면", "price": 10000}]
+
+    summary = summarize_allergens(menus, tag_menus(menus, matcher))
+
+    assert summary["unsafe_for"] == ["SHRIMP"]
+
+
+def test_tagged_verdict():
+    matcher = AllergenMatcher({"SHRIMP": ["새우"], "MILK": ["우유"]})
+    restaurant = _tagged_restaurant(MENUS, matcher)
+
+    assert tagged_verdict(restaurant, {"MILK"}) is True
+    # 키워드 태그만 있으면 런타임 검토로 넘김
+    assert tagged_verdict(restaurant, {"SHRIMP"}) is None
+    # LLM 확인된 태그는 안전한 메인 메뉴 수로 판정
+    confirmed = _tagged_restaurant(MENUS, matcher, confirmed=True)
+    assert tagged_verdict(confirmed, {"SHRIMP"}, min_safe_mains=1) is True
+    assert tagged_verdict(confirmed, {"SHRIMP"}, min_safe_mains=2) is None
+
+    # 태깅 이후 메뉴가 바뀐 경우 태그를 신뢰하지 않음
+    restaurant["menus"].append({"title": "우유빙수", "price": 9000})
+    assert tagged_verdict(restaurant, {"MILK"}) is None
+    assert tagged_verdict({"menus": MENUS}, {"MILK"}) is None
+
+
+def test_tagged_verdict_excludes_unsafe_restaurant():
+    matcher = AllergenMatcher({"SHRIMP": ["새우"]})
+    menus = [{"title": "새우볶음밥", "price": 9000}]
+
+    assert tagged_verdict(_tagged_restaurant(menus, matcher), {"SHRIMP"}) is False
+
+
+@pytest.mark.asyncio
+async def test_allergen_update_touches_updated_at_for_spatial_index():
+    matcher = AllergenMatcher({"SHRIMP": ["새우"]})
+    doc = {"_id": "r1", "place_name": "식당", "menus": MENUS}
+
+    operation = await build_allergen_update(doc, matcher)
+
+    fields = operation._doc["$set"]
+    assert isinstance(fields["updated_at"], datetime)
+    assert fields["updated_at"] == fields["allergen_tagged_at"]
+    assert fields["menus.0.allergens"] == ["SHRIMP"]
@@ -0,0 +1,126 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.recommendation.features.restaurant_filtering.allergy_verdict_cache import (
+    AllergyVerdictCache,
+    make_verdict_key,
+)
+
+MODULE = "src.recommendation.features.restaurant_filtering.allergy_verdict_cache"
+
+
+def _mock_db(docs=None):
+    collection = MagicMock()
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(return_value=docs or [])
+    collection.find.return_value = cursor
+    collection.bulk_write = AsyncMock()
+    return {"allergy_verdicts": collection}, collection
+
+
+def test_key_depends_on_sorted_allergies_and_menus():
+    restaurant = {"id": "r1", "menus": [{"title": "새우볶음밥", "description": ""}]}
+
+    key = make_verdict_key(restaurant, {"SHRIMP", "MILK"})
+
+    assert key == make_verdict_key(restaurant, ["MILK", "SHRIMP"])
+    assert key.startswith("r1|MILK,SHRIMP|")
+    changed = {"id": "r1", "menus": [{"title": "김치볶음밥", "description": ""}]}
+    assert key != make_verdict_key(changed, {"SHRIMP", "MILK"})
+
+
+@pytest.mark.asyncio
+async def test_concurrent_checks_for_same_key_call_llm_once():
+    db, collection = _mock_db()
+    cache = AllergyVerdictCache()
+    key = make_verdict_key({"id": "r1", "menus": []}, {"MILK"})
+
+    async def check(missing):
+        await asyncio.sleep(0.01)
+        return {k: {"is_safe": True, "reason": "ok"} for k in missing}
+
+    check_mock = AsyncMock(side_effect=check)
+    with patch(f"{MODULE}.get_db", return_value=db):
+        first, second = await asyncio.gather(
+            cache.resolve({key: {}}, check_mock),
+            cache.resolve({key: {}}, check_mock),
+        )
+        third = await cache.resolve({key: {}}, check_mock)
+
+    assert check_mock.await_count == 1
+    assert first[key] == second[key] == third[key] == {"is_safe": True, "reason": "ok"}
+    assert collection.bulk_write.await_count == 1
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_mongo_hit_skips_llm():
+    key = make_verdict_key({"id": "r1", "menus": []}, {"EGG"})
+    db, _ = _mock_db([{"_id": key, "isSafe": False, "reason": "계란 요리 위주"}])
+    cache = AllergyVerdictCache()
+    check = AsyncMock(return_value={})
+
+    with patch(f"{MODULE}.get_db", return_value=db):
+        result = await cache.resolve({key: {}}, check)
+
+    check.assert_not_awaited()
+    assert result[key] == {"is_safe": False, "reason": "계란 요리 위주"}
+    assert cache.stats()["db_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_place_name_with_pipe_is_stored_without_breaking_resolve():
+    db, collection = _mock_db()
+    cache = AllergyVerdictCache()
+    key = make_verdict_key({"place_name": "국밥|본점", "menus": []}, {"MILK"})
+
+    check = AsyncMock(return_value={key: {"is_safe": True, "reason": "ok"}})
+    with patch(f"{MODULE}.get_db", return_value=db):
+        result = await cache.resolve({key: {}}, check)
+
+    assert result[key] == {"is_safe": True, "reason": "ok"}
+    [operation] = collection.bulk_write.await_args.args[0]
+    assert operation._doc["$set"]["restaurantId"] == "국밥|본점"
+    assert operation._doc["$set"]["allergies"] == ["MILK"]
+
+
+@pytest.mark.asyncio
+async def test_store_failure_is_swallowed():
+    db, collection = _mock_db()
+    collection.bulk_write = AsyncMock(side_effect=RuntimeError("write failed"))
+    cache = AllergyVerdictCache()
+    key = make_verdict_key({"id": "r1", "menus": []}, {"EGG"})
+
+    check = AsyncMock(return_value={key: {"is_safe": False, "reason": "계란"}})
+    with patch(f"{MODULE}.get_db", return_value=db):
+        result = await cache.resolve({key: {}}, check)
+
+    assert result[key] == {"is_safe": False, "reason": "계란"}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_owner_does_not_block_waiters():
+    db, _ = _mock_db()
+    cache = AllergyVerdictCache()
+    key = make_verdict_key({"id": "r1", "menus": []}, {"MILK"})
+    release = asyncio.Event()
+
+    async def check(missing):
+        await release.wait()
+        return {k: {"is_safe": True, "reason": "ok"} for k in missing}
+
+    with patch(f"{MODULE}.get_db", return_value=db):
+        owner = asyncio.create_task(cache.resolve({key: {}}, check))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.resolve({key: {}}, check))
+        await asyncio.sleep(0)
+
+        # 타임아웃/연결 종료로 먼저 온 요청이 취소되어도 판정은 계속 진행
+        owner.cancel()
+        release.set()
+        result = await asyncio.wait_for(waiter, timeout=1)
+
+    assert owner.cancelled()
+    assert result[key] == {"is_safe": True, "reason": "ok"}
+    assert cache._inflight == {}
+    assert cache.stats()["entries"] == 1
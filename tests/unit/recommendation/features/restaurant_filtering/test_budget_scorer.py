@@ -0,0 +1,61 @@
+from src.recommendation.features.restaurant_filtering.budget_scorer import score_budget
+from src.recommendation.features.restaurant_filtering.price_features import (
+    compute_price_features,
+    is_budget_feasible,
+)
+
+MENUS = [
+    {"title": "김치찌개", "price": 9000},
+    {"title": "제육볶음", "price": 12000},
+    {"title": "콜라", "price": 2000},
+    {"title": "사이다", "price": 2000},
+    {"title": "계란말이", "price": 7000},
+    {"title": "공기밥", "price": 1000},
+    {"title": "메뉴판 준비중", "price": 0},
+]
+
+
+def test_compute_price_features():
+    features = compute_price_features(MENUS)
+
+    assert features["meal_title"] == "김치찌개"
+    assert features["meal_price"] == 9000
+    assert features["min_meal_price"] == 9000
+    assert features["drink_title"] == "콜라"
+    assert features["side_titles"] == ["공기밥", "계란말이"]
+    assert features["side_prices"] == [1000, 7000]
+
+
+def test_score_budget_builds_team_package():
+    restaurant = {"id": "r1", "distance_score": 0.8, "price_features": compute_price_features(MENUS)}
+
+    [result] = score_budget([restaurant], total_budget=40000, member_count=3)
+
+    # 메인 27,000 + 음료 6,000 + 1인 1사이드 3,000
+    assert [o["title"] for o in result["budget_recommendation"]["menu_details"]] == ["김치찌개", "콜라", "공기밥"]
+    assert result["budget_recommendation"]["remaining_budget"] == 4000
+    assert result["budget_score"] == 1.0
+    assert result["total_score"] == 0.9
+    assert isinstance(result["budget_recommendation"]["total_spent"], int)
+
+
+def test_score_budget_filters_and_sorts():
+    expensive = {"id": "expensive", "distance_score": 1.0, "menus": [{"title": "한우", "price": 50000}]}
+    no_meal = {"id": "no_meal", "distance_score": 1.0, "menus": [{"title": "커피", "price": 4000}]}
+    near = {"id": "near", "distance_score": 0.9, "menus": [{"title": "국밥", "price": 9000}]}
+    far = {"id": "far", "distance_score": 0.1, "menus": [{"title": "국밥", "price": 9000}]}
+
+    results = score_budget([far, expensive, no_meal, near], total_budget=30000, member_count=2)
+
+    # 가격 특성이 없는 식당은 메뉴에서 바로 계산, 메인 메뉴가 없는 식당은 점수 없이 통과
+    assert [r["id"] for r in results] == ["near", "far", "no_meal"]
+    assert "budget_score" not in results[-1]
+
+
+def test_is_budget_feasible_uses_cheapest_main():
+    restaurant = {"price_features": compute_price_features(MENUS)}
+
+    assert is_budget_feasible(restaurant, 9000)
+    assert not is_budget_feasible(restaurant, 8999)
+    # 메인 메뉴가 없으면 예산 노드에서 판단하도록 통과
+    assert is_budget_feasible({"menus": [{"title": "공기밥", "price": 1000}]}, 100)
@@ -0,0 +1,89 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from src.recommendation.features.restaurant_filtering.geo_cache import GeoTileCache
+
+
+def _restaurant(rid: str, lon: float, lat: float) -> dict:
+    return {"_id": rid, "location": {"type": "Point", "coordinates": [lon, lat]}}
+
+
+@pytest.mark.asyncio
+async def test_same_cell_requests_share_candidates():
+    fetch = AsyncMock(
+        return_value=[_restaurant("a", 127.1111, 37.3947), _restaurant("b", 127.1150, 37.3947)]
+    )
+    cache = GeoTileCache(precision=7, ttl_sec=60)
+
+    first = await cache.get_or_fetch(127.1111, 37.3947, 1000, fetch)
+    second = await cache.get_or_fetch(127.11112, 37.39468, 1000, fetch)
+
+    assert fetch.await_count == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+    # 거리 점수는 실제 요청 좌표 기준으로 재계산
+    assert first[0]["_id"] == second[0]["_id"] == "a"
+    assert first[0]["distance"] == 0
+    assert second[0]["distance"] > 0
+
+
+@pytest.mark.asyncio
+async def test_fetch_radius_is_padded_by_cell_size():
+    fetch = AsyncMock(return_value=[])
+    cache = GeoTileCache(precision=7)
+
+    await cache.get_or_fetch(127.1111, 37.3947, 1000, fetch)
+
+    _, _, radius, max_meal_price = fetch.await_args.args
+    assert radius > 1000
+    assert max_meal_price is None
+
+
+@pytest.mark.asyncio
+async def test_budget_bucket_is_part_of_key_and_query():
+    fetch = AsyncMock(return_value=[])
+    cache = GeoTileCache(precision=7, budget_bucket=5000)
+
+    await cache.get_or_fetch(127.1111, 37.3947, 1000, fetch, max_meal_price=12000)
+    # 같은 구간(10,000 초과 ~ 15,000)은 캐시 공유
+    await cache.get_or_fetch(127.1111, 37.3947, 1000, fetch, max_meal_price=14500)
+    await cache.get_or_fetch(127.1111, 37.3947, 1000, fetch, max_meal_price=16000)
+
+    assert [call.args[3] for call in fetch.await_args_list] == [15000.0, 20000.0]
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction():
+    fetch = AsyncMock(return_value=[])
+    cache = GeoTileCache(precision=7, max_entries=1)
+
+    await cache.get_or_fetch(127.1111, 37.3947, 1000, fetch)
+    await cache.get_or_fetch(126.9780, 37.5665, 1000, fetch)
+
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_owner_does_not_block_waiters():
+    release = asyncio.Event()
+
+    async def fetch(longitude, latitude, radius, max_meal_price):
+        await release.wait()
+        return [_restaurant("a", 127.1111, 37.3947)]
+
+    cache = GeoTileCache(precision=7, ttl_sec=60)
+    owner = asyncio.create_task(cache.get_or_fetch(127.1111, 37.3947, 1000, fetch))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(cache.get_or_fetch(127.1111, 37.3947, 1000, fetch))
+    await asyncio.sleep(0)
+
+    # 타임아웃/연결 종료로 먼저 온 요청이 취소되어도 조회는 계속 진행
+    owner.cancel()
+    release.set()
+    result = await asyncio.wait_for(waiter, timeout=1)
+
+    assert owner.cancelled()
+    assert [r["_id"] for r in result] == ["a"]
+    assert cache._inflight == {}
+    assert (await cache.get_or_fetch(127.1111, 37.3947, 1000, fetch))[0]["_id"] == "a"
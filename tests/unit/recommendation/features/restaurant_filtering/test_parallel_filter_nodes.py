@@ -0,0 +1,73 @@
+import asyncio
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+from src.recommendation.schemas.dining_data import DiningData
+from src.recommendation.workflows.nodes import restaurant_filtering
+from src.recommendation.features.restaurant_filtering.nodes.parallel_filter_nodes import (
+    filter_join_node,
+)
+
+
+def _restaurants() -> list:
+    return [
+        {"id": "cheap_safe", "distance_score": 0.5, "menus": [{"title": "국밥", "price": 9000}]},
+        {"id": "near_safe", "distance_score": 0.9, "menus": [{"title": "국밥", "price": 9000}]},
+        {"id": "unsafe", "distance_score": 1.0, "menus": [{"title": "새우탕", "price": 9000}]},
+        {"id": "expensive", "distance_score": 1.0, "menus": [{"title": "한우", "price": 90000}]},
+    ]
+
+
+def test_join_intersects_and_keeps_budget_order():
+    state = {
+        "filtered_restaurants": _restaurants(),
+        "allergy_safe_ids": ["cheap_safe", "near_safe", "expensive"],
+        "budget_restaurants": [{"id": "near_safe"}, {"id": "unsafe"}, {"id": "cheap_safe"}],
+    }
+
+    result = filter_join_node(state)
+
+    assert [r["id"] for r in result["filtered_restaurants"]] == ["near_safe", "cheap_safe"]
+
+
+def test_join_returns_empty_on_error():
+    assert filter_join_node({"is_error": True})["filtered_restaurants"] == []
+
+
+@pytest.mark.asyncio
+async def test_allergy_and_budget_run_concurrently():
+    events = []
+
+    async def distance(state):
+        return {"filtered_restaurants": _restaurants()}
+
+    async def allergy(state, config):
+        events.append("allergy_start")
+        await asyncio.sleep(0.05)  # LLM 검토 대기
+        events.append("allergy_end")
+        return {"allergy_safe_ids": ["cheap_safe", "near_safe", "expensive"]}
+
+    async def budget(state):
+        events.append("budget")
+        from src.recommendation.features.restaurant_filtering.nodes.parallel_filter_nodes import (
+            budget_score_node,
+        )
+        return await budget_score_node(state)
+
+    state = {
+        "user_ids": [1, 2],
+        "dining_data": DiningData(
+            dining_id=1, groups_id=1, dining_date=datetime(2024, 2, 1, 19, 0),
+            budget=40000, x="127.1111", y="37.3947",
+        ),
+        "filtered_restaurants": [],
+        "is_error": False,
+    }
+    with patch.object(restaurant_filtering, "distance_node", distance), \
+         patch.object(restaurant_filtering, "allergy_verdict_node", allergy), \
+         patch.object(restaurant_filtering, "budget_score_node", budget):
+        graph = restaurant_filtering.build_parallel_restaurant_filtering_graph()
+        result = await graph.ainvoke(state)
+
+    assert events.index("budget") < events.index("allergy_end")
+    assert [r["id"] for r in result["filtered_restaurants"]] == ["near_safe", "cheap_safe"]
@@ -0,0 +1,43 @@
+from src.recommendation.features.restaurant_filtering.spatial_index import (
+    RestaurantSpatialIndex,
+)
+
+
+def _restaurant(rid: str, lon: float, lat: float) -> dict:
+    return {
+        "_id": rid,
+        "place_name": rid,
+        "location": {"type": "Point", "coordinates": [lon, lat]},
+    }
+
+
+def test_query_radius_returns_nearest_first_with_scores():
+    index = RestaurantSpatialIndex()
+    index.upsert(_restaurant("far", 127.1200, 37.3947))  # 약 790m
+    index.upsert(_restaurant("near", 127.1112, 37.3948))  # 약 14m
+    index.upsert(_restaurant("out", 127.1400, 37.3947))  # 1km 밖
+
+    results = index.query_radius(127.1111, 37.3947, 1000)
+
+    assert [r["_id"] for r in results] == ["near", "far"]
+    assert results[0]["distance_score"] > results[1]["distance_score"]
+    assert 0 < results[1]["distance"] < 1000
+
+
+def test_upsert_moves_document_between_cells():
+    index = RestaurantSpatialIndex()
+    index.upsert(_restaurant("r1", 127.1111, 37.3947))
+    index.upsert(_restaurant("r1", 126.9780, 37.5665))  # 위치 변경
+
+    assert len(index) == 1
+    assert index.query_radius(127.1111, 37.3947, 1000) == []
+    assert len(index.query_radius(126.9780, 37.5665, 1000)) == 1
+
+
+def test_query_radius_returns_copies():
+    index = RestaurantSpatialIndex()
+    index.upsert(_restaurant("r1", 127.1111, 37.3947))
+
+    index.query_radius(127.1111, 37.3947, 1000)[0]["budget_score"] = 1.0
+
+    assert "budget_score" not in index.query_radius(127.1111, 37.3947, 1000)[0]
@@ -0,0 +1,93 @@
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.recommendation.schemas.dining_data import DiningData
+from src.recommendation.features.restaurant_filtering.nodes.streaming_filter_node import (
+    streaming_filter_node,
+)
+
+MODULE = "src.recommendation.features.restaurant_filtering.nodes.streaming_filter_node"
+
+
+def _state(budget: int = 60000) -> dict:
+    return {
+        "user_ids": [1, 2, 3],
+        "dining_data": DiningData(
+            dining_id=1,
+            groups_id=1,
+            dining_date=datetime(2024, 2, 1, 19, 0),
+            budget=budget,
+            x="127.1111",
+            y="37.3947",
+        ),
+    }
+
+
+def _restaurants(count: int) -> list:
+    return [
+        {
+            "id": f"r{i}",
+            "place_name": f"식당{i}",
+            "distance_score": round(1 - i / count, 4),
+            "menus": [{"title": "국밥", "price": 9000}],
+        }
+        for i in range(count)
+    ]
+
+
+def _stream(restaurants: list, consumed: list):
+    async def stream_by_location(x, y, max_distance, batch_size, **kwargs):
+        for i in range(0, len(restaurants), batch_size):
+            consumed.append(i)
+            yield restaurants[i:i + batch_size]
+
+    mongo = MagicMock()
+    mongo.stream_by_location = stream_by_location
+    return mongo
+
+
+@pytest.mark.asyncio
+async def test_stops_once_enough_survivors():
+    consumed = []
+    index = MagicMock(is_ready=False)
+    with patch(f"{MODULE}.restaurant_index", index), \
+         patch(f"{MODULE}.MongoManager", return_value=_stream(_restaurants(200), consumed)), \
+         patch(f"{MODULE}.load_group_allergies", AsyncMock(return_value=set())), \
+         patch(f"{MODULE}.CallbackHandler"):
+        result = await streaming_filter_node(_state(), {})
+
+    # 배치 20개씩, 생존 15개 이상이면 첫 배치에서 종료
+    assert len(consumed) == 1
+    assert len(result["filtered_restaurants"]) == 20
+    scores = [r["total_score"] for r in result["filtered_restaurants"]]
+    assert scores == sorted(scores, reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_keeps_pulling_batches_when_filtered_out():
+    consumed = []
+    restaurants = _restaurants(60)
+    # 앞쪽 40개는 예산 초과 (1인 예산 20,000원)
+    for r in restaurants[:40]:
+        r["menus"] = [{"title": "한우", "price": 50000}]
+    index = MagicMock(is_ready=False)
+    with patch(f"{MODULE}.restaurant_index", index), \
+         patch(f"{MODULE}.MongoManager", return_value=_stream(restaurants, consumed)), \
+         patch(f"{MODULE}.load_group_allergies", AsyncMock(return_value=set())), \
+         patch(f"{MODULE}.CallbackHandler"):
+        result = await streaming_filter_node(_state(), {})
+
+    assert len(consumed) == 3
+    assert {r["id"] for r in result["filtered_restaurants"]} == {f"r{i}" for i in range(40, 60)}
+
+
+@pytest.mark.asyncio
+async def test_no_candidates_is_error():
+    index = MagicMock(is_ready=True)
+    index.query_radius.return_value = []
+    with patch(f"{MODULE}.restaurant_index", index), \
+         patch(f"{MODULE}.load_group_allergies", AsyncMock(return_value=set())), \
+         patch(f"{MODULE}.CallbackHandler"):
+        result = await streaming_filter_node(_state(), {})
+
+    assert result["is_error"] is True
@@ -0,0 +1,89 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock, AsyncMock
+from src.recommendation.repositories.user_loader import (
+    UserLoader,
+    get_user_loader,
+    USER_LOADER_KEY,
+)
+
+
+def _mock_db(docs):
+    """find().to_list()가 docs를 반환하는 Mock DB 생성"""
+    collection = MagicMock()
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(return_value=docs)
+    collection.find.return_value = cursor
+    db = MagicMock()
+    db.__getitem__.return_value = collection
+    return db, collection
+
+
+@pytest.mark.asyncio
+async def test_load_many_batches_into_single_query():
+    db, collection = _mock_db([{"id": 1, "allergies": ["MILK"]}, {"id": 3}])
+    loader = UserLoader(db=db)
+
+    users = await loader.load_many([1, 2, 3])
+
+    assert [u["id"] if u else None for u in users] == [1, None, 3]
+    collection.find.assert_called_once_with({"id": {"$in": [1, 2, 3]}})
+    assert loader.query_count == 1
+
+
+@pytest.mark.asyncio
+async def test_load_reuses_cached_documents():
+    db, collection = _mock_db([{"id": 1}])
+    loader = UserLoader(db=db)
+
+    await loader.load_many([1])
+    user = await loader.load(1)
+
+    assert user == {"id": 1}
+    assert collection.find.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_query_failure_reaches_waiters_and_allows_retry():
+    db, collection = _mock_db([{"id": 1}])
+    collection.find.return_value.to_list.side_effect = [RuntimeError("db down"), [{"id": 1}]]
+    loader = UserLoader(db=db)
+
+    results = await asyncio.gather(loader.load(1), loader.load(2), return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+    assert await loader.load(1) == {"id": 1}
+    assert loader.query_count == 2
+    # 완료 콜백은 다음 틱에 실행됨
+    await asyncio.sleep(0)
+    assert loader._dispatch_tasks == set()
+
+
+@pytest.mark.asyncio
+async def test_dispatch_task_is_kept_and_cancellation_reaches_waiters():
+    db, collection = _mock_db([])
+    started = asyncio.Event()
+
+    async def slow_to_list(length=None):
+        started.set()
+        await asyncio.sleep(10)
+
+    collection.find.return_value.to_list.side_effect = slow_to_list
+    loader = UserLoader(db=db)
+
+    waiter = asyncio.create_task(loader.load(1))
+    await started.wait()
+    [task] = loader._dispatch_tasks
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert loader._dispatch_tasks == set()
+    assert 1 not in loader._futures
+
+
+def test_get_user_loader_from_config():
+    db, _ = _mock_db([])
+    loader = UserLoader(db=db)
+
+    assert get_user_loader({"configurable": {USER_LOADER_KEY: loader}}) is loader
@@ -0,0 +1,28 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from src.recommendation.repositories.user_loader import USER_LOADER_KEY
+from src.recommendation.workflows.nodes.prefetch_users import prefetch_users_node
+
+
+@pytest.mark.asyncio
+async def test_prefetch_publishes_found_profiles():
+    loader = MagicMock()
+    loader.load_many = AsyncMock(return_value=[{"id": 1, "allergies": ["EGG"]}, None])
+    config = {"configurable": {USER_LOADER_KEY: loader}}
+
+    result = await prefetch_users_node({"user_ids": [1, 2]}, config)
+
+    loader.load_many.assert_awaited_once_with([1, 2])
+    assert result["user_profiles"] == [{"id": 1, "allergies": ["EGG"]}]
+
+
+@pytest.mark.asyncio
+async def test_prefetch_failure_leaves_profiles_unset():
+    loader = MagicMock()
+    loader.load_many = AsyncMock(side_effect=RuntimeError("db down"))
+    config = {"configurable": {USER_LOADER_KEY: loader}}
+
+    result = await prefetch_users_node({"user_ids": [1]}, config)
+
+    # 이후 노드가 로더로 다시 조회하도록 user_profiles를 채우지 않음
+    assert "user_profiles" not in result
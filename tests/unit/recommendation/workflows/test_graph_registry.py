@@ -0,0 +1,33 @@
+import pytest
+from unittest.mock import MagicMock
+from src.recommendation.workflows.graph_registry import GraphRegistry
+
+
+def test_get_compiles_once_and_returns_same_graph():
+    registry = GraphRegistry()
+    compiled = object()
+    builder = MagicMock(return_value=compiled)
+    registry.register("recommendation", builder)
+
+    assert registry.get("recommendation") is compiled
+    assert registry.get("recommendation") is compiled
+    builder.assert_called_once()
+
+
+def test_warmup_compiles_all_and_clear_forces_recompile():
+    registry = GraphRegistry()
+    first, second = MagicMock(return_value="a"), MagicMock(return_value="b")
+    registry.register("first", first)
+    registry.register("second", second)
+
+    registry.warmup()
+    registry.clear()
+    registry.get("first")
+
+    assert first.call_count == 2
+    second.assert_called_once()
+
+
+def test_unknown_graph_raises():
+    with pytest.raises(KeyError):
+        GraphRegistry().get("missing")
@@ -0,0 +1,139 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.shared.db.db_manager import MongoManager
+from src.shared.geo.distance import distance_score, haversine
+
+
+def _manager_with_docs(docs):
+    with patch("src.shared.db.db_manager.get_client", return_value=MagicMock()):
+        manager = MongoManager(col_name="restaurants")
+    cursor = MagicMock()
+    cursor.limit.return_value = cursor
+    cursor.to_list = AsyncMock(return_value=docs)
+    manager.collection = MagicMock()
+    manager.collection.find.return_value = cursor
+    return manager, cursor
+
+
+@pytest.mark.asyncio
+async def test_read_all_without_projection_reads_full_documents():
+    docs = [{"_id": "r1", "name": "식당"}]
+    manager, cursor = _manager_with_docs(docs)
+
+    result = await manager.read_all({"category": "한식"}, limit=5)
+
+    assert result == docs
+    manager.collection.find.assert_called_once_with({"category": "한식"}, None)
+    cursor.limit.assert_called_once_with(5)
+
+
+@pytest.mark.asyncio
+async def test_read_all_passes_projection_through():
+    manager, _ = _manager_with_docs([{"_id": "r1"}])
+
+    await manager.read_all(projection={"name": 1})
+
+    manager.collection.find.assert_called_once_with({}, {"name": 1})
+
+
+def _evaluate(expression, doc):
+    """파이프라인에서 사용하는 집계 연산자만 Python으로 계산"""
+    if isinstance(expression, str) and expression.startswith("$"):
+        return doc[expression[1:]]
+    if not isinstance(expression, dict):
+        return expression
+    [(operator, args)] = expression.items()
+    if operator == "$toInt":
+        return int(_evaluate(args, doc))
+    values = [_evaluate(arg, doc) for arg in args]
+    if operator == "$round":
+        return round(values[0], values[1])
+    if operator == "$max":
+        return max(values)
+    if operator == "$subtract":
+        return values[0] - values[1]
+    if operator == "$divide":
+        return values[0] / values[1]
+    raise NotImplementedError(operator)
+
+
+def test_geo_near_pipeline_shape():
+    point = {"type": "Point", "coordinates": [127.1111, 37.3947]}
+    filters = MongoManager._location_filters(max_meal_price=15000)
+
+    pipeline = MongoManager._geo_near_pipeline(point, 1000, limit=30, fields={"place_name": 1}, filters=filters)
+
+    assert list(pipeline[0]) == ["$geoNear"]
+    geo_near = pipeline[0]["$geoNear"]
+    assert geo_near["near"] == point
+    assert geo_near["key"] == "location"
+    assert geo_near["distanceField"] == "distance"
+    assert geo_near["maxDistance"] == 1000
+    assert geo_near["query"] == filters
+    assert geo_near["spherical"] is True
+    assert set(pipeline[1]["$addFields"]) == {"distance", "distance_score"}
+    assert pipeline[2] == {"$limit": 30}
+    assert pipeline[3] == {"$project": {"place_name": 1, "distance": 1, "distance_score": 1}}
+
+
+def test_geo_near_distance_fields_match_python_formula():
+    point = {"type": "Point", "coordinates": [127.1111, 37.3947]}
+    add_fields = MongoManager._geo_near_pipeline(point, 1000)[1]["$addFields"]
+    lon, lat = 127.1150, 37.3990
+
+    # $geoNear가 distanceField에 채우는 거리(m)를 기존 Python 계산 방식과 비교
+    raw = {"distance": haversine(127.1111, 37.3947, lon, lat)}
+    computed = {field: _evaluate(expression, raw) for field, expression in add_fields.items()}
+
+    assert computed["distance"] == int(raw["distance"])
+    assert computed["distance_score"] == distance_score(raw["distance"], 1000)
+    # 반경 경계 밖은 0.0으로 고정
+    assert _evaluate(add_fields["distance_score"], {"distance": 1200.0}) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_find_by_location_with_distance_uses_aggregate():
+    manager, _ = _manager_with_docs([])
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(return_value=[{"_id": "r1", "distance": 10, "distance_score": 0.99}])
+    manager.collection.aggregate.return_value = cursor
+
+    result = await manager.find_by_location(127.1111, 37.3947, 1000, with_distance=True, projection="candidate")
+
+    assert result[0]["_id"] == "r1"
+    pipeline = manager.collection.aggregate.call_args.args[0]
+    assert pipeline[0]["$geoNear"]["maxDistance"] == 1000
+    manager.collection.find.assert_not_called()
+
+
+def _session_state(rejected):
+    return {
+        "dining_id": "d1",
+        "user_ids": [1, 2],
+        "dining_data": {"budget": 20000, "x": 127.0, "y": 37.5},
+        "filtered_restaurants": ["r1"],
+        "rejected_restaurants": rejected,
+        "vote_result_list": [],
+        "status_message": ["추천 시작"],
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "rejected, pushed, inserted",
+    [([], None, []), (["r9"], {"$each": ["r9"]}, None)],
+)
+async def test_save_dining_session_rejected_candidate_shape(rejected, pushed, inserted):
+    with patch("src.shared.db.db_manager.get_client", return_value=MagicMock()):
+        manager = MongoManager(col_name="dining_sessions")
+    manager.set_collection = MagicMock()
+    manager.upsert_and_return = AsyncMock(return_value={"currentPhase": 1})
+
+    phase = await manager.save_dining_session(_session_state(rejected))
+
+    filter_query, update_query = manager.upsert_and_return.await_args.args
+    assert phase == 1
+    assert filter_query == {"diningId": "d1"}
+    # 같은 필드를 $push와 $setOnInsert에 동시에 넣지 않음
+    assert update_query["$push"].get("rejectedCandidate") == pushed
+    assert update_query["$setOnInsert"].get("rejectedCandidate") == inserted
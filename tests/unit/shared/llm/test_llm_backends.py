@@ -0,0 +1,119 @@
+import json
+import pytest
+from typing import List
+from unittest.mock import patch
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from pydantic import BaseModel
+from src.shared.llm import llm_backends
+from src.shared.llm.llm_backends import (
+    RecordReplayChatModel,
+    ReplayMissError,
+    SyntheticChatModel,
+    build_llm,
+)
+
+
+class AllergyCheckResult(BaseModel):
+    place_name: str
+    is_safe: bool
+    reason: str
+
+
+class BatchAllergyCheckResult(BaseModel):
+    results: List[AllergyCheckResult]
+
+
+def synthetic(**kwargs) -> SyntheticChatModel:
+    return SyntheticChatModel(provider="gemini", model="test", latency_dist="fixed", latency_ms=0, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_synthetic_allergy_check_covers_every_restaurant():
+    llm = synthetic(safe_ratio=1.0)
+    prompt = "알러지 ['SHRIMP'] 기준 안전 검토.\n[{'n': '식당A', 'm': ['새우튀김']}, {'n': '식당B', 'm': ['짬뽕']}]"
+
+    result = await llm.with_structured_output(BatchAllergyCheckResult).ainvoke(prompt)
+
+    assert [r.place_name for r in result.results] == ["식당A", "식당B"]
+    assert all(r.is_safe for r in result.results)
+
+
+@pytest.mark.asyncio
+async def test_synthetic_ranking_and_vote_formats():
+    llm = synthetic()
+    candidates = "1. **A** (ID: r1)\n2. **B** (ID: r2)\n3. **C** (ID: r3)"
+
+    ranking = await (
+        ChatPromptTemplate.from_messages([("human", "{c}\nranked_restaurant_ids")]) | llm | JsonOutputParser()
+    ).ainvoke({"c": candidates})
+    vote = await llm.ainvoke(f"{candidates}\n선택: [식당_ID]\n이유: [1-2문장]")
+
+    assert sorted(ranking["ranked_restaurant_ids"]) == ["r1", "r2", "r3"]
+    assert vote.content.splitlines()[0] in {"선택: r1", "선택: r2", "선택: r3"}
+
+
+@pytest.mark.asyncio
+async def test_synthetic_output_is_deterministic():
+    prompt = "1. **A** (ID: r1)\n2. **B** (ID: r2)\n3. **C** (ID: r3)\nranked_restaurant_ids"
+
+    first = await synthetic(seed=1).ainvoke(prompt)
+    second = await synthetic(seed=1).ainvoke(prompt)
+
+    assert first.content == second.content
+
+
+def test_synthetic_latency_distributions():
+    import random
+
+    rng = random.Random(0)
+    assert synthetic().sample_latency(rng) == 0
+    uniform = SyntheticChatModel(provider="p", model="m", latency_dist="uniform", latency_ms=100, latency_spread=0.5)
+    samples = [uniform.sample_latency(rng) for _ in range(100)]
+    assert all(0.05 <= s <= 0.15 for s in samples)
+
+
+@pytest.mark.asyncio
+async def test_record_then_replay(tmp_path):
+    live = synthetic()
+    recorder = RecordReplayChatModel(
+        provider="openai", model="m", mode="record", cassette_dir=str(tmp_path), live_llm=live
+    )
+    prompt = "알러지 검토\n[{'n': '식당A', 'm': []}]"
+
+    recorded_text = await recorder.ainvoke("안녕")
+    recorded = await recorder.with_structured_output(BatchAllergyCheckResult).ainvoke(prompt)
+
+    replayer = RecordReplayChatModel(provider="openai", model="m", mode="replay", cassette_dir=str(tmp_path))
+    assert (await replayer.ainvoke("안녕")).content == recorded_text.content
+    assert await replayer.with_structured_output(BatchAllergyCheckResult).ainvoke(prompt) == recorded
+
+    files = list(tmp_path.glob("*/*.json"))
+    assert len(files) == 2
+    assert {json.loads(f.read_text(encoding="utf-8"))["schema"] for f in files} == {None, "BatchAllergyCheckResult"}
+
+
+@pytest.mark.asyncio
+async def test_replay_miss_raises(tmp_path):
+    replayer = RecordReplayChatModel(provider="openai", model="m", mode="replay", cassette_dir=str(tmp_path))
+
+    with pytest.raises(ReplayMissError):
+        await replayer.ainvoke("처음 보는 프롬프트")
+
+
+@pytest.mark.parametrize(
+    "backend, expected",
+    [("synthetic", SyntheticChatModel), ("replay", RecordReplayChatModel), ("record", RecordReplayChatModel)],
+)
+def test_build_llm_selects_backend(backend, expected):
+    with patch.object(llm_backends.settings, "LLM_BACKEND", backend):
+        llm = build_llm("openai", "m", 0.3, lambda: synthetic())
+
+    assert isinstance(llm, expected)
+    assert (llm.provider, llm.model, llm.temperature) == ("openai", "m", 0.3)
+
+
+def test_build_llm_live_uses_factory():
+    live = synthetic()
+    with patch.object(llm_backends.settings, "LLM_BACKEND", "live"):
+        assert build_llm("openai", "m", 0.3, lambda: live) is live
@@ -0,0 +1,64 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock, patch
+from src.shared.llm import llm_client
+from src.shared.llm.llm_client import LLMClientRegistry
+
+
+@pytest.fixture
+def registry():
+    registry = LLMClientRegistry()
+    with patch.object(llm_client, "llm_registry", registry):
+        yield registry
+
+
+def test_same_model_and_temperature_reuses_instance(registry):
+    with patch.object(llm_client, "ChatGoogleGenerativeAI", side_effect=lambda **kw: MagicMock()) as chat:
+        first = llm_client.get_llm(temperature=0.3)
+        second = llm_client.get_llm(temperature=0.3)
+        other = llm_client.get_llm(temperature=0.8)
+
+    assert first is second
+    assert other is not first
+    assert chat.call_count == 2
+    assert len(registry) == 2
+
+
+def test_openai_clients_share_http_pool(registry):
+    with patch.object(llm_client, "ChatOpenAI", side_effect=lambda **kw: MagicMock(**kw)) as chat:
+        low = llm_client.get_openai_llm(temperature=0.0)
+        high = llm_client.get_openai_llm(temperature=0.7)
+
+    assert chat.call_count == 2
+    assert low.http_async_client is high.http_async_client
+    assert low.http_client is high.http_client
+
+
+def test_event_loop_change_recreates_clients(registry):
+    async def get():
+        return llm_client.get_llm(temperature=0.3)
+
+    with patch.object(llm_client, "ChatGoogleGenerativeAI", side_effect=lambda **kw: MagicMock()):
+        first = asyncio.run(get())
+        second = asyncio.run(get())
+
+    assert first is not second
+    assert len(registry) == 1
+
+
+def test_event_loop_change_closes_replaced_http_client(registry):
+    async def get():
+        registry._check_loop()
+        return registry.http_async_client()
+
+    first = asyncio.run(get())
+    with patch.object(first, "aclose", wraps=first.aclose) as aclose:
+        async def change_loop():
+            registry._check_loop()
+            await asyncio.gather(*registry._close_tasks)
+
+        asyncio.run(change_loop())
+
+    aclose.assert_awaited_once()
+    assert registry._http_async_client is None
+    assert not registry._close_tasks
@@ -0,0 +1,134 @@
+import asyncio
+import pytest
+from time import monotonic
+from unittest.mock import MagicMock
+from src.shared.llm.llm_scheduler import (
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    LLMScheduler,
+    TokenBucket,
+    llm_key,
+)
+
+
+def test_token_bucket_reserves_in_order():
+    bucket = TokenBucket(rate=10.0, burst=2)
+
+    delays = [bucket.reserve() for _ in range(4)]
+
+    assert delays[:2] == [0.0, 0.0]
+    assert delays[2] == pytest.approx(0.1, abs=0.01)
+    assert delays[3] == pytest.approx(0.2, abs=0.01)
+
+
+def test_llm_key_for_unknown_llm():
+    assert llm_key(MagicMock()) == ("other", "MagicMock")
+
+
+@pytest.mark.asyncio
+async def test_concurrency_cap():
+    scheduler = LLMScheduler(max_concurrency=2, rate_per_sec=1000, burst=1000)
+    running = 0
+    peak = 0
+
+    async def call():
+        nonlocal running, peak
+        async with scheduler.slot("openai", "gpt"):
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(call() for _ in range(6)))
+
+    assert peak == 2
+    stats = scheduler.stats()
+    assert stats["calls"] == 6
+    assert stats["queued_calls"] == 4
+    assert stats["active"] == 0 and stats["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_waiters_run_by_priority():
+    scheduler = LLMScheduler(max_concurrency=1, rate_per_sec=1000, burst=1000)
+    order = []
+    gate = asyncio.Event()
+
+    async def blocker():
+        async with scheduler.slot("openai", "gpt"):
+            await gate.wait()
+
+    async def call(name, priority):
+        async with scheduler.slot("openai", "gpt", priority=priority):
+            order.append(name)
+
+    first = asyncio.create_task(blocker())
+    await asyncio.sleep(0)
+    tasks = [
+        asyncio.create_task(call("low", PRIORITY_LOW)),
+        asyncio.create_task(call("high", PRIORITY_HIGH)),
+    ]
+    await asyncio.sleep(0)
+    assert scheduler.queue_depth() == 2
+
+    gate.set()
+    await asyncio.gather(first, *tasks)
+    assert order == ["high", "low"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_slot():
+    scheduler = LLMScheduler(max_concurrency=1, rate_per_sec=1000, burst=1000)
+    gate = asyncio.Event()
+
+    async def blocker():
+        async with scheduler.slot("openai", "gpt"):
+            await gate.wait()
+
+    first = asyncio.create_task(blocker())
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(blocker())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    gate.set()
+    await first
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert scheduler.stats()["active"] == 0
+    async with scheduler.slot("openai", "gpt"):
+        assert scheduler.stats()["active"] == 1
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_per_model():
+    scheduler = LLMScheduler(max_concurrency=10, rate_per_sec=1000, burst=1, rate_limits={"openai:slow": 20})
+
+    async def call(model):
+        async with scheduler.slot("openai", model):
+            pass
+
+    start = monotonic()
+    await asyncio.gather(*(call("slow") for _ in range(3)))
+    elapsed = monotonic() - start
+
+    assert elapsed >= 0.09
+    assert scheduler.stats()["throttled_calls"] == 2
+    assert scheduler.stats()["calls_by_model"] == {"openai:slow": 3}
+
+
+@pytest.mark.asyncio
+async def test_throttled_call_does_not_hold_slot():
+    scheduler = LLMScheduler(max_concurrency=1, rate_per_sec=1000, burst=1, rate_limits={"openai:slow": 5})
+    order = []
+
+    async def call(model):
+        async with scheduler.slot("openai", model):
+            order.append(model)
+
+    await call("slow")
+    # 속도 제한으로 0.2초 기다리는 동안에도 다른 모델 호출은 슬롯을 바로 얻음
+    await asyncio.gather(call("slow"), call("fast"))
+
+    assert order == ["slow", "fast", "slow"]
+    assert scheduler.stats()["active"] == 0
@@ -0,0 +1,122 @@
+import pytest
+from types import SimpleNamespace
+from typing import TypedDict
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+from langgraph.graph import END, START, StateGraph
+from src.shared.llm.llm_backends import SyntheticChatModel
+from src.shared.metrics.collectors import (
+    GRAPH_NODE_DURATION,
+    HTTP_REQUEST_DURATION,
+    LLM_CALL_DURATION,
+    MONGO_COMMAND_DURATION,
+    MongoMetricsListener,
+    http_metrics_middleware,
+    install_langchain_metrics,
+    llm_labels,
+    metrics_callback_handler,
+    own_node_run,
+    token_usage,
+)
+
+
+class State(TypedDict):
+    value: int
+
+
+def _graph(node):
+    builder = StateGraph(State)
+    builder.add_node("metrics_test_node", node)
+    builder.add_edge(START, "metrics_test_node")
+    builder.add_edge("metrics_test_node", END)
+    return builder.compile()
+
+
+@pytest.mark.asyncio
+async def test_global_hook_records_node_and_llm_durations():
+    install_langchain_metrics()
+    llm = SyntheticChatModel(provider="openai", model="metrics-test", latency_dist="fixed", latency_ms=0)
+
+    async def node(state):
+        # 노드 안에서 callbacks를 새로 지정해도 전역 훅과 노드 메타데이터는 유지됨
+        await llm.ainvoke("안녕", config={"callbacks": []})
+        return {"value": 1}
+
+    llm_labels = {"provider": "openai", "model": "metrics-test", "node": "metrics_test_node", "status": "success"}
+    node_before = GRAPH_NODE_DURATION.count(node="metrics_test_node", status="success")
+    llm_before = LLM_CALL_DURATION.count(**llm_labels)
+
+    await _graph(node).ainvoke({"value": 0})
+
+    assert GRAPH_NODE_DURATION.count(node="metrics_test_node", status="success") == node_before + 1
+    assert LLM_CALL_DURATION.count(**llm_labels) == llm_before + 1
+    assert metrics_callback_handler._runs == {}
+
+
+@pytest.mark.asyncio
+async def test_failed_node_is_recorded_as_error():
+    install_langchain_metrics()
+
+    async def node(state):
+        raise RuntimeError("boom")
+
+    before = GRAPH_NODE_DURATION.count(node="metrics_test_node", status="error")
+
+    with pytest.raises(RuntimeError):
+        await _graph(node).ainvoke({"value": 0})
+
+    assert GRAPH_NODE_DURATION.count(node="metrics_test_node", status="error") == before + 1
+
+
+def test_own_node_run_and_llm_labels():
+    metadata = {"langgraph_node": "allergy_node", "ls_provider": "openai", "ls_model_name": "gpt"}
+
+    assert own_node_run(metadata, "allergy_node") == "allergy_node"
+    assert own_node_run(metadata, "RunnableSequence") is None
+    assert own_node_run(None, "allergy_node") is None
+    assert llm_labels(metadata) == {"provider": "openai", "model": "gpt", "node": "allergy_node"}
+    assert llm_labels(None) == {"provider": "unknown", "model": "unknown", "node": "none"}
+
+
+def test_token_usage_prefers_usage_metadata():
+    message = AIMessage(content="ok", usage_metadata={"input_tokens": 12, "output_tokens": 3, "total_tokens": 15})
+    response = LLMResult(generations=[[ChatGeneration(message=message)]])
+    legacy = LLMResult(generations=[[]], llm_output={"token_usage": {"prompt_tokens": 7, "completion_tokens": 2}})
+
+    assert token_usage(response) == (12, 3)
+    assert token_usage(legacy) == (7, 2)
+
+
+def test_mongo_listener_records_command_and_collection():
+    listener = MongoMetricsListener()
+    labels = {"command": "find", "collection": "metrics_test", "status": "success"}
+    before = MONGO_COMMAND_DURATION.count(**labels)
+
+    listener.started(SimpleNamespace(
+        command={"find": "metrics_test", "filter": {}}, command_name="find", connection_id=("h", 1), request_id=1
+    ))
+    listener.succeeded(SimpleNamespace(
+        command_name="find", connection_id=("h", 1), request_id=1, duration_micros=2500
+    ))
+
+    assert MONGO_COMMAND_DURATION.count(**labels) == before + 1
+    assert listener._collections == {}
+
+
+def test_http_middleware_uses_route_template():
+    app = FastAPI()
+    app.middleware("http")(http_metrics_middleware)
+
+    @app.get("/metrics_test/{item_id}")
+    async def item(item_id: int):
+        return {"id": item_id}
+
+    labels = {"method": "GET", "route": "/metrics_test/{item_id}", "status": "200"}
+    before = HTTP_REQUEST_DURATION.count(**labels)
+
+    response = TestClient(app).get("/metrics_test/3")
+
+    assert response.status_code == 200
+    assert HTTP_REQUEST_DURATION.count(**labels) == before + 1
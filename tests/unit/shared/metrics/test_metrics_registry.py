@@ -0,0 +1,54 @@
+import pytest
+from src.shared.metrics.metrics_registry import MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "지연 시간", ("node",), buckets=(0.1, 1.0))
+
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value, node="distance")
+
+    lines = registry.render().splitlines()
+    assert lines[:2] == ["# HELP latency_seconds 지연 시간", "# TYPE latency_seconds histogram"]
+    assert 'latency_seconds_bucket{node="distance",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{node="distance",le="1"} 3' in lines
+    assert 'latency_seconds_bucket{node="distance",le="+Inf"} 4' in lines
+    assert 'latency_seconds_sum{node="distance"} 4.25' in lines
+    assert 'latency_seconds_count{node="distance"} 4' in lines
+
+
+def test_counter_and_gauge_with_escaped_labels():
+    registry = MetricsRegistry()
+    counter = registry.counter("tokens_total", "토큰", ("model",))
+    gauge = registry.gauge("in_flight", "처리 중")
+
+    counter.inc(10, model='gpt "nano"')
+    counter.inc(5, model='gpt "nano"')
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+
+    text = registry.render()
+    assert 'tokens_total{model="gpt \\"nano\\""} 15' in text
+    assert "in_flight 1" in text
+
+
+def test_label_mismatch_and_negative_counter_raise():
+    registry = MetricsRegistry()
+    counter = registry.counter("calls_total", "호출", ("model",))
+
+    with pytest.raises(ValueError):
+        counter.inc(node="x")
+    with pytest.raises(ValueError):
+        counter.inc(-1, model="m")
+    with pytest.raises(ValueError):
+        registry.counter("calls_total", "중복")
+
+
+def test_collectors_run_before_render():
+    registry = MetricsRegistry()
+    gauge = registry.gauge("queued", "대기열")
+    registry.add_collector(lambda: gauge.set(7))
+
+    assert "queued 7" in registry.render()
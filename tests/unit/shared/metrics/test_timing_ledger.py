@@ -0,0 +1,134 @@
+import pytest
+from types import SimpleNamespace
+from typing import TypedDict
+from langgraph.graph import END, START, StateGraph
+from src.shared.llm.llm_backends import SyntheticChatModel
+from src.shared.metrics.timing_ledger import (
+    LedgerMongoListener,
+    TimingLedger,
+    install_timing_ledger,
+    node_path,
+    server_timing_header,
+    timing_ledger_scope,
+)
+
+
+class State(TypedDict):
+    value: int
+
+
+def _graph(llm):
+    async def inner_node(state):
+        # 노드 안에서 callbacks를 새로 지정해도 ledger 훅은 유지됨
+        await llm.ainvoke("안녕", config={"callbacks": []})
+        return {"value": state["value"] + 1}
+
+    async def outer_node(state):
+        return {"value": state["value"] + 1}
+
+    sub_builder = StateGraph(State)
+    sub_builder.add_node("inner_node", inner_node)
+    sub_builder.add_edge(START, "inner_node")
+    sub_builder.add_edge("inner_node", END)
+
+    builder = StateGraph(State)
+    builder.add_node("outer_node", outer_node)
+    builder.add_node("sub_graph", sub_builder.compile())
+    builder.add_edge(START, "outer_node")
+    builder.add_edge("outer_node", "sub_graph")
+    builder.add_edge("sub_graph", END)
+    return builder.compile()
+
+
+def test_node_path_strips_task_ids():
+    assert node_path("restaurant_filtering:abc|distance_node:def") == "restaurant_filtering/distance_node"
+    assert node_path("") == ""
+
+
+@pytest.mark.asyncio
+async def test_scope_records_nested_nodes_and_llm_calls():
+    install_timing_ledger()
+    llm = SyntheticChatModel(provider="openai", model="ledger-test", latency_dist="fixed", latency_ms=0)
+    graph = _graph(llm)
+    ledger = TimingLedger()
+
+    with timing_ledger_scope(ledger):
+        await graph.ainvoke({"value": 0})
+        await graph.ainvoke({"value": 0})
+
+    record = ledger.to_record()
+    nodes = [e for e in record["entries"] if e["type"] == "node"]
+    llm_calls = [e for e in record["entries"] if e["type"] == "llm"]
+
+    assert {(e["node"], e["attempt"]) for e in nodes} >= {
+        ("outer_node", 1), ("outer_node", 2), ("sub_graph/inner_node", 1), ("sub_graph/inner_node", 2)
+    }
+    assert len(llm_calls) == 2
+    assert all(e["node"] == "sub_graph/inner_node" and e["name"] == "ledger-test" for e in llm_calls)
+    assert all(e["status"] == "success" and e["durationMs"] >= 0 for e in record["entries"])
+
+    inner = [e for e in nodes if e["name"] == "inner_node"]
+    assert [e["tokensIn"] for e in inner] == [e["tokensIn"] for e in llm_calls]
+    assert ledger._open == {} and ledger._open_nodes == {}
+
+
+@pytest.mark.asyncio
+async def test_nothing_recorded_outside_scope():
+    install_timing_ledger()
+    llm = SyntheticChatModel(provider="openai", model="ledger-test", latency_dist="fixed", latency_ms=0)
+    ledger = TimingLedger()
+
+    with timing_ledger_scope(ledger):
+        pass
+    await _graph(llm).ainvoke({"value": 0})
+
+    assert ledger.to_record()["entries"] == []
+
+
+def test_max_entries_drops_overflow():
+    ledger = TimingLedger(max_entries=1)
+
+    for key in (1, 2):
+        ledger.db_started(key, "find", "users")
+        ledger.db_finished(key, "success", 1.0)
+
+    record = ledger.to_record()
+    assert len(record["entries"]) == 1
+    assert record["droppedEntries"] == 1
+
+
+def test_mongo_listener_records_only_inside_scope():
+    listener = LedgerMongoListener()
+    started = SimpleNamespace(
+        command={"find": "users", "filter": {}}, command_name="find", connection_id=("h", 1), request_id=7
+    )
+    succeeded = SimpleNamespace(command_name="find", connection_id=("h", 1), request_id=7, duration_micros=2500)
+    ledger = TimingLedger()
+
+    listener.started(started)
+    listener.succeeded(succeeded)
+    with timing_ledger_scope(ledger):
+        listener.started(started)
+        listener.succeeded(succeeded)
+
+    [entry] = ledger.to_record()["entries"]
+    assert (entry["type"], entry["name"], entry["collection"], entry["node"]) == ("db", "find", "users", "none")
+    assert entry["durationMs"] == 2.5
+
+
+def test_server_timing_header_sums_top_level_nodes():
+    record = {
+        "totalMs": 120.0,
+        "entries": [
+            {"type": "node", "name": "restaurant_filtering", "node": "restaurant_filtering", "durationMs": 80.0},
+            {"type": "node", "name": "distance_node", "node": "restaurant_filtering/distance_node", "durationMs": 30.0},
+            {"type": "llm", "name": "m", "node": "restaurant_filtering/allergy_node", "durationMs": 40.0},
+            {"type": "llm", "name": "m", "node": "none", "durationMs": 10.0},
+            {"type": "db", "name": "find", "node": "none", "durationMs": 2.0},
+        ],
+    }
+
+    assert server_timing_header(record) == (
+        'restaurant_filtering;dur=80.0, llm;dur=50.0;desc="2 calls", db;dur=2.0;desc="1 ops", total;dur=120.0'
+    )
+    assert server_timing_header(None) == ""
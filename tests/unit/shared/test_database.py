@@ -0,0 +1,62 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.core.config import settings
+from src.shared import database
+from src.shared.metrics.collectors import mongo_metrics_listener
+from src.shared.metrics.timing_ledger import ledger_mongo_listener
+
+
+@pytest.mark.parametrize(
+    "metrics, ledger, expected",
+    [
+        (True, True, [mongo_metrics_listener, ledger_mongo_listener]),
+        (True, False, [mongo_metrics_listener]),
+        (False, True, [ledger_mongo_listener]),
+        (False, False, None),
+    ],
+)
+def test_client_options_pool_settings_and_listeners(metrics, ledger, expected):
+    with patch.object(settings, "METRICS_ENABLED", metrics), \
+            patch.object(settings, "TIMING_LEDGER_ENABLED", ledger), \
+            patch.object(settings, "MONGO_MAX_POOL_SIZE", 50), \
+            patch.object(settings, "MONGO_MIN_POOL_SIZE", 5):
+        options = database._client_options()
+
+    assert options["maxPoolSize"] == 50
+    assert options["minPoolSize"] == 5
+    assert options["waitQueueTimeoutMS"] == settings.MONGO_WAIT_QUEUE_TIMEOUT_MS
+    assert options["serverSelectionTimeoutMS"] == settings.MONGO_SERVER_SELECTION_TIMEOUT_MS
+    assert options.get("event_listeners") == expected
+
+
+@pytest.mark.asyncio
+async def test_connect_reuses_shared_client():
+    client = MagicMock()
+    with patch.object(database, "AsyncIOMotorClient", return_value=client) as client_cls, \
+            patch.object(database.db_wrapper, "client", None):
+        client.get_io_loop.return_value = asyncio.get_running_loop()
+        await database.connect_to_mongo()
+        assert database.get_client() is client
+        await database.close_mongo_connection()
+        assert database.db_wrapper.client is None
+
+    client_cls.assert_called_once()
+    client.close.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_continues_after_failure():
+    collections = {name: MagicMock() for name in
+                   ("dining_sessions", "allergy_verdicts", "restaurants", "idempotent_responses")}
+    for collection in collections.values():
+        collection.create_index = AsyncMock()
+    collections["dining_sessions"].create_index.side_effect = RuntimeError("duplicate key")
+
+    with patch.object(database, "get_db", return_value=collections):
+        await database.ensure_indexes()
+
+    collections["dining_sessions"].create_index.assert_awaited_once_with("diningId", unique=True)
+    restaurant_indexes = [call.args[0] for call in collections["restaurants"].create_index.await_args_list]
+    assert restaurant_indexes == ["allergen_tagging_version", "price_features.min_meal_price"]
+    collections["idempotent_responses"].create_index.assert_awaited_once()
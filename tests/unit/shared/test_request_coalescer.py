@@ -0,0 +1,163 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.recommendation.schemas.recommendations_request import RecommendationsRequest
+from src.recommendation.schemas.recommendations_response import RecommendationsResponse
+from src.shared import request_coalescer as coalescer_module
+from src.shared.request_coalescer import RequestCoalescer, make_idempotency_key, make_request_key
+
+
+def make_request(vote_result_list=None, dining_id: int = 1) -> RecommendationsRequest:
+    return RecommendationsRequest(
+        dining_data={
+            "diningId": dining_id,
+            "groupsId": 2,
+            "diningDate": "2025-01-29T15:00:00",
+            "budget": 100000,
+            "x": "127.1",
+            "y": "37.4",
+        },
+        user_ids=[1, 2],
+        vote_result_list=vote_result_list,
+    )
+
+
+def make_response(count: int = 1) -> RecommendationsResponse:
+    return RecommendationsResponse(recommendation_count=count, recommended_items=[])
+
+
+@pytest.fixture
+def collection():
+    collection = MagicMock()
+    collection.find_one = AsyncMock(return_value=None)
+    collection.update_one = AsyncMock()
+    with patch.object(coalescer_module, "get_db", return_value={"idempotent_responses": collection}):
+        yield collection
+
+
+def test_request_key_depends_on_phase_and_body():
+    request = make_request()
+    refreshed = make_request(vote_result_list=[])
+
+    assert make_request_key("recommendations", request) == make_request_key("recommendations", make_request())
+    assert make_request_key("recommendations", request) != make_request_key("analyze_refresh", request)
+    assert make_request_key("analyze_refresh", request) != make_request_key("analyze_refresh", refreshed)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_share_one_job():
+    coalescer = RequestCoalescer()
+    calls = 0
+
+    async def job():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return make_response()
+
+    results = await asyncio.gather(
+        *(coalescer.run("key", job, RecommendationsResponse) for _ in range(3))
+    )
+
+    assert calls == 1
+    assert results[0] is results[1] is results[2]
+    assert coalescer.stats() == {"inflight": 0, "started": 1, "coalesced": 2, "replayed": 0}
+
+
+@pytest.mark.asyncio
+async def test_timed_out_caller_does_not_cancel_shared_job():
+    coalescer = RequestCoalescer()
+    calls = 0
+
+    async def job():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return make_response()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await coalescer.run("key", job, RecommendationsResponse, timeout=0.01)
+
+    # 재시도 요청은 진행 중인 작업에 합류
+    result = await coalescer.run("key", job, RecommendationsResponse, timeout=1)
+    assert calls == 1
+    assert result.recommendation_count == 1
+
+
+@pytest.mark.asyncio
+async def test_job_error_is_shared_and_not_cached():
+    coalescer = RequestCoalescer()
+    job = AsyncMock(side_effect=ValueError("boom"))
+
+    with pytest.raises(ValueError):
+        await coalescer.run("key", job, RecommendationsResponse)
+
+    job.side_effect = None
+    job.return_value = make_response()
+    assert (await coalescer.run("key", job, RecommendationsResponse)).recommendation_count == 1
+    assert job.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_idempotency_key_replays_completed_response(collection):
+    coalescer = RequestCoalescer()
+    job = AsyncMock(return_value=make_response(3))
+
+    first = await coalescer.run("key", job, RecommendationsResponse, idempotency_key="abc")
+    second = await coalescer.run("other", job, RecommendationsResponse, idempotency_key="abc")
+
+    assert job.await_count == 1
+    assert second == first
+    assert coalescer.stats()["replayed"] == 1
+    collection.update_one.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_idempotency_key_loads_stored_response(collection):
+    collection.find_one.return_value = {
+        "_id": "abc",
+        "response": make_response(2).model_dump(by_alias=True),
+    }
+    coalescer = RequestCoalescer()
+    job = AsyncMock()
+
+    result = await coalescer.run("key", job, RecommendationsResponse, idempotency_key="abc")
+
+    job.assert_not_awaited()
+    assert result.recommendation_count == 2
+
+
+def test_idempotency_key_is_scoped_to_phase_and_dining_id():
+    request = make_request()
+
+    assert make_idempotency_key("recommendations", request, "abc") == "recommendations|1|abc"
+    assert make_idempotency_key("recommendations", request, "abc") != make_idempotency_key(
+        "analyze_refresh", request, "abc"
+    )
+    assert make_idempotency_key("recommendations", make_request(dining_id=2), "abc") == "recommendations|2|abc"
+    assert make_idempotency_key("recommendations", request, None) is None
+
+
+@pytest.mark.asyncio
+async def test_same_idempotency_key_on_both_endpoints_runs_each(collection):
+    from src.recommendation.router import routes_v1
+
+    coalescer = RequestCoalescer()
+    run = AsyncMock(side_effect=lambda request, phase, default_count: make_response(
+        1 if phase == "recommendations" else 2
+    ))
+    with patch.object(routes_v1, "request_coalescer", coalescer), \
+            patch.object(routes_v1, "_run_recommendation", run):
+        first = await routes_v1._coalesced_recommendation(make_request(), "recommendations", 1, "abc")
+        refreshed = await routes_v1._coalesced_recommendation(make_request(), "analyze_refresh", 0, "abc")
+        other_dining = await routes_v1._coalesced_recommendation(
+            make_request(dining_id=2), "recommendations", 1, "abc"
+        )
+        replayed = await routes_v1._coalesced_recommendation(make_request(), "analyze_refresh", 0, "abc")
+
+    assert run.await_count == 3
+    assert (first.recommendation_count, refreshed.recommendation_count) == (1, 2)
+    assert other_dining.recommendation_count == 1
+    assert replayed == refreshed
+    stored_ids = [call.args[0]["_id"] for call in collection.update_one.await_args_list]
+    assert stored_ids == ["recommendations|1|abc", "analyze_refresh|1|abc", "recommendations|2|abc"]